@@ -1,2 +1,6 @@
 from .author_admin import AuthorAdmin
+from .autocomplete_list_filter import AutocompleteListFilter
 from .book_admin import BookAdmin
+from .estimated_count_paginator import EstimatedCountPaginator
+from .keyset_change_list import KeysetChangeList
+from .large_table_admin_mixin import LargeTableAdminMixin
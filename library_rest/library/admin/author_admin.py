@@ -1,12 +1,18 @@
 from django.contrib import admin
-from library.models.book import Author
+from library.admin.large_table_admin_mixin import LargeTableAdminMixin
+from library.models import Author
 
 
 @admin.register(Author)
-class AuthorAdmin(admin.ModelAdmin):
+class AuthorAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     AuthorAdmin is a custom admin class for the Author model in the Django admin interface.
 
+    The changelist runs in large-table mode (see `LargeTableAdminMixin`) and the search, also
+    used by the author autocomplete of BookAdmin, matches name prefixes on the
+    `(last_name, first_name)` index. Bulk deletes keep the facet rollups and the 'authors'
+    cache version up to date through `AuthorQuerySet.delete`.
+
     Attributes:
         list_display (tuple): Specifies the fields to be displayed in the list view of the admin interface.
         search_fields (tuple): Specifies the fields to be searched in the admin interface.
@@ -19,5 +25,5 @@ class AuthorAdmin(admin.ModelAdmin):
         'date_of_birth',
         'date_of_death'
     )
-    search_fields = ('first_name', 'last_name')
+    search_fields = ('^last_name', '^first_name')
     list_filter = ('citizenship',)
@@ -0,0 +1,76 @@
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.utils.translation import gettext_lazy as _
+
+from library.admin.keyset_change_list import CURSOR_VAR
+
+
+class AutocompleteListFilter(admin.FieldListFilter):
+    """
+    List filter for a foreign key that loads its choices on demand.
+
+    `RelatedFieldListFilter` renders a link for every row of the related
+    table; this filter renders the admin autocomplete widget instead, which
+    searches the related model through its admin `search_fields` as the user
+    types. Only the selected object, if any, is read when the page renders.
+
+    Usage:
+        list_filter = (('author', AutocompleteListFilter),)
+
+    Methods:
+        expected_parameters(): Returns the query string parameter of the filter.
+        choices(changelist): Yields the "All" choice.
+        render_widget(): Renders the autocomplete widget with the selected value.
+    """
+
+    template = 'admin/library/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.admin_site = model_admin.admin_site
+        self.hidden_params = []
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def value(self):
+        values = self.used_parameters.get(self.lookup_kwarg)
+        return values[-1] if values else None
+
+    def _form_field(self):
+        related_model = self.field.remote_field.model
+        return forms.ModelChoiceField(
+            queryset=related_model._default_manager.all(),
+            required=False,
+            widget=AutocompleteSelect(
+                self.field, self.admin_site,
+                attrs={'data-placeholder': _('Search %s') % self.title},
+            ),
+        )
+
+    @property
+    def media(self):
+        return self._form_field().widget.media
+
+    def render_widget(self):
+        return self._form_field().widget.render(
+            self.lookup_kwarg, self.value(),
+            attrs={'id': f'id_filter_{self.field_path}'},
+        )
+
+    def choices(self, changelist):
+        # The other filters, the search and the ordering are submitted again
+        # with the form of the widget.
+        self.hidden_params = [
+            (name, value)
+            for name, values in changelist.filter_params.items()
+            if name not in (self.lookup_kwarg, CURSOR_VAR)
+            for value in values
+        ]
+        yield {
+            'selected': self.value() is None,
+            'query_string': changelist.get_query_string(remove=[self.lookup_kwarg]),
+            'display': _('All'),
+        }
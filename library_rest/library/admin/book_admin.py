@@ -1,20 +1,43 @@
 from django.contrib import admin
-from library.models.book import Book
+from django.db import transaction
+from library.admin.autocomplete_list_filter import AutocompleteListFilter
+from library.admin.large_table_admin_mixin import LargeTableAdminMixin
+from library.models import Book, FacetCount
 
 
 @admin.register(Book)
-class BookAdmin(admin.ModelAdmin):
+class BookAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     BookAdmin is a custom admin class for the Book model in the Django admin interface.
 
+    The changelist runs in large-table mode (see `LargeTableAdminMixin`): authors are fetched
+    with a join, the search matches title and author last name prefixes, the author filter
+    loads its choices on demand and sorting by author uses the indexed `author_sort_key`.
+
     Attributes:
         list_display (tuple): Specifies the fields to be displayed in the list view of the admin interface.
+        list_select_related (tuple): Specifies the relations fetched with the changelist rows.
         search_fields (tuple): Specifies the fields to be searched in the admin interface.
         list_filter (tuple): Specifies the fields to be used for filtering in the admin interface.
+
+    Methods:
+        author_name(obj): Displays the author of the book, sortable by `author_sort_key`.
+        delete_queryset(request, queryset): Bulk deletes the books and updates the facet rollups once.
     """
-    list_display = ('title', 'author', 'publication_date',
+    list_display = ('title', 'author_name', 'publication_date',
                     'created_at', 'updated_at')
-    search_fields = ('title', 'author')
-    list_filter = ('author',)
+    list_select_related = ('author',)
+    search_fields = ('^title', '^author__last_name')
+    list_filter = (('author', AutocompleteListFilter),)
     autocomplete_fields = ['author']
-    sortable_by = ['title', 'author', 'publication_date']
+    sortable_by = ['title', 'author_name', 'publication_date']
+
+    @admin.display(description='author', ordering='author_sort_key')
+    def author_name(self, obj):
+        return obj.author
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            deltas = FacetCount.objects.book_deltas(queryset, sign=-1)
+            super().delete_queryset(request, queryset)
+            FacetCount.objects.apply_deltas(deltas)
@@ -0,0 +1,61 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs a full `COUNT(*)` on a large table.
+
+    Unfiltered changelists read the row count from the table statistics
+    (`information_schema.TABLES.TABLE_ROWS` on MySQL). Filtered changelists,
+    and tables whose statistics report fewer than `count_limit` rows, run a
+    count bounded to `count_limit + 1` rows: past that limit `count` is
+    `count_limit` and `count_is_estimate` is set, so that the changelist can
+    display the count as approximate.
+
+    Attributes:
+        count_limit (int): The number of rows counted exactly.
+        count_is_estimate (bool): Whether `count` is an estimate.
+    """
+
+    count_limit = 10000
+    count_is_estimate = False
+
+    def __init__(self, *args, count_limit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if count_limit is not None:
+            self.count_limit = count_limit
+
+    @staticmethod
+    def table_rows(queryset):
+        """
+        Returns the estimated number of rows of the table of `queryset`, or
+        None when the database does not keep table statistics.
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != 'mysql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT TABLE_ROWS FROM information_schema.TABLES '
+                'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            rows = self.table_rows(queryset)
+            if rows is not None and rows >= self.count_limit:
+                self.count_is_estimate = True
+                return rows
+
+        count = queryset.order_by().values('pk')[:self.count_limit + 1].count()
+        if count > self.count_limit:
+            self.count_is_estimate = True
+            return self.count_limit
+        return count
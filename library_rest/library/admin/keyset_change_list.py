@@ -0,0 +1,153 @@
+import base64
+import binascii
+import json
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+# Query string parameter holding the position after which the next page starts.
+CURSOR_VAR = 'after'
+
+
+class KeysetChangeList(ChangeList):
+    """
+    ChangeList paging with keyset (seek) queries instead of OFFSET.
+
+    The numbered page links keep working as usual; the "Next" link carries a
+    cursor with the ordering values of the last row of the page, and the page
+    it points to is read with a `WHERE (ordering) > (cursor)` query, whose
+    cost does not grow with the page number. Keyset paging is used when every
+    ordering term is a non-nullable column of the model; any other ordering
+    falls back to OFFSET paging.
+
+    The primary key tie-breaker added to make the ordering deterministic
+    follows the direction of the first ordering term, so that a composite
+    `(column, id)` index can serve the ordering in both directions.
+
+    Attributes:
+        cursor (str): The cursor of the current page, if any.
+        next_page_url (str): The query string of the next page, if any.
+        first_page_url (str): The query string of the first page.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.next_page_url = None
+        super().__init__(request, *args, **kwargs)
+        self.first_page_url = self.get_query_string(remove=[PAGE_VAR])
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # A cursor only makes sense for the page it was built for.
+        if CURSOR_VAR not in (new_params or {}):
+            remove = [*(remove or []), CURSOR_VAR]
+        return super().get_query_string(new_params, remove)
+
+    def get_ordering(self, request, queryset):
+        ordering = super().get_ordering(request, queryset)
+        if (
+            len(ordering) > 1 and ordering[-1] == '-pk' and
+            isinstance(ordering[0], str) and not ordering[0].startswith('-')
+        ):
+            ordering[-1] = 'pk'
+        return ordering
+
+    def keyset_fields(self):
+        """
+        Returns the (attname, descending) pairs of the ordering, or None when
+        the ordering cannot be used for keyset paging.
+        """
+        fields = []
+        for term in self.queryset.query.order_by:
+            if not isinstance(term, str):
+                return None
+            name = term.removeprefix('-')
+            try:
+                field = (
+                    self.lookup_opts.pk if name == 'pk'
+                    else self.lookup_opts.get_field(name)
+                )
+            except FieldDoesNotExist:
+                return None
+            if field.null or (field.is_relation and not field.primary_key):
+                return None
+            fields.append((field.attname, term.startswith('-')))
+        return fields or None
+
+    @staticmethod
+    def encode_cursor(values):
+        data = json.dumps(values, cls=DjangoJSONEncoder).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            return json.loads(data)
+        except (binascii.Error, ValueError) as error:
+            raise IncorrectLookupParameters(error)
+
+    @staticmethod
+    def seek(fields, values):
+        """
+        Returns the condition selecting the rows after `values` in the
+        `fields` ordering.
+        """
+        (first, first_descending), first_value = fields[0], values[0]
+        condition = Q()
+        for index, (name, descending) in enumerate(fields):
+            term = Q(**{f'{name}__{"lt" if descending else "gt"}': values[index]})
+            for previous, value in zip(fields[:index], values):
+                term &= Q(**{previous[0]: value})
+            condition |= term
+        if len(fields) == 1:
+            return condition
+        # The redundant bound on the first column gives the optimizer a range.
+        bound = Q(**{f'{first}__{"lte" if first_descending else "gte"}': first_value})
+        return bound & condition
+
+    def get_results(self, request):
+        fields = self.keyset_fields()
+
+        if self.cursor and fields:
+            values = self.decode_cursor(self.cursor)
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise IncorrectLookupParameters('Invalid cursor.')
+
+            paginator = self.model_admin.get_paginator(
+                request, self.queryset, self.list_per_page)
+            self.result_count = paginator.count
+            self.show_full_result_count = self.model_admin.show_full_result_count
+            self.full_result_count = (
+                self.root_queryset.count() if self.show_full_result_count else None
+            )
+            self.show_admin_actions = not self.show_full_result_count or bool(
+                self.full_result_count)
+            self.result_list = self.queryset.filter(
+                self.seek(fields, values))[:self.list_per_page]
+            self.can_show_all = False
+            # The numbered links are replaced by the first/next links.
+            self.multi_page = False
+            self.paginator = paginator
+        else:
+            super().get_results(request)
+            if not self.multi_page or (self.show_all and self.can_show_all):
+                return
+
+        if fields:
+            rows = list(self.result_list)
+            if len(rows) == self.list_per_page:
+                last = rows[-1]
+                self.next_page_url = self.get_query_string({
+                    CURSOR_VAR: self.encode_cursor(
+                        [getattr(last, name) for name, _ in fields]),
+                    PAGE_VAR: self.page_num + 1,
+                })
@@ -0,0 +1,40 @@
+from django.contrib import admin
+
+from library.admin.estimated_count_paginator import EstimatedCountPaginator
+from library.admin.keyset_change_list import KeysetChangeList
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin mixin for changelists over tables with millions of rows.
+
+    - The result count comes from `EstimatedCountPaginator` (table statistics
+      or a bounded count) and the full, unfiltered count is not computed.
+    - Pages after the first are read with keyset queries (`KeysetChangeList`).
+    - Filter facets, which count every choice of every filter, are disabled.
+
+    Combine it with `list_select_related` for the relations shown in
+    `list_display`, `^` (prefix, index friendly) `search_fields` and
+    `AutocompleteListFilter` for foreign key filters.
+
+    Attributes:
+        count_limit (int): The number of rows counted exactly by the paginator.
+
+    Methods:
+        get_changelist(request, **kwargs): Returns KeysetChangeList.
+        get_paginator(request, queryset, per_page, ...): Returns an EstimatedCountPaginator.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    count_limit = 10000
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            count_limit=self.count_limit)
@@ -0,0 +1,172 @@
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import router
+from django.urls import reverse
+
+from library.models import Author, CacheVersion
+
+
+AUTHOR_CACHE_CONFIG = {
+    'ENABLED': True,
+    'MAX_SIZE': 10000,
+    **getattr(settings, 'LIBRARY_AUTHOR_CACHE', {}),
+}
+
+# Attribute of a request holding the caches whose version has been checked for it.
+CHECKED_ATTR = '_author_cache_checked'
+
+
+class CachedAuthor(NamedTuple):
+    """
+    The identity of an author, as held by the AuthorCache.
+
+    Attributes:
+        pk (int): The primary key of the author.
+        first_name (str): The first name of the author.
+        last_name (str): The last name of the author.
+        citizenship (str): The citizenship of the author.
+        name (str): The display name of the author ('last_name, first_name').
+        path (str): The path of the author detail endpoint.
+    """
+
+    pk: int
+    first_name: str
+    last_name: str
+    citizenship: str
+    name: str
+    path: str
+
+    FIELDS = ('id', 'first_name', 'last_name', 'citizenship')
+
+    def instance(self):
+        """
+        Returns an Author holding the cached fields, the others being deferred.
+        """
+        return Author.from_db(
+            router.db_for_read(Author), self.FIELDS,
+            (self.pk, self.first_name, self.last_name, self.citizenship))
+
+
+class AuthorCache:
+    """
+    Per-process LRU cache of author identities (id -> CachedAuthor).
+
+    Authors are few, read by nearly every book request and rarely changed.
+    The cache serves the author name and URL of serialized books and the
+    validation of the `author` of written books without querying `authors`.
+
+    The cache is invalidated across processes through the 'authors'
+    CacheVersion, bumped by `Author.save` (renames and citizenship changes),
+    `Author.delete` and the bulk `delete()` and `update()` of AuthorQuerySet:
+    the version is read at most once per request (a primary key lookup, only
+    for requests using the cache) and the whole cache is dropped when it
+    changed. Writes bypassing the ORM (raw SQL) must bump the version
+    themselves.
+
+    Configured with the `LIBRARY_AUTHOR_CACHE` setting:
+        ENABLED (bool): Whether serializers use the cache.
+        MAX_SIZE (int): The maximum number of authors held.
+
+    Attributes:
+        using (str): The database the authors are loaded from, None for the default one.
+
+    Methods:
+        get_version(): Returns the current version of the authors.
+        refresh(request=None): Drops the cache if the version changed; checked once per request.
+        get_many(pks, request=None): Returns the cached authors with the given primary keys,
+            loading the missing ones with one query.
+        get(pk, request=None): Returns the cached author, or None if it does not exist.
+        clear(): Drops every cached author.
+    """
+
+    def __init__(self, max_size=10000, enabled=True, using=None):
+        self.max_size = max_size
+        self.enabled = enabled
+        self.using = using
+        self.version = None
+        self._authors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_version(self):
+        return CacheVersion.objects.get_version(CacheVersion.AUTHORS)
+
+    def refresh(self, request=None):
+        if request is not None:
+            checked = getattr(request, CHECKED_ATTR, set())
+            if self in checked:
+                return
+            setattr(request, CHECKED_ATTR, checked | {self})
+
+        version = self.get_version()
+        with self._lock:
+            if version != self.version:
+                self._authors.clear()
+                self.version = version
+
+    def _load(self, pks):
+        return {
+            pk: CachedAuthor(pk, first_name, last_name, citizenship,
+                             f'{last_name}, {first_name}',
+                             reverse('author-detail', kwargs={'pk': pk}))
+            for pk, first_name, last_name, citizenship in Author.objects.db_manager(
+                self.using).filter(pk__in=pks).values_list(*CachedAuthor.FIELDS)
+        }
+
+    def get_many(self, pks, request=None):
+        self.refresh(request)
+        found, missing = {}, []
+        with self._lock:
+            for pk in pks:
+                author = self._authors.get(pk)
+                if author is None:
+                    missing.append(pk)
+                else:
+                    self._authors.move_to_end(pk)
+                    found[pk] = author
+            version = self.version
+        if not missing:
+            return found
+
+        loaded = self._load(missing)
+        found.update(loaded)
+        with self._lock:
+            if version == self.version:
+                self._authors.update(loaded)
+                while len(self._authors) > self.max_size:
+                    self._authors.popitem(last=False)
+        return found
+
+    def get(self, pk, request=None):
+        return self.get_many([pk], request).get(pk)
+
+    def clear(self):
+        with self._lock:
+            self._authors.clear()
+            self.version = None
+
+
+author_cache = AuthorCache(
+    max_size=AUTHOR_CACHE_CONFIG['MAX_SIZE'],
+    enabled=AUTHOR_CACHE_CONFIG['ENABLED'],
+)
+
+# Caches of the authors of other databases, by alias.
+_caches = {}
+
+
+def register_author_cache(using, cache):
+    """
+    Registers the AuthorCache serving the instances read from the database `using`.
+    """
+    _caches[using] = cache
+    return cache
+
+
+def get_author_cache(using=None):
+    """
+    Returns the AuthorCache of the instances read from the database `using`.
+    """
+    return _caches.get(using, author_cache)
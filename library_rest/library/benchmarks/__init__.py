@@ -0,0 +1,3 @@
+from .burst import BurstRunner
+from .catalog import CatalogSeeder
+from .runner import BenchmarkRunner, QueryScenario, Scenario, stand_in_user
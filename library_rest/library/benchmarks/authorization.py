@@ -0,0 +1,140 @@
+# file: library_rest/library/benchmarks/authorization.py
+
+import json
+
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from library.benchmarks.runner import benchmark_host, stand_in_user, time_calls
+from library.models import Book
+from library.views.book_view_set import BookViewSet
+from library_rest.permissions import ROLES_ATTR, KeycloakRolePermission
+from library_rest.throttling import PrincipalRateThrottle
+
+
+class AuthorizationBenchmark:
+    """
+    Measures the cost of authorized and rejected requests (see
+    library_rest.permissions.KeycloakRolePermission).
+
+    Reports, in microseconds per request:
+    - the permission check alone, with the role set of the user resolved or
+      not yet resolved (the first check of a request);
+    - the complete dispatch of a book retrieve by a user with and without the
+      'view-books' role;
+    - the complete dispatch of a bulk update of `changes` books by a user
+      without the 'create-book' role, next to the cost of parsing its body
+      and of the authorized bulk update (rolled back).
+
+    The role sets are dropped before each dispatch, as each request resolves
+    them for its own user. The report also tells whether the body of a
+    rejected bulk update was read.
+
+    Methods:
+        run(): Runs the measurements and returns the report as a dict.
+    """
+
+    def __init__(self, iterations=20000, changes=1000, write_iterations=20):
+        self.iterations = iterations
+        self.changes = changes
+        self.write_iterations = write_iterations
+        self.factory = APIRequestFactory(SERVER_NAME=benchmark_host())
+        self.reader = stand_in_user(roles=('view-books',), username='benchmark-reader')
+        self.writer = stand_in_user()
+        self.outsider = stand_in_user(roles=(), username='benchmark-outsider')
+
+    def _dispatcher(self, actions, user, build):
+        view = BookViewSet.as_view(actions)
+
+        def dispatch(django_request=None, **kwargs):
+            django_request = django_request or build()
+            force_authenticate(django_request, user)
+            user.__dict__.pop(ROLES_ATTR, None)
+            return view(django_request, **kwargs)
+        return dispatch
+
+    def _bulk_body(self):
+        books = list(Book.objects.order_by('pk').values_list('pk', 'title')[:self.changes])
+        return json.dumps({'changes': [{'id': pk, 'title': title} for pk, title in books]})
+
+    def _measure_permission(self):
+        permission = KeycloakRolePermission()
+        report = {}
+        for name, user in (('authorized', self.reader), ('rejected', self.outsider)):
+            request = Request(self.factory.get('/library/books'))
+            request.user = user
+            view = BookViewSet(action='list', request=request)
+
+            def first_check():
+                user.__dict__.pop(ROLES_ATTR, None)
+                permission.has_permission(request, view)
+
+            report[name] = {
+                'first_check': time_calls(first_check, self.iterations),
+                'resolved': time_calls(
+                    lambda: permission.has_permission(request, view), self.iterations),
+            }
+        return report
+
+    def _measure_retrieve(self):
+        pk = Book.objects.values_list('pk', flat=True).first() or 1
+        report = {}
+        for name, user in (('authorized', self.reader), ('rejected', self.outsider)):
+            dispatch = self._dispatcher(
+                {'get': 'retrieve'}, user, lambda: self.factory.get(f'/library/books/{pk}'))
+            status_code = dispatch(pk=pk).status_code
+            report[name] = {
+                'status': status_code,
+                **time_calls(lambda: dispatch(pk=pk), self.iterations),
+            }
+        return report
+
+    def _measure_bulk_update(self):
+        body = self._bulk_body()
+
+        def build():
+            return self.factory.post(
+                '/library/books/bulk-update', body, content_type='application/json')
+
+        rejected = build()
+        dispatch = self._dispatcher({'post': 'bulk_update'}, self.reader, build)
+        status_code = dispatch(rejected).status_code
+        report = {
+            'body_bytes': len(body),
+            'rejected': {
+                'status': status_code,
+                'body_read': rejected._read_started,
+                **time_calls(lambda: dispatch(rejected), self.iterations),
+            },
+            'parse_body': time_calls(
+                lambda: Request(build(), parsers=BookViewSet().get_parsers()).data,
+                self.write_iterations, batch=1),
+        }
+
+        dispatch = self._dispatcher({'post': 'bulk_update'}, self.writer, build)
+
+        def authorized():
+            with transaction.atomic():
+                response = dispatch()
+                transaction.set_rollback(True)
+            return response
+
+        report['authorized'] = {
+            'status': authorized().status_code,
+            **time_calls(authorized, self.write_iterations, batch=1),
+        }
+        return report
+
+    def run(self):
+        enabled = PrincipalRateThrottle.enabled
+        PrincipalRateThrottle.enabled = False
+        try:
+            return {
+                'iterations': self.iterations,
+                'permission': self._measure_permission(),
+                'retrieve': self._measure_retrieve(),
+                'bulk_update': self._measure_bulk_update(),
+            }
+        finally:
+            PrincipalRateThrottle.enabled = enabled
@@ -0,0 +1,97 @@
+# file: library_rest/library/benchmarks/burst.py
+
+import statistics
+import threading
+import time
+
+from django.db import connection
+from rest_framework.test import APIClient
+
+from library.benchmarks.runner import benchmark_host, percentile, stand_in_user
+
+
+class BurstRunner:
+    """
+    Issues bursts of identical concurrent GET requests, as during a traffic
+    spike on a popular search.
+
+    Each burst starts `concurrency` threads, each with its own client and
+    database connection, and releases them together with a barrier. The
+    latency of every request and the number of queries run by the whole
+    burst are collected, which shows how much work concurrent identical
+    requests share (see CoalescedListMixin).
+
+    Attributes:
+        concurrency (int): Number of concurrent requests per burst.
+        rounds (int): Number of measured bursts.
+
+    Methods:
+        run(name, path): Runs the bursts against `path` and returns their statistics as a dict.
+    """
+
+    def __init__(self, concurrency=16, rounds=10, user=None):
+        self.concurrency = concurrency
+        self.rounds = rounds
+        self.user = user or stand_in_user()
+
+    def _burst(self, path):
+        barrier = threading.Barrier(self.concurrency)
+        latencies, queries, statuses = [], [], []
+        lock = threading.Lock()
+
+        def count_queries(execute, sql, params, many, context):
+            with lock:
+                queries.append(sql)
+            return execute(sql, params, many, context)
+
+        def request():
+            client = APIClient(SERVER_NAME=benchmark_host(), HTTP_ACCEPT='application/json')
+            client.force_authenticate(user=self.user)
+            try:
+                with connection.execute_wrapper(count_queries):
+                    barrier.wait()
+                    start = time.perf_counter()
+                    response = client.get(path)
+                    elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=request) for _ in range(self.concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start, latencies, len(queries), statuses
+
+    def run(self, name, path):
+        self._burst(path)  # warm-up
+
+        durations, latencies, queries = [], [], []
+        for _ in range(self.rounds):
+            duration, burst_latencies, burst_queries, statuses = self._burst(path)
+            failed = [code for code in statuses if code != 200]
+            if failed:
+                raise AssertionError(f'{name}: got status {failed[0]} for GET {path}')
+            durations.append(duration)
+            latencies.extend(burst_latencies)
+            queries.append(burst_queries)
+
+        return {
+            'name': name,
+            'path': path,
+            'concurrency': self.concurrency,
+            'rounds': self.rounds,
+            'latency_ms': {
+                'p50': percentile(latencies, 50) * 1000,
+                'p95': percentile(latencies, 95) * 1000,
+                'p99': percentile(latencies, 99) * 1000,
+                'max': max(latencies) * 1000,
+            },
+            'burst_ms': statistics.fmean(durations) * 1000,
+            'queries_per_burst': statistics.fmean(queries),
+            'requests_per_sec': self.concurrency * self.rounds / sum(durations),
+        }
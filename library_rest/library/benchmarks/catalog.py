@@ -0,0 +1,182 @@
+# file: library_rest/library/benchmarks/catalog.py
+
+import random
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from library.models import Author, Book
+
+
+FIRST_NAMES = [
+    'Ada', 'Agatha', 'Alberto', 'Alessandro', 'Alice', 'Anna', 'Antonio', 'Arthur',
+    'Beatrice', 'Carlo', 'Charles', 'Charlotte', 'Clara', 'Dante', 'David', 'Edith',
+    'Elena', 'Elizabeth', 'Emily', 'Ernest', 'Eugenio', 'Fernando', 'Franz', 'Gabriel',
+    'George', 'Giacomo', 'Giovanni', 'Grazia', 'Gustave', 'Hannah', 'Henry', 'Herman',
+    'Isabel', 'Italo', 'Jane', 'Johann', 'John', 'Jorge', 'Jose', 'Leo', 'Leonardo',
+    'Louisa', 'Luigi', 'Margaret', 'Maria', 'Mark', 'Mary', 'Natalia', 'Oscar', 'Paul',
+    'Primo', 'Rainer', 'Rosa', 'Salvatore', 'Samuel', 'Simone', 'Sophia', 'Thomas',
+    'Umberto', 'Victor', 'Virginia', 'Walter', 'William', 'Yukio', 'Zadie',
+]
+
+LAST_NAMES = [
+    'Alighieri', 'Austen', 'Balzac', 'Borges', 'Bronte', 'Buzzati', 'Calvino', 'Camus',
+    'Cervantes', 'Chekhov', 'Christie', 'Collins', 'Conrad', 'Deledda', 'Dickens', 'Eco',
+    'Eliot', 'Fitzgerald', 'Flaubert', 'Fo', 'Gadda', 'Garcia', 'Ginzburg', 'Goethe',
+    'Hemingway', 'Hesse', 'Hugo', 'Joyce', 'Kafka', 'Keats', 'Lampedusa', 'Leopardi',
+    'Levi', 'Manzoni', 'Mann', 'Melville', 'Mishima', 'Montale', 'Morante', 'Moravia',
+    'Murakami', 'Nabokov', 'Orwell', 'Pavese', 'Pessoa', 'Pirandello', 'Poe', 'Proust',
+    'Rilke', 'Saramago', 'Sciascia', 'Shelley', 'Smith', 'Svevo', 'Tolstoy', 'Twain',
+    'Ungaretti', 'Verga', 'Verne', 'Whitman', 'Wilde', 'Woolf', 'Yeats', 'Zola',
+]
+
+CITIZENSHIPS = [
+    ('Italian', 30), ('British', 18), ('American', 16), ('French', 10), ('German', 8),
+    ('Spanish', 5), ('Russian', 4), ('Japanese', 3), ('Portuguese', 2), ('Argentine', 2),
+    ('Irish', 1), ('Austrian', 1),
+]
+
+TITLE_ADJECTIVES = [
+    'Silent', 'Lost', 'Golden', 'Hidden', 'Last', 'Broken', 'Endless', 'Forgotten',
+    'Little', 'Secret', 'Burning', 'Invisible', 'Distant', 'Crimson', 'Quiet', 'Wild',
+]
+
+TITLE_NOUNS = [
+    'City', 'River', 'Garden', 'Mountain', 'Road', 'House', 'Winter', 'Summer', 'Sea',
+    'Kingdom', 'Letters', 'Memories', 'Night', 'Island', 'Voyage', 'Forest', 'Mirror',
+    'Harbour', 'Storm', 'Library', 'Tower', 'Shadow', 'Promise', 'Season',
+]
+
+TITLE_PATTERNS = [
+    'The {adjective} {noun}',
+    '{noun} of the {adjective} {noun2}',
+    'A {adjective} {noun}',
+    'The {noun} and the {noun2}',
+    '{adjective} {noun}s',
+]
+
+
+class CatalogSeeder:
+    """
+    Generates a synthetic, reproducible catalog of authors and books.
+
+    Names, citizenships and dates follow skewed distributions so that the
+    generated data behaves like a real catalog: a few prolific authors own
+    most of the books, citizenship is dominated by a handful of countries and
+    publication dates fall inside each author's lifetime.
+
+    Attributes:
+        seed (int): Seed of the pseudo random generator, so that runs are reproducible.
+        batch_size (int): Number of rows sent to the database in each INSERT.
+        today (date): Upper bound for every generated date.
+
+    Methods:
+        seed_authors(count, progress=None): Inserts `count` authors and returns their ids,
+            sort keys and lifetimes.
+        seed_books(count, authors, progress=None): Inserts `count` books spread across `authors`.
+        clear(): Deletes every book and author.
+    """
+
+    def __init__(self, seed=0, batch_size=5000, today=None):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.today = today or date.today()
+
+    def clear(self):
+        Book.objects.all().delete()
+        Author.objects.all().delete()
+
+    def _random_date(self, start, end):
+        if end <= start:
+            return start
+        return start + timedelta(days=self.random.randint(0, (end - start).days))
+
+    def _author(self):
+        birth_year = int(self.random.gauss(1900, 60))
+        birth_year = max(1450, min(birth_year, self.today.year - 20))
+        date_of_birth = self._random_date(
+            date(birth_year, 1, 1), date(birth_year, 12, 31)
+        )
+
+        date_of_death = None
+        lifespan = int(self.random.gauss(72, 12))
+        if self.random.random() < 0.75 and birth_year + lifespan < self.today.year:
+            date_of_death = self._random_date(
+                date(birth_year + lifespan, 1, 1),
+                date(birth_year + lifespan, 12, 31)
+            )
+
+        citizenships, weights = zip(*CITIZENSHIPS)
+
+        return Author(
+            first_name=self.random.choice(FIRST_NAMES),
+            last_name=self.random.choice(LAST_NAMES),
+            citizenship=self.random.choices(citizenships, weights)[0],
+            date_of_birth=date_of_birth,
+            date_of_death=date_of_death,
+        )
+
+    def _title(self):
+        nouns = self.random.sample(TITLE_NOUNS, 2)
+        return self.random.choice(TITLE_PATTERNS).format(
+            adjective=self.random.choice(TITLE_ADJECTIVES),
+            noun=nouns[0],
+            noun2=nouns[1],
+        )
+
+    def _publication_date(self, date_of_birth, date_of_death):
+        start = date_of_birth + timedelta(days=18 * 365)
+        end = min(date_of_death or self.today, self.today)
+        return self._random_date(start, end)
+
+    def _insert(self, model, objects):
+        with transaction.atomic():
+            model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def seed_authors(self, count, progress=None):
+        last_id = Author.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+
+        created = 0
+        while created < count:
+            size = min(self.batch_size, count - created)
+            self._insert(Author, [self._author() for _ in range(size)])
+            created += size
+            if progress:
+                progress(created, count)
+
+        return [
+            (pk, f'{last_name}, {first_name}', date_of_birth, date_of_death)
+            for pk, last_name, first_name, date_of_birth, date_of_death in
+            Author.objects.filter(pk__gt=last_id).order_by('pk').values_list(
+                'pk', 'last_name', 'first_name', 'date_of_birth', 'date_of_death')
+        ]
+
+    def seed_books(self, count, authors, progress=None):
+        if not authors:
+            return
+
+        # Pareto weights: a small share of the authors writes most of the books.
+        cum_weights = []
+        total = 0.0
+        for _ in authors:
+            total += self.random.paretovariate(1.2)
+            cum_weights.append(total)
+
+        created = 0
+        while created < count:
+            size = min(self.batch_size, count - created)
+            picked = self.random.choices(authors, cum_weights=cum_weights, k=size)
+            self._insert(Book, [
+                Book(
+                    title=self._title(),
+                    author_id=author_id,
+                    author_sort_key=sort_key,
+                    publication_date=self._publication_date(
+                        date_of_birth, date_of_death)
+                )
+                for author_id, sort_key, date_of_birth, date_of_death in picked
+            ])
+            created += size
+            if progress:
+                progress(created, count)
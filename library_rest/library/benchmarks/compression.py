@@ -0,0 +1,67 @@
+# file: library_rest/library/benchmarks/compression.py
+
+import time
+import zlib
+
+from library_rest.compression import available_encodings, get_compressor
+
+
+LEVELS = {
+    'zstd': [1, 3, 9, 19],
+    'gzip': [1, 6, 9],
+    'deflate': [1, 6, 9],
+}
+
+DECOMPRESSORS = {
+    'gzip': lambda data: zlib.decompress(data, 31),
+    'deflate': zlib.decompress,
+}
+
+
+def measure_compression(name, payload, iterations=20, bandwidths_mbit=(10, 100, 1000)):
+    """
+    Measures every available encoding and level on `payload`.
+
+    For each combination the report contains the compression ratio, the CPU
+    time per response and the estimated time to compress and send the body
+    over links of `bandwidths_mbit`, next to the time to send it uncompressed.
+
+    Returns:
+        dict: The measurements of `payload`, JSON serializable.
+    """
+    def transfer_ms(size, mbit):
+        return size * 8 / (mbit * 1_000_000) * 1000
+
+    results = []
+    for encoding in available_encodings():
+        for level in LEVELS[encoding]:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                compressor = get_compressor(encoding, level)
+                compressed = compressor.compress(payload) + compressor.flush()
+            cpu_ms = (time.perf_counter() - start) / iterations * 1000
+
+            if encoding in DECOMPRESSORS:
+                assert DECOMPRESSORS[encoding](compressed) == payload
+
+            results.append({
+                'encoding': encoding,
+                'level': level,
+                'size': len(compressed),
+                'ratio': len(payload) / len(compressed),
+                'cpu_ms': cpu_ms,
+                'throughput_mb_s': len(payload) / 1_000_000 / (cpu_ms / 1000) if cpu_ms else None,
+                'total_ms': {
+                    f'{mbit}mbit': cpu_ms + transfer_ms(len(compressed), mbit)
+                    for mbit in bandwidths_mbit
+                },
+            })
+
+    return {
+        'name': name,
+        'size': len(payload),
+        'uncompressed_ms': {
+            f'{mbit}mbit': transfer_ms(len(payload), mbit) for mbit in bandwidths_mbit
+        },
+        'encodings': results,
+    }
@@ -0,0 +1,233 @@
+# file: library_rest/library/benchmarks/load.py
+
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.db import connection, transaction
+from django.test import Client
+
+from library.benchmarks.runner import BENCHMARK_ROLES, benchmark_host, percentile
+from library_rest.admission import admission_controller
+
+
+class SlowKeycloak:
+    """
+    Local stand-in of the Keycloak endpoints used by KeyCloakAuthentication
+    (userinfo and token introspection), answering after `delay` seconds.
+
+    Every token is accepted as the user `username` with `roles`. Use as a
+    context manager: the server runs in a background thread and `config`
+    holds the `KEYCLOAK_CONFIG` pointing at it.
+    """
+
+    realm = 'library'
+
+    def __init__(self, delay=0.0, username='load-test', roles=BENCHMARK_ROLES):
+        self.delay = delay
+        self.user_info = {
+            'preferred_username': username,
+            'email': f'{username}@example.org',
+            'given_name': username,
+            'family_name': 'Stand-in',
+        }
+        self.token_info = {
+            'active': True,
+            'username': username,
+            'realm_access': {'roles': list(roles)},
+        }
+        self._server = None
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, payload):
+                time.sleep(stand_in.delay)
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply(stand_in.user_info)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                self._reply(stand_in.token_info)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    @property
+    def config(self):
+        host, port = self._server.server_address
+        return {
+            'KEYCLOAK_SERVER_URL': f'http://{host}:{port}/',
+            'KEYCLOAK_REALM': self.realm,
+            'KEYCLOAK_CLIENT_ID': 'library-load-test',
+            'KEYCLOAK_CLIENT_SECRET_KEY': 'load-test',
+        }
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@contextmanager
+def slow_queries(delay):
+    """
+    Delays every query of the current thread's connection by `delay` seconds,
+    standing in for a slow database.
+    """
+    def execute(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    if not delay:
+        yield
+        return
+    with connection.execute_wrapper(execute):
+        yield
+
+
+class LoadTest:
+    """
+    Drives the API with concurrent clients against slowed local stand-ins.
+
+    `concurrency` threads, each with its own client and database
+    connection, issue the `scenarios` (see library.benchmarks.scenarios) in
+    turn for `duration` seconds through the whole middleware stack,
+    authenticating through a SlowKeycloak. Every query is delayed by
+    `db_delay` seconds. A sampler records the peak running and waiting
+    requests of each admission class.
+
+    Methods:
+        run(): Runs the load and returns the report as a dict.
+    """
+
+    def __init__(self, scenarios, context, concurrency=32, duration=10.0, db_delay=0.0,
+                 sample_interval=0.01):
+        self.scenarios = scenarios
+        self.context = context
+        self.concurrency = concurrency
+        self.duration = duration
+        self.db_delay = db_delay
+        self.sample_interval = sample_interval
+
+    def _request(self, client, scenario):
+        path, data = scenario.render(self.context)
+        if scenario.method == 'GET':
+            return client.get(path)
+        return getattr(client, scenario.method.lower())(
+            path, data, content_type='application/json')
+
+    def _client_loop(self, offset, stop_at, results, lock):
+        client = Client(SERVER_NAME=benchmark_host(), HTTP_ACCEPT='application/json',
+                        HTTP_AUTHORIZATION='Bearer load-test')
+        index = offset
+        try:
+            with slow_queries(self.db_delay):
+                while time.monotonic() < stop_at:
+                    scenario = self.scenarios[index % len(self.scenarios)]
+                    index += 1
+                    start = time.perf_counter()
+                    if scenario.rollback:
+                        with transaction.atomic():
+                            response = self._request(client, scenario)
+                            transaction.set_rollback(True)
+                    else:
+                        response = self._request(client, scenario)
+                    elapsed = time.perf_counter() - start
+                    with lock:
+                        results[scenario.name].append((response.status_code, elapsed))
+        finally:
+            connection.close()
+
+    def _sample(self, stop, peaks):
+        while not stop.is_set():
+            for name, queue in admission_controller.queues.items():
+                peaks[name]['in_flight'] = max(peaks[name]['in_flight'], queue.in_flight)
+                peaks[name]['waiting'] = max(peaks[name]['waiting'], queue.waiting)
+            stop.wait(self.sample_interval)
+
+    @staticmethod
+    def _latencies(values):
+        if not values:
+            return None
+        return {
+            'p50': percentile(values, 50) * 1000,
+            'p95': percentile(values, 95) * 1000,
+            'p99': percentile(values, 99) * 1000,
+            'max': max(values) * 1000,
+        }
+
+    def run(self):
+        results = defaultdict(list)
+        lock = threading.Lock()
+        peaks = defaultdict(lambda: {'in_flight': 0, 'waiting': 0})
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(stop, peaks))
+        sampler.start()
+
+        stop_at = time.monotonic() + self.duration
+        threads = [
+            threading.Thread(target=self._client_loop, args=(offset, stop_at, results, lock))
+            for offset in range(self.concurrency)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        sampler.join()
+
+        scenarios = []
+        for scenario in self.scenarios:
+            samples = results.get(scenario.name, [])
+            ok = [latency for status, latency in samples if status < 500]
+            shed = [latency for status, latency in samples if status == 503]
+            scenarios.append({
+                'name': scenario.name,
+                'requests': len(samples),
+                'statuses': dict(Counter(status for status, _ in samples)),
+                'throughput_per_sec': len(ok) / elapsed,
+                'latency_ms': self._latencies(ok),
+                'rejected_latency_ms': self._latencies(shed),
+            })
+
+        return {
+            'concurrency': self.concurrency,
+            'duration_s': elapsed,
+            'db_delay_ms': self.db_delay * 1000,
+            'admission_control': admission_controller.enabled,
+            'scenarios': scenarios,
+            'classes': {
+                name: {
+                    'limit': queue.limit,
+                    'queue_size': queue.queue_size,
+                    'peak_in_flight': peaks[name]['in_flight'],
+                    'peak_waiting': peaks[name]['waiting'],
+                    'admitted': queue.admitted,
+                    'rejected': dict(queue.rejected),
+                    'mean_wait_ms': (
+                        queue.wait_seconds / queue.admitted * 1000 if queue.admitted else 0),
+                }
+                for name, queue in admission_controller.queues.items()
+            },
+        }
@@ -0,0 +1,283 @@
+# file: library_rest/library/benchmarks/query_plans.py
+
+import itertools
+import json
+import re
+from dataclasses import dataclass, field
+
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from library.benchmarks.runner import benchmark_host, stand_in_user
+from library.views import AuthorViewSet, BookViewSet
+
+
+VIEWSETS = {
+    'books': BookViewSet,
+    'authors': AuthorViewSet,
+}
+
+
+@dataclass(frozen=True)
+class Combination:
+    """
+    One filter/search/ordering combination supported by a viewset.
+
+    Attributes:
+        resource (str): The router prefix of the viewset ('books' or 'authors').
+        filters (tuple): The filter parameters set in the query string.
+        ordering (str): The `ordering` parameter, or None for the default ordering.
+        search (bool): Whether the `search` parameter is set.
+    """
+
+    resource: str
+    filters: tuple = ()
+    ordering: str = None
+    search: bool = False
+
+    @property
+    def key(self):
+        parts = [f'{name}=' for name in self.filters]
+        if self.search:
+            parts.append('search=')
+        if self.ordering:
+            parts.append(f'ordering={self.ordering}')
+        return self.resource + ('?' + '&'.join(parts) if parts else '')
+
+
+@dataclass
+class Plan:
+    """
+    The relevant facts extracted from an EXPLAIN output.
+
+    Attributes:
+        full_scans (list): Tables read with a full table scan.
+        filesort (bool): Whether the rows are sorted after being read.
+        indexes (list): Indexes used to access the tables.
+        raw (str): The raw EXPLAIN output.
+    """
+
+    full_scans: list = field(default_factory=list)
+    filesort: bool = False
+    indexes: list = field(default_factory=list)
+    raw: str = ''
+
+    @property
+    def uses_index(self):
+        return bool(self.indexes) and not self.full_scans
+
+
+def filter_lookups(viewset):
+    """
+    Returns the filter parameters of `viewset` as {param: (field_name, lookup_expr)},
+    read from `filterset_class` or, failing that, from `filterset_fields`.
+    """
+    filterset_class = getattr(viewset, 'filterset_class', None)
+    if filterset_class is not None:
+        return {
+            name: (f.field_name, f.lookup_expr)
+            for name, f in filterset_class.base_filters.items()
+        }
+    return {
+        name: (name, 'exact')
+        for name in getattr(viewset, 'filterset_fields', []) or []
+    }
+
+
+def enumerate_combinations(resource, viewset, max_filters=2):
+    """
+    Lists every filter/search/ordering combination declared by `viewset`.
+
+    Every subset of the filter parameters, up to `max_filters` of them, is
+    combined with the default ordering and with each `ordering_fields` entry
+    in both directions, with and without `search`.
+    """
+    filters = list(filter_lookups(viewset))
+    orderings = [None]
+    for name in getattr(viewset, 'ordering_fields', []) or []:
+        orderings += [name, f'-{name}']
+    searches = [False, True] if getattr(viewset, 'search_fields', None) else [False]
+
+    for size in range(min(len(filters), max_filters) + 1):
+        for subset in itertools.combinations(filters, size):
+            for ordering in orderings:
+                for search in searches:
+                    yield Combination(resource, subset, ordering, search)
+
+
+def sample_values(viewset):
+    """
+    Reads one row of the viewset queryset to use its values as filter parameters.
+    """
+    instance = viewset.queryset.order_by('pk').first()
+    if instance is None:
+        raise ValueError(
+            'The catalog is empty: run the seed_catalog command first.')
+
+    model = viewset.queryset.model
+    values = {}
+    for name, (field_name, _) in filter_lookups(viewset).items():
+        value = getattr(instance, model._meta.get_field(field_name).attname)
+        values[name] = value.isoformat() if hasattr(value, 'isoformat') else value
+
+    text = next(
+        (getattr(instance, name) for name in ('last_name', 'title')
+         if getattr(instance, name, None)), 'a'
+    )
+    values['search'] = text.split()[-1]
+    return values
+
+
+def build_queryset(combination, values, page_size):
+    """
+    Builds the queryset `list` would run for `combination`, sliced to one page.
+    """
+    viewset_class = VIEWSETS[combination.resource]
+    params = {name: values[name] for name in combination.filters}
+    if combination.search:
+        params['search'] = values['search']
+    if combination.ordering:
+        params['ordering'] = combination.ordering
+
+    factory = APIRequestFactory(SERVER_NAME=benchmark_host())
+    django_request = factory.get(f'/library/{combination.resource}', params)
+    django_request.user = stand_in_user()
+
+    view = viewset_class()
+    view.action = 'list'
+    view.format_kwarg = None
+    view.args, view.kwargs = (), {}
+    view.request = Request(django_request)
+    view.request.user = django_request.user
+    view.headers = {}
+
+    return view.filter_queryset(view.get_queryset())[:page_size]
+
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def parse_mysql_plan(raw):
+    plan = Plan(raw=raw)
+    for node in _walk(json.loads(raw)):
+        if node.get('using_filesort'):
+            plan.filesort = True
+        if 'table_name' in node:
+            if node.get('access_type') == 'ALL':
+                plan.full_scans.append(node['table_name'])
+            if node.get('key'):
+                plan.indexes.append(f'{node["table_name"]}.{node["key"]}')
+    return plan
+
+
+SQLITE_SCAN = re.compile(r'\bSCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?')
+SQLITE_SEARCH = re.compile(r'\bSEARCH (\w+) USING (?:COVERING )?(?:INDEX (\w+)|INTEGER PRIMARY KEY)')
+
+
+def parse_sqlite_plan(raw):
+    plan = Plan(raw=raw)
+    for line in raw.splitlines():
+        if 'TEMP B-TREE' in line:
+            plan.filesort = True
+        match = SQLITE_SEARCH.search(line)
+        if match:
+            plan.indexes.append(f'{match.group(1)}.{match.group(2) or "PRIMARY"}')
+            continue
+        match = SQLITE_SCAN.search(line)
+        if match:
+            if match.group(2):
+                plan.indexes.append(f'{match.group(1)}.{match.group(2)}')
+            else:
+                plan.full_scans.append(match.group(1))
+    return plan
+
+
+def explain(queryset):
+    """
+    Runs EXPLAIN for `queryset` on the default database and parses the result.
+    """
+    if connection.vendor == 'mysql':
+        return parse_mysql_plan(queryset.explain(format='json'))
+    if connection.vendor == 'sqlite':
+        return parse_sqlite_plan(queryset.explain())
+    raise NotImplementedError(
+        f'Query plans are not supported on {connection.vendor}.')
+
+
+def suggest_index(combination):
+    """
+    Suggests an index covering `combination`: equality filters first, then
+    range filters and the ordering column, so the rows come out of the index
+    already sorted.
+
+    Returns:
+        tuple: (table, fields) of the suggested index, or None when the
+        combination cannot be served by a B-tree index.
+    """
+    viewset = VIEWSETS[combination.resource]
+    model = viewset.queryset.model
+    lookups = filter_lookups(viewset)
+
+    fields = []
+    for name in sorted(combination.filters, key=lambda name: lookups[name][1] != 'exact'):
+        if lookups[name][0] not in fields:
+            fields.append(lookups[name][0])
+    if combination.ordering:
+        ordering = combination.ordering.lstrip('-')
+        aliases = getattr(viewset, 'ordering_aliases', {})
+        for name in aliases.get(ordering, (ordering,)):
+            if name not in fields:
+                fields.append(name)
+    if not fields:
+        return None
+    return model._meta.db_table, tuple(fields)
+
+
+def check_plans(page_size=5, max_filters=2):
+    """
+    EXPLAINs every combination of both viewsets.
+
+    Returns:
+        dict: combination key -> {'plan': Plan, 'combination': Combination}.
+    """
+    results = {}
+    for resource, viewset in VIEWSETS.items():
+        values = sample_values(viewset)
+        for combination in enumerate_combinations(resource, viewset, max_filters):
+            queryset = build_queryset(combination, values, page_size)
+            results[combination.key] = {
+                'combination': combination,
+                'plan': explain(queryset),
+            }
+    return results
+
+
+def find_regressions(results, baseline):
+    """
+    Returns the keys of the combinations that used an index in `baseline` but
+    no longer do.
+    """
+    return sorted(
+        key for key, result in results.items()
+        if baseline.get(key, {}).get('uses_index') and not result['plan'].uses_index
+    )
+
+
+def to_baseline(results):
+    return {
+        key: {
+            'uses_index': result['plan'].uses_index,
+            'indexes': result['plan'].indexes,
+            'full_scans': result['plan'].full_scans,
+            'filesort': result['plan'].filesort,
+        }
+        for key, result in sorted(results.items())
+    }
@@ -0,0 +1,268 @@
+# file: library_rest/library/benchmarks/runner.py
+
+import json
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from library_rest.authentications import KeyCloakUser
+
+
+BENCHMARK_ROLES = ('view-books', 'create-book', 'create-author')
+
+
+def stand_in_user(roles=BENCHMARK_ROLES, username='benchmark'):
+    """
+    Builds the same user object `KeyCloakAuthentication` would build, without
+    contacting a Keycloak server.
+
+    Args:
+        roles (iterable): The realm roles granted to the user.
+        username (str): The `preferred_username` of the user.
+
+    Returns:
+        KeyCloakUser: A user carrying synthetic `user_info` and `token_info` payloads.
+    """
+    user_info = {
+        'preferred_username': username,
+        'email': f'{username}@example.org',
+        'given_name': username,
+        'family_name': 'Stand-in',
+    }
+    token_info = {
+        'active': True,
+        'username': username,
+        'client_id': 'library-benchmark',
+        'realm_access': {'roles': list(roles)},
+    }
+    return KeyCloakUser.from_keycloak(user_info, token_info)
+
+
+def benchmark_host():
+    """
+    Returns a host name accepted by `ALLOWED_HOSTS`, used for in-process requests.
+    """
+    for host in settings.ALLOWED_HOSTS:
+        if host not in ('*', '') and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def percentile(values, pct):
+    """
+    Returns the `pct` percentile of `values` using linear interpolation.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def time_calls(call, iterations, batch=100):
+    """
+    Returns the cost of `call` in microseconds per call, measured over batches.
+    """
+    samples = []
+    for _ in range(max(1, iterations // batch)):
+        start = time.perf_counter_ns()
+        for _ in range(batch):
+            call()
+        samples.append((time.perf_counter_ns() - start) / batch / 1000)
+    return {
+        'mean_us': sum(samples) / len(samples),
+        'p50_us': percentile(samples, 50),
+        'p99_us': percentile(samples, 99),
+    }
+
+
+def code_version():
+    """
+    Returns the current git commit, or None outside of a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@dataclass
+class Scenario:
+    """
+    A single benchmark scenario against the REST API.
+
+    Attributes:
+        name (str): Unique name of the scenario, used as key in the report.
+        method (str): HTTP method of the request.
+        path (str): Request path; `{placeholders}` are filled from the runner context.
+        data (dict): Optional request body; string values, also nested, are formatted like `path`.
+        expected_status (int): Status code every iteration must return.
+        rollback (bool): Whether the changes made by the request are rolled back.
+    """
+
+    name: str
+    method: str
+    path: str
+    data: dict = field(default_factory=dict)
+    expected_status: int = 200
+    rollback: bool = False
+
+    @classmethod
+    def _format(cls, value, context):
+        if isinstance(value, str):
+            return value.format(**context)
+        if isinstance(value, dict):
+            return {key: cls._format(item, context) for key, item in value.items()}
+        if isinstance(value, list):
+            return [cls._format(item, context) for item in value]
+        return value
+
+    def render(self, context):
+        return self.path.format(**context), self._format(self.data, context)
+
+
+@dataclass
+class QueryScenario:
+    """
+    A benchmark scenario that evaluates an ORM queryset directly, used to
+    compare query shapes (e.g. OFFSET vs keyset paging) without the HTTP stack.
+
+    Attributes:
+        name (str): Unique name of the scenario, used as key in the report.
+        queryset (callable): Receives the runner context and returns the queryset to evaluate.
+    """
+
+    name: str
+    queryset: object
+
+
+class BenchmarkRunner:
+    """
+    Runs `Scenario` objects through the full DRF stack, and `QueryScenario`
+    objects through the ORM, and collects statistics.
+
+    Requests are issued in-process with `APIClient`, authenticated as a
+    `stand_in_user`, so the numbers measure the Django/DRF/database path
+    without the network round trips to Keycloak.
+
+    Attributes:
+        iterations (int): Number of measured requests per scenario.
+        warmup (int): Number of unmeasured requests issued before measuring.
+        context (dict): Values used to fill the scenario placeholders.
+
+    Methods:
+        run(scenario): Runs a scenario and returns its statistics as a dict.
+        run_all(scenarios): Runs every scenario and returns a JSON serializable report.
+    """
+
+    def __init__(self, context, iterations=50, warmup=5, user=None):
+        self.context = context
+        self.iterations = iterations
+        self.warmup = warmup
+        self.client = APIClient(
+            SERVER_NAME=benchmark_host(), HTTP_ACCEPT='application/json')
+        self.client.force_authenticate(user=user or stand_in_user())
+
+    def _request(self, scenario, path, data):
+        method = getattr(self.client, scenario.method.lower())
+        if scenario.rollback:
+            with transaction.atomic():
+                response = method(path, data, format='json')
+                transaction.set_rollback(True)
+        else:
+            response = method(path, data, format='json')
+
+        if response.status_code != scenario.expected_status:
+            raise AssertionError(
+                f'{scenario.name}: expected {scenario.expected_status}, '
+                f'got {response.status_code} for {scenario.method} {path}'
+            )
+        return response
+
+    @staticmethod
+    def _rows(response):
+        payload = getattr(response, 'data', None)
+        if payload is None and response.get('Content-Type', '').startswith('application/json'):
+            # Coalesced responses only carry the rendered content.
+            payload = json.loads(response.content)
+        if isinstance(payload, dict) and isinstance(payload.get('results'), list):
+            return len(payload['results'])
+        if isinstance(payload, list):
+            return len(payload)
+        return 1
+
+    def _measure(self, call):
+        for _ in range(self.warmup):
+            call()
+
+        latencies = []
+        queries = []
+        rows = 0
+        for _ in range(self.iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                rows += call()
+                latencies.append(time.perf_counter() - start)
+            queries.append(len(captured.captured_queries))
+
+        elapsed = sum(latencies)
+        return {
+            'iterations': self.iterations,
+            'latency_ms': {
+                'min': min(latencies) * 1000,
+                'mean': statistics.fmean(latencies) * 1000,
+                'p50': percentile(latencies, 50) * 1000,
+                'p90': percentile(latencies, 90) * 1000,
+                'p95': percentile(latencies, 95) * 1000,
+                'p99': percentile(latencies, 99) * 1000,
+                'max': max(latencies) * 1000,
+            },
+            'queries_per_request': statistics.fmean(queries),
+            'rows_per_sec': rows / elapsed if elapsed else None,
+        }
+
+    def run(self, scenario):
+        if isinstance(scenario, QueryScenario):
+            def call():
+                return len(list(scenario.queryset(self.context)))
+
+            return {
+                'name': scenario.name,
+                'method': 'ORM',
+                'path': None,
+                **self._measure(call),
+            }
+
+        path, data = scenario.render(self.context)
+        return {
+            'name': scenario.name,
+            'method': scenario.method,
+            'path': path,
+            **self._measure(
+                lambda: self._rows(self._request(scenario, path, data))),
+        }
+
+    def run_all(self, scenarios):
+        return {
+            'meta': {
+                'code_version': code_version(),
+                'started_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'iterations': self.iterations,
+                'warmup': self.warmup,
+                'context': self.context,
+            },
+            'scenarios': [self.run(scenario) for scenario in scenarios],
+        }
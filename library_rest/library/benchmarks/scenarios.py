@@ -0,0 +1,139 @@
+# file: library_rest/library/benchmarks/scenarios.py
+
+from django.db.models import Q
+
+from library.benchmarks.runner import QueryScenario, Scenario
+from library.models import Author, Book
+
+
+def _deep_offset(context):
+    return (context['books_deep_page'] - 1) * context['page_size']
+
+
+def _keyset_page(context):
+    sort_key, pk = context['author_cursor']
+    return Book.objects.filter(
+        Q(author_sort_key__gt=sort_key) | Q(author_sort_key=sort_key, id__gt=pk)
+    ).order_by('author_sort_key', 'id')[:context['page_size']]
+
+
+API_SCENARIOS = [
+    Scenario('books_list_first_page', 'GET', '/library/books'),
+    Scenario('books_list_page_100', 'GET', '/library/books?page={books_page_100}'),
+    Scenario('books_list_deep_page', 'GET', '/library/books?page={books_deep_page}'),
+    Scenario('books_list_last_page', 'GET', '/library/books?page={books_last_page}'),
+    Scenario('books_list_bulk_page', 'GET', '/library/books?page_size=100'),
+    Scenario('books_search_title', 'GET', '/library/books?search={book_title_word}'),
+    Scenario('books_search_author', 'GET', '/library/books?search={author_last_name}'),
+    Scenario('books_filter_author', 'GET', '/library/books?author={author_id}'),
+    Scenario('books_filter_publication_date', 'GET',
+             '/library/books?publication_date={publication_date}'),
+    Scenario('books_filter_publication_date_range', 'GET',
+             '/library/books?publication_date__gte={publication_year}-01-01'
+             '&publication_date__lte={publication_year}-12-31'),
+    Scenario('books_filter_year', 'GET', '/library/books?year={publication_year}'),
+    Scenario('books_filter_year_range', 'GET',
+             '/library/books?year__gte={publication_year}&year__lte={publication_year_end}'),
+    Scenario('books_order_publication_date', 'GET',
+             '/library/books?ordering=-publication_date'),
+    Scenario('books_order_author', 'GET', '/library/books?ordering=author'),
+    Scenario('books_order_author_deep_page', 'GET',
+             '/library/books?ordering=author&page={books_deep_page}'),
+    Scenario('books_detail', 'GET', '/library/books/{book_id}'),
+    Scenario('books_create', 'POST', '/library/books', data={
+        'title': 'Benchmark Book',
+        'author': '{author_id}',
+        'publication_date': '2000-01-01',
+    }, expected_status=201, rollback=True),
+    Scenario('authors_list_first_page', 'GET', '/library/authors'),
+    Scenario('authors_list_deep_page', 'GET', '/library/authors?page={authors_deep_page}'),
+    Scenario('authors_list_bulk_page', 'GET', '/library/authors?page_size=100'),
+    Scenario('authors_search', 'GET', '/library/authors?search={author_last_name}'),
+    Scenario('authors_filter_citizenship', 'GET',
+             '/library/authors?citizenship={author_citizenship}'),
+    Scenario('authors_filter_birth_range', 'GET',
+             '/library/authors?date_of_birth__gte={publication_year}-01-01'
+             '&date_of_birth__lte={publication_year_end}-12-31'),
+    Scenario('authors_order_first_name', 'GET', '/library/authors?ordering=-first_name'),
+    Scenario('authors_detail', 'GET', '/library/authors/{author_id}'),
+    Scenario('authors_create', 'POST', '/library/authors', data={
+        'first_name': 'Benchmark',
+        'last_name': 'Author',
+        'citizenship': 'Italian',
+    }, expected_status=201, rollback=True),
+    # The calls of the book edit screen, in one batch.
+    Scenario('batch_book_edit_screen', 'POST', '/library/batch', data={'requests': [
+        {'path': '/library/books/{book_id}'},
+        {'path': '/library/authors/{author_id}'},
+        {'path': '/library/authors?search={author_last_name}&page_size=10'},
+        {'path': '/library/books'},
+    ]}),
+]
+
+QUERY_SCENARIOS = [
+    # Ordering by author name at depth: join + filesort vs. the indexed sort key,
+    # with OFFSET paging and with keyset (cursor) paging.
+    QueryScenario('books_author_name_join_deep_offset', lambda context: Book.objects.order_by(
+        'author__last_name', 'author__first_name', 'id'
+    )[_deep_offset(context):_deep_offset(context) + context['page_size']]),
+    QueryScenario('books_author_sort_key_deep_offset', lambda context: Book.objects.order_by(
+        'author_sort_key', 'id'
+    )[_deep_offset(context):_deep_offset(context) + context['page_size']]),
+    QueryScenario('books_author_sort_key_deep_keyset', _keyset_page),
+    # Year filters: the indexed generated column vs. the equivalent `__year`
+    # lookups on publication_date.
+    QueryScenario('books_year_generated_column', lambda context: Book.objects.filter(
+        publication_year=context['publication_year']).values_list('pk', flat=True)),
+    QueryScenario('books_year_lookup', lambda context: Book.objects.filter(
+        publication_date__year=context['publication_year']).values_list('pk', flat=True)),
+    QueryScenario('books_year_range_generated_column', lambda context: Book.objects.filter(
+        publication_year__gte=context['publication_year'],
+        publication_year__lte=context['publication_year_end']
+    ).values_list('pk', flat=True)),
+    QueryScenario('books_year_range_lookup', lambda context: Book.objects.filter(
+        publication_date__year__gte=context['publication_year'],
+        publication_date__year__lte=context['publication_year_end']
+    ).values_list('pk', flat=True)),
+]
+
+
+def build_context(page_size=5, deep_page=10000):
+    """
+    Picks the concrete values the scenarios are run with from the current database.
+
+    Args:
+        page_size (int): Page size of the list endpoints, used to compute page depths.
+        deep_page (int): The page number used by the "deep page" scenarios, capped
+            to the last available page.
+
+    Returns:
+        dict: The placeholder values used by `API_SCENARIOS`.
+    """
+    book = Book.objects.select_related('author').order_by('pk').first()
+    if book is None or book.author is None:
+        raise ValueError(
+            'The catalog is empty: run the seed_catalog command first.')
+
+    books_pages = max(1, -(-Book.objects.count() // page_size))
+    authors_pages = max(1, -(-Author.objects.count() // page_size))
+
+    deep_offset = (min(deep_page, books_pages) - 1) * page_size
+    author_cursor = Book.objects.order_by('author_sort_key', 'id').values_list(
+        'author_sort_key', 'id')[deep_offset]
+
+    return {
+        'page_size': page_size,
+        'author_cursor': list(author_cursor),
+        'book_id': book.pk,
+        'book_title_word': book.title.split()[-1],
+        'publication_date': book.publication_date.isoformat(),
+        'publication_year': book.publication_date.year,
+        'publication_year_end': book.publication_date.year + 9,
+        'author_id': book.author.pk,
+        'author_last_name': book.author.last_name,
+        'author_citizenship': book.author.citizenship,
+        'books_page_100': min(100, books_pages),
+        'books_deep_page': min(deep_page, books_pages),
+        'books_last_page': books_pages,
+        'authors_deep_page': min(deep_page, authors_pages),
+    }
@@ -0,0 +1,115 @@
+# file: library_rest/library/benchmarks/startup.py
+
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+
+
+# Boots a worker the way the WSGI server does and prints its timings.
+BOOT_SCRIPT = '''
+import json, time
+import library_rest.wsgi as wsgi
+booted_at = time.perf_counter()
+report = {"boot_ms": (booted_at - wsgi.started_at) * 1000}
+if WARM_UP:
+    from library_rest.warmup import warm_up
+    report = warm_up(wsgi.started_at)
+print(json.dumps(report))
+'''
+
+
+def parse_importtime(output):
+    """
+    Parses the `-X importtime` report of a Python process.
+
+    Returns:
+        list: (module, self_us, cumulative_us) tuples, in import order.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line.split(':', 1)[1].split('|')
+        modules.append((module.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def boot_worker(warm_up=True):
+    """
+    Boots a worker in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        tuple: The timings printed by the worker (see library_rest.warmup.warm_up) and
+            its import report (see parse_importtime).
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f'WARM_UP = {bool(warm_up)}\n{BOOT_SCRIPT}'],
+        cwd=settings.BASE_DIR, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def measure_startup(runs=3, warm_up=True, top=25):
+    """
+    Measures the cold start of a worker over `runs` fresh interpreters.
+
+    The report contains the median boot, warm-up and cold start times, the
+    import time per top-level package and the `top` slowest modules (mean
+    self time over the runs).
+
+    Returns:
+        dict: The measurements, JSON serializable.
+    """
+    timings = []
+    module_self = defaultdict(list)
+    module_cumulative = defaultdict(list)
+    for _ in range(runs):
+        report, modules = boot_worker(warm_up)
+        timings.append(report)
+        for module, self_us, cumulative_us in modules:
+            module_self[module].append(self_us)
+            module_cumulative[module].append(cumulative_us)
+
+    modules = {module: statistics.fmean(values) / 1000 for module, values in module_self.items()}
+    packages = defaultdict(lambda: [0.0, 0])
+    for module, self_ms in modules.items():
+        package = packages[module.split('.')[0]]
+        package[0] += self_ms
+        package[1] += 1
+
+    def median(key):
+        values = [report[key] for report in timings if key in report]
+        return statistics.median(values) if values else None
+
+    return {
+        'runs': runs,
+        'boot_ms': median('boot_ms'),
+        'warm_up_ms': median('warm_up_ms'),
+        'cold_start_ms': median('cold_start_ms'),
+        'warm_up_steps_ms': {
+            name: statistics.median(report['steps'][name] for report in timings)
+            for name in timings[0].get('steps', {})
+        },
+        'imports': {
+            'modules': len(modules),
+            'total_ms': sum(modules.values()),
+            'packages': [
+                {'package': name, 'self_ms': self_ms, 'modules': count}
+                for name, (self_ms, count) in sorted(
+                    packages.items(), key=lambda item: item[1][0], reverse=True)[:top]
+            ],
+            'slowest_modules': [
+                {
+                    'module': module,
+                    'self_ms': self_ms,
+                    'cumulative_ms': statistics.fmean(module_cumulative[module]) / 1000,
+                }
+                for module, self_ms in sorted(
+                    modules.items(), key=lambda item: item[1], reverse=True)[:top]
+            ],
+        },
+    }
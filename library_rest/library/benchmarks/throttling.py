@@ -0,0 +1,149 @@
+# file: library_rest/library/benchmarks/throttling.py
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from library.benchmarks.runner import stand_in_user, time_calls
+from library.views.book_view_set import BookViewSet
+from library_rest.throttling import CacheBucketStore, PrincipalRateThrottle, SharedMemoryBucketStore
+
+
+# (capacity, tokens per second) never running out during the measurements.
+UNLIMITED = (10 ** 9, 10 ** 9)
+
+
+def _consume_in_process(path, slots, key, attempts, results):
+    store = SharedMemoryBucketStore(path, slots)
+    results.put(sum(store.consume(key, attempts, 1e-9)[0] for _ in range(attempts)))
+
+
+class ThrottleBenchmark:
+    """
+    Measures the cost of the throttling decisions (see library_rest.throttling).
+
+    Reports, in microseconds per decision:
+    - `consume` of each bucket store, for one hot principal and for
+      `principals` distinct ones;
+    - the shared memory store hammered by `threads` threads at once;
+    - the complete `PrincipalRateThrottle.allow_request` of a list and of a
+      write request (scope, principal and bucket).
+
+    It also checks that the shared memory store is shared: `processes`
+    processes draining one bucket of capacity `capacity` together must be
+    allowed exactly `capacity` requests in total.
+
+    Methods:
+        run(): Runs the measurements and returns the report as a dict.
+    """
+
+    def __init__(self, iterations=100000, principals=10000, threads=8, processes=4,
+                 capacity=1000):
+        self.iterations = iterations
+        self.principals = principals
+        self.threads = threads
+        self.processes = processes
+        self.capacity = capacity
+
+    def _stores(self, path):
+        return {
+            'shared_memory': SharedMemoryBucketStore(path, 65536),
+            'cache': CacheBucketStore('default'),
+        }
+
+    def _measure_store(self, store):
+        keys = [f'benchmark:{i}' for i in range(self.principals)]
+        counter = iter(range(10 ** 12))
+        return {
+            'one_principal': time_calls(
+                lambda: store.consume('benchmark:hot', *UNLIMITED), self.iterations),
+            f'{self.principals}_principals': time_calls(
+                lambda: store.consume(keys[next(counter) % len(keys)], *UNLIMITED),
+                self.iterations),
+        }
+
+    def _measure_contention(self, store):
+        per_thread = self.iterations // self.threads
+        barrier = threading.Barrier(self.threads + 1)
+
+        def hammer(index):
+            key = f'benchmark:thread:{index % 2}'
+            barrier.wait()
+            for _ in range(per_thread):
+                store.consume(key, *UNLIMITED)
+
+        threads = [threading.Thread(target=hammer, args=(i,)) for i in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter_ns()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter_ns() - start
+        return {
+            'threads': self.threads,
+            'wall_us_per_decision': elapsed / (per_thread * self.threads) / 1000,
+        }
+
+    def _measure_sharing(self, path):
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        processes = [
+            context.Process(target=_consume_in_process, args=(
+                path, 65536, 'benchmark:shared', self.capacity, results))
+            for _ in range(self.processes)
+        ]
+        for process in processes:
+            process.start()
+        allowed = sum(results.get() for _ in processes)
+        for process in processes:
+            process.join()
+        return {
+            'processes': self.processes,
+            'capacity': self.capacity,
+            'attempts': self.capacity * self.processes,
+            'allowed': allowed,
+            'exact': allowed == self.capacity,
+        }
+
+    def _measure_throttle(self, store):
+        factory = APIRequestFactory()
+        user = stand_in_user()
+        throttle = PrincipalRateThrottle()
+        throttle.store = store
+        throttle.rates = {scope: UNLIMITED for scope in ('list', 'search', 'export', 'write')}
+
+        requests = {
+            'list': (factory.get('/library/books'), 'list'),
+            'write': (factory.post('/library/books', {}, format='json'), 'create'),
+        }
+        report = {}
+        for name, (django_request, action) in requests.items():
+            request = Request(django_request)
+            request.user = user
+            view = BookViewSet(action=action, request=request)
+            report[name] = time_calls(
+                lambda: throttle.allow_request(request, view), self.iterations)
+        return report
+
+    def run(self):
+        enabled = PrincipalRateThrottle.enabled
+        PrincipalRateThrottle.enabled = True
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'throttle.bin')
+            stores = self._stores(path)
+            try:
+                return {
+                    'iterations': self.iterations,
+                    'stores': {name: self._measure_store(store) for name, store in stores.items()},
+                    'contention': self._measure_contention(stores['shared_memory']),
+                    'sharing': self._measure_sharing(os.path.join(directory, 'shared.bin')),
+                    'allow_request': self._measure_throttle(stores['shared_memory']),
+                }
+            finally:
+                PrincipalRateThrottle.enabled = enabled
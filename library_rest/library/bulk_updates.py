@@ -0,0 +1,148 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from library.filters import BookFilter
+from library.models import Author, Book, FacetCount
+
+
+BULK_UPDATE_CONFIG = {
+    'MAX_ROWS': 10000,
+    'MAX_CHANGES': 1000,
+    'BATCH_SIZE': 500,
+    **getattr(settings, 'LIBRARY_BULK_UPDATE', {}),
+}
+
+FACET_FIELDS = {'author', 'publication_date'}
+
+
+def _authors(author_ids):
+    """
+    Loads the authors with the given primary keys in one query.
+
+    Raises:
+        ValidationError: If some of the authors do not exist.
+    """
+    authors = Author.objects.only('first_name', 'last_name').in_bulk(author_ids)
+    missing = sorted(set(author_ids) - set(authors))
+    if missing:
+        raise ValidationError({'author': 'Unknown author(s): {}.'.format(
+            ', '.join(map(str, missing)))})
+    return authors
+
+
+def _tracked_update(books, tracks_facets, update):
+    """
+    Runs `update` on `books`, adjusting the facet rollups with the difference between the
+    facet counts of `books` before and after it. The cached facets are invalidated once.
+    """
+    if not tracks_facets:
+        update()
+        return
+    deltas = FacetCount.objects.book_deltas(books, -1)
+    update()
+    deltas.update(FacetCount.objects.book_deltas(books))
+    FacetCount.objects.apply_deltas(deltas)
+
+
+def update_matching_books(filters, values):
+    """
+    Assigns `values` to every book matching `filters` with a single UPDATE.
+
+    `filters` are the filters of the book list (see BookFilter). The matching books are
+    locked and counted first: more than `MAX_ROWS` of them is rejected.
+
+    Returns:
+        dict: The number of books matched and updated.
+
+    Raises:
+        ValidationError: If the filters are invalid, match too many books or the author
+            does not exist.
+    """
+    filterset = BookFilter(data=filters, queryset=Book.objects.all())
+    if not filterset.is_valid():
+        raise ValidationError({'filter': filterset.errors})
+
+    values = dict(values)
+    if 'author' in values:
+        author = _authors([values['author']])[values['author']]
+        values['author'] = author
+        values['author_sort_key'] = author.sort_key
+    values['updated_at'] = timezone.now()
+
+    max_rows = BULK_UPDATE_CONFIG['MAX_ROWS']
+    with transaction.atomic():
+        ids = list(filterset.qs.order_by('pk').select_for_update().values_list(
+            'pk', flat=True)[:max_rows + 1])
+        if len(ids) > max_rows:
+            raise ValidationError({'filter': 'More than {} books match the filter.'.format(
+                max_rows)})
+
+        books = Book.objects.filter(pk__in=ids)
+        _tracked_update(books, FACET_FIELDS & set(values),
+                        lambda: books.update(**values))
+
+    return {'matched': len(ids), 'updated': len(ids), 'not_found': []}
+
+
+def update_books(changes):
+    """
+    Applies per-book `changes` (dicts holding the `id` of a book and its new values) with
+    batched `bulk_update` calls of `BATCH_SIZE` rows.
+
+    Books and authors are loaded with one query each; unchanged books are not written.
+
+    Returns:
+        dict: The number of books matched and updated, and the ids matching no book.
+
+    Raises:
+        ValidationError: If there are more than `MAX_CHANGES` changes, an id is repeated or
+            an author does not exist.
+    """
+    if len(changes) > BULK_UPDATE_CONFIG['MAX_CHANGES']:
+        raise ValidationError({'changes': 'At most {} changes are allowed.'.format(
+            BULK_UPDATE_CONFIG['MAX_CHANGES'])})
+    ids = [change['id'] for change in changes]
+    if len(set(ids)) != len(ids):
+        raise ValidationError({'changes': 'Each book may only appear once.'})
+
+    authors = _authors({change['author'] for change in changes if 'author' in change})
+    now = timezone.now()
+
+    with transaction.atomic():
+        books = Book.objects.select_for_update().in_bulk(ids)
+        changed, fields = [], set()
+        for change in changes:
+            book = books.get(change['id'])
+            if book is None:
+                continue
+            values = {key: value for key, value in change.items() if key != 'id'}
+            if 'author' in values:
+                values['author_id'] = values.pop('author')
+            values = {
+                key: value for key, value in values.items() if getattr(book, key) != value
+            }
+            if not values:
+                continue
+            if 'author_id' in values:
+                values['author_sort_key'] = authors[values['author_id']].sort_key
+            for key, value in values.items():
+                setattr(book, key, value)
+            book.updated_at = now
+            changed.append(book)
+            fields.update(values)
+
+        if changed:
+            _tracked_update(
+                Book.objects.filter(pk__in=[book.pk for book in changed]),
+                {'author_id', 'publication_date'} & fields,
+                lambda: Book.objects.bulk_update(
+                    changed, sorted(fields | {'updated_at'}),
+                    batch_size=BULK_UPDATE_CONFIG['BATCH_SIZE']))
+
+    return {
+        'matched': len(books),
+        'updated': len(changed),
+        'not_found': [pk for pk in ids if pk not in books],
+    }
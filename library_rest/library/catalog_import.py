@@ -0,0 +1,683 @@
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from library.jobs import setup_worker
+from library.models import Author, Book, FacetCount
+
+
+IMPORT_CONFIG = {
+    'BATCH_SIZE': 5000,
+    'CHUNK_SIZE': 32 * 1024 * 1024,
+    'WORKERS': 4,
+    'START_METHOD': 'spawn',
+    # Use LOAD DATA LOCAL INFILE on MySQL when the client and the server allow it.
+    'LOAD_DATA': True,
+    **getattr(settings, 'LIBRARY_IMPORT', {}),
+}
+
+FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+AUTHOR_COLUMNS = ('first_name', 'last_name', 'citizenship', 'date_of_birth',
+                  'date_of_death', 'updated_at')
+BOOK_COLUMNS = ('title', 'author_id', 'author_sort_key', 'publication_date',
+                'created_at', 'updated_at')
+
+
+class RowError(Exception):
+    """
+    Raised when an input row is rejected; the message is the reason.
+    """
+
+
+def input_format(path):
+    try:
+        return FORMATS[os.path.splitext(path)[1].lower()]
+    except KeyError:
+        raise ValueError(f'{path}: unknown format, expected one of {", ".join(FORMATS)}.')
+
+
+def plan_chunks(path, chunk_size):
+    """
+    Splits the input file `path` into byte ranges of about `chunk_size`
+    bytes, each ending at the end of a line (CSV fields must not span lines).
+
+    Returns:
+        tuple: The CSV header (None for NDJSON) and the list of (start, end) ranges.
+    """
+    size = os.path.getsize(path)
+    header = None
+    with open(path, 'rb') as file:
+        if input_format(path) == 'csv':
+            header = next(csv.reader([file.readline().decode('utf-8-sig')]), None)
+            if not header:
+                raise ValueError(f'{path}: missing CSV header.')
+            header = [name.strip() for name in header]
+        start = file.tell()
+        chunks = []
+        while start < size:
+            file.seek(min(start + chunk_size, size))
+            file.readline()
+            end = min(file.tell(), size)
+            chunks.append((start, end))
+            start = end
+    return header, chunks
+
+
+class _Lines:
+    """
+    Iterates over the decoded lines of `file` up to the byte offset `end`,
+    tracking the offset after the last line read.
+    """
+
+    def __init__(self, file, end):
+        self.file = file
+        self.end = end
+        self.position = file.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.position >= self.end:
+            raise StopIteration
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.position += len(line)
+        return line.decode('utf-8', errors='replace')
+
+
+def read_records(path, header, start, end):
+    """
+    Reads the records of the byte range `start`-`end` of an input file.
+
+    Yields:
+        tuple: The offset after the record, the record as a dict (None if it cannot be
+            parsed) and the raw record, for the reject file.
+    """
+    with open(path, 'rb') as file:
+        file.seek(start)
+        lines = _Lines(file, end)
+        if header is not None:
+            for values in csv.reader(lines):
+                if not values:
+                    continue
+                record = dict(zip(header, values)) if len(values) == len(header) else None
+                yield lines.position, record, values
+        else:
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield lines.position, record if isinstance(record, dict) else None, line.rstrip('\r\n')
+
+
+def _text(record, name, max_length, required=True):
+    value = record.get(name)
+    value = '' if value is None else str(value).strip()
+    if not value and required:
+        raise RowError(f'missing {name}')
+    if len(value) > max_length:
+        raise RowError(f'{name} longer than {max_length} characters')
+    return value
+
+
+def _date(record, name, required=True):
+    value = record.get(name)
+    if value in (None, ''):
+        if required:
+            raise RowError(f'missing {name}')
+        return None
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        raise RowError(f'invalid {name}: {value!r}')
+
+
+def author_key(last_name, first_name, date_of_birth):
+    """
+    Returns the natural key of an author: its name and date of birth.
+    """
+    return last_name, first_name, date_of_birth
+
+
+class AuthorMap:
+    """
+    In-memory map of the authors, to resolve the authors of the imported rows
+    without querying the database.
+
+    Attributes:
+        by_key (dict): Primary keys by natural key (see author_key).
+        sort_keys (dict): `Author.sort_key` by primary key.
+
+    Methods:
+        load(using): Builds the map of every author with one streamed query.
+        resolve(record): Returns the (author_id, sort_key) of a book record.
+    """
+
+    def __init__(self):
+        self.by_key = {}
+        self.sort_keys = {}
+
+    @classmethod
+    def load(cls, using=DEFAULT_DB_ALIAS):
+        authors = cls()
+        rows = Author.objects.using(using).order_by().values_list(
+            'pk', 'last_name', 'first_name', 'date_of_birth')
+        for pk, last_name, first_name, date_of_birth in rows.iterator(chunk_size=20000):
+            authors.by_key[author_key(last_name, first_name, date_of_birth)] = pk
+            authors.sort_keys[pk] = f'{last_name}, {first_name}'
+        return authors
+
+    def resolve(self, record):
+        author_id = record.get('author_id')
+        if author_id not in (None, ''):
+            try:
+                author_id = int(author_id)
+            except (TypeError, ValueError):
+                raise RowError(f'invalid author_id: {author_id!r}')
+        elif record.get('author_last_name') or record.get('author_first_name'):
+            key = author_key(
+                _text(record, 'author_last_name', 100),
+                _text(record, 'author_first_name', 100),
+                _date(record, 'author_date_of_birth', required=False))
+            author_id = self.by_key.get(key)
+            if author_id is None:
+                raise RowError('unknown author: {}, {} ({})'.format(*key))
+        else:
+            return None, ''
+
+        if author_id not in self.sort_keys:
+            raise RowError(f'unknown author: {author_id}')
+        return author_id, self.sort_keys[author_id]
+
+
+def local_infile_available(connection):
+    """
+    Returns whether `LOAD DATA LOCAL INFILE` can be used on `connection`: a
+    MySQL connection opened with the `local_infile` option to a server
+    allowing it.
+    """
+    if connection.vendor != 'mysql':
+        return False
+    if not connection.settings_dict.get('OPTIONS', {}).get('local_infile'):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT @@GLOBAL.local_infile')
+        return bool(cursor.fetchone()[0])
+
+
+def _escape_load_data(value):
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+
+class BatchWriter:
+    """
+    Writes rows into the table of `model`, each batch in one statement and
+    one transaction: a multi-row INSERT, or `LOAD DATA LOCAL INFILE` from a
+    temporary file when `load_data` is set and available (see
+    local_infile_available). Values are adapted by the database backend, no
+    model instances are built.
+
+    Methods:
+        write(rows): Inserts `rows`, tuples of values of `columns`.
+    """
+
+    def __init__(self, model, columns, load_data=False, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.connection = connections[using]
+        quote = self.connection.ops.quote_name
+        self.table = quote(model._meta.db_table)
+        self.fields = [model._meta.get_field(column) for column in columns]
+        self.column_list = ', '.join(quote(field.column) for field in self.fields)
+        self.load_data = load_data and local_infile_available(self.connection)
+
+    def _adapt(self, rows):
+        adapters = []
+        for field in self.fields:
+            internal_type = field.get_internal_type()
+            if internal_type == 'DateTimeField':
+                adapters.append(self.connection.ops.adapt_datetimefield_value)
+            elif internal_type == 'DateField':
+                adapters.append(self.connection.ops.adapt_datefield_value)
+            else:
+                adapters.append(None)
+        return [
+            [value if adapt is None else adapt(value) for adapt, value in zip(adapters, row)]
+            for row in rows
+        ]
+
+    def _insert(self, cursor, rows):
+        batch_size = max(1, self.connection.ops.bulk_batch_size(self.fields, rows))
+        placeholders = '({})'.format(', '.join(['%s'] * len(self.fields)))
+        for offset in range(0, len(rows), batch_size):
+            batch = rows[offset:offset + batch_size]
+            cursor.execute(
+                f'INSERT INTO {self.table} ({self.column_list}) VALUES '
+                + ', '.join([placeholders] * len(batch)),
+                [value for row in batch for value in row])
+
+    def _load(self, cursor, rows):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.tsv') as file:
+            for row in rows:
+                file.write('\t'.join(_escape_load_data(value) for value in row))
+                file.write('\n')
+            file.flush()
+            cursor.execute(
+                f'LOAD DATA LOCAL INFILE %s INTO TABLE {self.table} '
+                f'CHARACTER SET utf8mb4 ({self.column_list})', [file.name])
+
+    def write(self, rows):
+        if not rows:
+            return
+        rows = self._adapt(rows)
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            if self.load_data:
+                self._load(cursor, rows)
+            else:
+                self._insert(cursor, rows)
+
+
+class Checkpoint:
+    """
+    Progress of one chunk, saved after each committed batch so that an
+    interrupted import resumes after the last committed batch.
+
+    Attributes:
+        offset (int): The byte offset after the last committed record.
+        rows (int), inserted (int), duplicates (int), rejected (int): The counters so far.
+        rejects_size (int): The size of the reject file of the chunk at the last commit.
+        done (bool): Whether the chunk is complete.
+        resumed (bool): Whether the chunk was started before, its first batch possibly
+            committed without a checkpoint.
+    """
+
+    FIELDS = ('offset', 'rows', 'inserted', 'duplicates', 'rejected', 'rejects_size', 'done')
+
+    def __init__(self, path, start):
+        self.path = path
+        self.offset = start
+        self.rows = self.inserted = self.duplicates = self.rejected = self.rejects_size = 0
+        self.done = False
+        self.resumed = os.path.exists(path)
+        if self.resumed:
+            with open(path) as file:
+                for name, value in json.load(file).items():
+                    setattr(self, name, value)
+
+    def save(self):
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(self.stats(), file)
+        os.replace(temporary, self.path)
+
+    def stats(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+_authors = None
+
+
+def _author_map():
+    global _authors
+    if _authors is None:
+        _authors = AuthorMap.load()
+    return _authors
+
+
+def existing_books(keys, using=DEFAULT_DB_ALIAS):
+    """
+    Returns those of the book natural keys `keys` (title, author_id,
+    publication_date) already stored, looked up by row value on the
+    (title, author) index.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    fields = [Book._meta.get_field(name) for name in ('title', 'author', 'publication_date')]
+    columns = ', '.join(quote(field.column) for field in fields)
+    table = quote(Book._meta.db_table)
+
+    found = set()
+    with_author = [key for key in keys if key[1] is not None]
+    batch_size = max(1, connection.ops.bulk_batch_size(fields, with_author))
+    with connection.cursor() as cursor:
+        for offset in range(0, len(with_author), batch_size):
+            batch = with_author[offset:offset + batch_size]
+            values = ', '.join(['(%s, %s, %s)'] * len(batch))
+            if connection.vendor == 'sqlite':
+                # SQLite only accepts a subquery on the right of a row value IN.
+                values = f'VALUES {values}'
+            cursor.execute(
+                f'SELECT {columns} FROM {table} WHERE ({columns}) IN ({values})',
+                [value for title, author_id, publication_date in batch for value in (
+                    title, author_id, connection.ops.adapt_datefield_value(publication_date))])
+            found.update(
+                (title, author_id, str(publication_date))
+                for title, author_id, publication_date in cursor.fetchall())
+
+    without_author = {key[0] for key in keys if key[1] is None}
+    if without_author:
+        found.update(
+            (title, None, str(publication_date))
+            for title, publication_date in Book.objects.using(using).order_by().filter(
+                author__isnull=True, title__in=without_author).values_list(
+                    'title', 'publication_date'))
+    return {key for key in keys if (key[0], key[1], str(key[2])) in found}
+
+
+def _parse_author(record, authors, seen):
+    row = (
+        _text(record, 'first_name', 100),
+        _text(record, 'last_name', 100),
+        _text(record, 'citizenship', 100),
+        _date(record, 'date_of_birth', required=False),
+        _date(record, 'date_of_death', required=False),
+    )
+    key = author_key(row[1], row[0], row[3])
+    if key in authors.by_key or key in seen:
+        return None, key
+    return row, key
+
+
+def _parse_book(record, authors):
+    title = _text(record, 'title', 100)
+    publication_date = _date(record, 'publication_date')
+    author_id, sort_key = authors.resolve(record)
+    return (title, author_id, sort_key, publication_date), (title, author_id, publication_date)
+
+
+def import_chunk(task):
+    """
+    Imports one chunk of an input file (see CatalogImport), resuming after
+    its last committed batch. Runs in the worker processes for books, in the
+    importing process for authors.
+
+    Returns:
+        dict: The counters of the chunk (see Checkpoint) and `processed`, the rows read
+            by this call.
+    """
+    checkpoint = Checkpoint(task['checkpoint'], task['start'])
+    if checkpoint.done:
+        return {**checkpoint.stats(), 'processed': 0}
+
+    books = task['kind'] == 'books'
+    authors = task.get('authors') or _author_map()
+    writer = BatchWriter(Book if books else Author,
+                         BOOK_COLUMNS if books else AUTHOR_COLUMNS, task['load_data'])
+    # After a resume the first batch may have been committed without its checkpoint.
+    check_existing = task['dedupe'] or checkpoint.resumed
+    if not checkpoint.resumed:
+        checkpoint.save()
+    seen = set()
+    processed = 0
+
+    with open(task['rejects'], 'a+', encoding='utf-8') as rejects:
+        rejects.truncate(checkpoint.rejects_size)
+        rejects.seek(checkpoint.rejects_size)
+
+        batch, keys = [], []
+
+        def flush(offset):
+            nonlocal batch, keys, check_existing
+            if books and check_existing and batch:
+                existing = existing_books(keys)
+                kept = [(row, key) for row, key in zip(batch, keys) if key not in existing]
+                checkpoint.duplicates += len(batch) - len(kept)
+                batch = [row for row, _ in kept]
+                check_existing = task['dedupe']
+            # created_at and updated_at of the books, updated_at of the authors.
+            timestamps = (timezone.now(),) * (2 if books else 1)
+            writer.write([row + timestamps for row in batch])
+            if not books:
+                for key in keys:
+                    authors.by_key[key] = None
+            checkpoint.inserted += len(batch)
+            rejects.flush()
+            checkpoint.rejects_size = rejects.tell()
+            checkpoint.offset = offset
+            checkpoint.save()
+            batch, keys = [], []
+
+        offset = checkpoint.offset
+        for offset, record, raw in read_records(
+                task['path'], task['header'], checkpoint.offset, task['end']):
+            processed += 1
+            checkpoint.rows += 1
+            try:
+                if record is None:
+                    raise RowError('malformed record')
+                if books:
+                    row, key = _parse_book(record, authors)
+                else:
+                    row, key = _parse_author(record, authors, seen)
+            except RowError as e:
+                checkpoint.rejected += 1
+                rejects.write(json.dumps({
+                    'file': task['path'], 'reason': str(e), 'record': raw}) + '\n')
+                continue
+
+            if row is None or key in seen:
+                checkpoint.duplicates += 1
+                continue
+            seen.add(key)
+            batch.append(row)
+            keys.append(key)
+            if len(batch) >= task['batch_size']:
+                flush(offset)
+
+        flush(offset)
+    checkpoint.done = True
+    checkpoint.save()
+    return {**checkpoint.stats(), 'processed': processed}
+
+
+class CatalogImport:
+    """
+    Loads authors and books from CSV or NDJSON files.
+
+    Inputs are streamed in chunks of about `chunk_size` bytes. Authors are
+    imported first, in this process (there are far fewer of them, and their
+    duplicates are detected by natural key: name and date of birth). Books
+    are then imported by `workers` processes (in this process when `workers`
+    is 1), one chunk at a time each: every
+    worker loads the authors once into an AuthorMap and resolves the author
+    of each row (by `author_id`, or by `author_last_name`,
+    `author_first_name` and `author_date_of_birth`) without a query. Rows are
+    written in batches of `batch_size` with multi-row INSERTs, or `LOAD DATA
+    LOCAL INFILE` on MySQL (see BatchWriter).
+
+    Duplicates are dropped within each chunk and, with `dedupe`, against the
+    books already stored (title, author and publication date, one indexed
+    query per batch). Rejected rows are written with their reason to a
+    reject file. With `defer_indexes`, the secondary indexes of the books not
+    needed by the import are dropped before loading and built again, in one
+    pass each, at the end. The facet rollups are rebuilt once.
+
+    Progress is kept in `state_dir`: the plan of the chunks and a checkpoint
+    per chunk saved after each committed batch. Running the same import
+    again resumes it where it stopped.
+
+    Methods:
+        run(progress=None): Runs (or resumes) the import and returns its report.
+    """
+
+    def __init__(self, authors=(), books=(), state_dir=None, rejects=None, workers=None,
+                 batch_size=None, chunk_size=None, dedupe=True, defer_indexes=False,
+                 load_data=None):
+        self.inputs = {
+            'authors': [os.path.abspath(path) for path in authors],
+            'books': [os.path.abspath(path) for path in books],
+        }
+        for path in self.inputs['authors'] + self.inputs['books']:
+            input_format(path)
+        first = (self.inputs['authors'] + self.inputs['books'])[0]
+        self.state_dir = state_dir or f'{first}.import'
+        self.rejects = rejects or os.path.join(self.state_dir, 'rejects.ndjson')
+        self.workers = workers or IMPORT_CONFIG['WORKERS']
+        self.batch_size = batch_size or IMPORT_CONFIG['BATCH_SIZE']
+        self.chunk_size = chunk_size or IMPORT_CONFIG['CHUNK_SIZE']
+        self.dedupe = dedupe
+        self.defer_indexes = defer_indexes
+        self.load_data = IMPORT_CONFIG['LOAD_DATA'] if load_data is None else load_data
+
+    def _signature(self):
+        files = []
+        for kind, paths in self.inputs.items():
+            for path in paths:
+                stat = os.stat(path)
+                files.append([kind, path, stat.st_size, stat.st_mtime_ns])
+        return hashlib.sha256(json.dumps([files, self.chunk_size]).encode()).hexdigest()
+
+    def _plan(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = os.path.join(self.state_dir, 'plan.json')
+        signature = self._signature()
+        if os.path.exists(path):
+            with open(path) as file:
+                plan = json.load(file)
+            if plan['signature'] != signature:
+                raise ValueError(
+                    f'{self.state_dir} holds the state of another import, '
+                    'remove it to start again.')
+            return plan
+
+        tasks = []
+        for kind, paths in self.inputs.items():
+            for path in paths:
+                header, chunks = plan_chunks(path, self.chunk_size)
+                for start, end in chunks:
+                    index = len(tasks)
+                    tasks.append({
+                        'kind': kind, 'path': path, 'header': header,
+                        'start': start, 'end': end,
+                        'checkpoint': os.path.join(self.state_dir, f'chunk-{index}.json'),
+                        'rejects': os.path.join(self.state_dir, f'rejects-{index}.ndjson'),
+                    })
+        plan = {'signature': signature, 'tasks': tasks, 'deferred_indexes': []}
+        self._save_plan(plan)
+        return plan
+
+    def _save_plan(self, plan):
+        path = os.path.join(self.state_dir, 'plan.json')
+        with open(f'{path}.tmp', 'w') as file:
+            json.dump(plan, file)
+        os.replace(f'{path}.tmp', path)
+
+    def _drop_indexes(self, plan):
+        kept = {('title', 'author')} if self.dedupe else set()
+        indexes = [
+            index for index in Book._meta.indexes
+            if tuple(index.fields) not in kept and index.name not in plan['deferred_indexes']
+        ]
+        # Recorded first: an interrupted import builds them again when resumed.
+        plan['deferred_indexes'] += [index.name for index in indexes]
+        self._save_plan(plan)
+        with connections[DEFAULT_DB_ALIAS].schema_editor() as editor:
+            for index in indexes:
+                editor.remove_index(Book, index)
+
+    def _restore_indexes(self, plan):
+        with connections[DEFAULT_DB_ALIAS].schema_editor() as editor:
+            for index in Book._meta.indexes:
+                if index.name in plan['deferred_indexes']:
+                    editor.add_index(Book, index)
+        plan['deferred_indexes'] = []
+        self._save_plan(plan)
+
+    def _merge_rejects(self, plan):
+        with open(self.rejects, 'wb') as output:
+            for task in plan['tasks']:
+                if os.path.exists(task['rejects']):
+                    with open(task['rejects'], 'rb') as rejects:
+                        while block := rejects.read(1024 * 1024):
+                            output.write(block)
+
+    def _options(self, task):
+        return {**task, 'batch_size': self.batch_size, 'dedupe': self.dedupe,
+                'load_data': self.load_data}
+
+    def _import_books(self, tasks):
+        """
+        Yields the results of the book chunks `tasks` as they complete.
+        """
+        if self.workers == 1:
+            authors = AuthorMap.load()
+            for task in tasks:
+                yield import_chunk({**self._options(task), 'authors': authors})
+            return
+
+        # Workers open their own connections.
+        connections.close_all()
+        context = multiprocessing.get_context(IMPORT_CONFIG['START_METHOD'])
+        with ProcessPoolExecutor(min(self.workers, len(tasks)), mp_context=context,
+                                 initializer=setup_worker) as pool:
+            futures = [pool.submit(import_chunk, self._options(task)) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, progress=None):
+        """
+        Runs the import. `progress`, when given, is called with the kind of rows, the number
+        of chunks done and in total, and the report so far after each chunk.
+
+        Returns:
+            dict: The counters of authors and books, the rows read per second, the reject
+                file and the duration.
+        """
+        plan = self._plan()
+        start = time.perf_counter()
+        report = {
+            kind: {'rows': 0, 'inserted': 0, 'duplicates': 0, 'rejected': 0, 'processed': 0}
+            for kind in self.inputs
+        }
+
+        def record(kind, result, done, total):
+            for name in report[kind]:
+                report[kind][name] += result[name]
+            if progress is not None:
+                progress(kind, done, total, report)
+
+        tasks = [task for task in plan['tasks'] if task['kind'] == 'authors']
+        if tasks:
+            authors = AuthorMap.load()
+            for done, task in enumerate(tasks, 1):
+                record('authors', import_chunk({**self._options(task), 'authors': authors}),
+                       done, len(tasks))
+
+        tasks = [task for task in plan['tasks'] if task['kind'] == 'books']
+        if tasks:
+            if self.defer_indexes:
+                self._drop_indexes(plan)
+            for done, result in enumerate(self._import_books(tasks), 1):
+                record('books', result, done, len(tasks))
+
+        if plan['deferred_indexes']:
+            self._restore_indexes(plan)
+        if tasks:
+            FacetCount.objects.rebuild(Book.objects.all())
+        self._merge_rejects(plan)
+
+        elapsed = time.perf_counter() - start
+        processed = sum(counts['processed'] for counts in report.values())
+        return {
+            **report,
+            'duration_s': elapsed,
+            'rows_per_sec': processed / elapsed if elapsed else None,
+            'rejects': self.rejects,
+        }
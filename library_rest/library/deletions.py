@@ -0,0 +1,30 @@
+from django.conf import settings
+
+from library.models import Job
+
+
+DELETION_CONFIG = {
+    'BATCH_SIZE': 1000,
+    **getattr(settings, 'LIBRARY_DELETION', {}),
+}
+
+
+def delete_author(author, progress=None):
+    """
+    Deletes `author` and its books in batches of `BATCH_SIZE`.
+
+    Returns:
+        int: The number of books deleted.
+    """
+    return author.delete_in_batches(DELETION_CONFIG['BATCH_SIZE'], progress)
+
+
+def start_author_deletion(author, created_by=''):
+    """
+    Queues a 'delete_author' job deleting `author` and its books.
+
+    Returns:
+        Job: The queued job.
+    """
+    return Job.objects.enqueue(
+        'delete_author', {'author_id': author.pk}, created_by=created_by)
@@ -0,0 +1,139 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from library.models import Author, CacheVersion, FacetCount
+
+
+FACETS_CONFIG = {
+    'LIMIT': 10,
+    'MAX_LIMIT': 50,
+    'CACHE_TIMEOUT': 60,
+    **getattr(settings, 'LIBRARY_FACETS', {}),
+}
+
+# Query parameters that do not change which books are counted.
+IGNORED_PARAMS = {'page', 'page_size', 'ordering', 'format', 'limit'}
+
+
+def _author_labels(author_ids):
+    return {
+        str(pk): f'{last_name}, {first_name}'
+        for pk, last_name, first_name in Author.objects.filter(
+            pk__in=author_ids).values_list('pk', 'last_name', 'first_name')
+    }
+
+
+def _decades(rows, limit):
+    decades = {}
+    for year, count in rows:
+        decade = str(year // 10 * 10)
+        decades[decade] = decades.get(decade, 0) + count
+    return sorted(decades.items(), key=lambda item: -item[1])[:limit]
+
+
+def _response(decades, citizenships, authors):
+    labels = _author_labels([value for value, _ in authors])
+    return {
+        FacetCount.DECADE: [
+            {'value': value, 'label': f'{value}s', 'count': count}
+            for value, count in decades
+        ],
+        FacetCount.CITIZENSHIP: [
+            {'value': value, 'label': value, 'count': count}
+            for value, count in citizenships
+        ],
+        FacetCount.AUTHOR: [
+            {'value': value, 'label': labels.get(value, value), 'count': count}
+            for value, count in authors
+        ],
+    }
+
+
+def rollup_facets(limit):
+    """
+    Returns the unfiltered facets, read from the `FacetCount` rollups.
+    """
+    def top(facet):
+        return list(
+            FacetCount.objects.filter(facet=facet)
+            .order_by('-count')
+            .values_list('value', 'count')[:limit]
+        )
+
+    return _response(
+        top(FacetCount.DECADE), top(FacetCount.CITIZENSHIP), top(FacetCount.AUTHOR))
+
+
+def query_facets(queryset, limit):
+    """
+    Returns the facets of the books in `queryset`, computed with one bounded
+    GROUP BY query per facet.
+    """
+    queryset = queryset.order_by()
+    with_author = queryset.filter(author__isnull=False)
+
+    decades = _decades(
+        queryset.values_list('publication_year').annotate(count=Count('pk')), limit)
+    citizenships = list(
+        with_author.values_list('author__citizenship')
+        .annotate(count=Count('pk')).order_by('-count')[:limit]
+    )
+    authors = [
+        (str(author_id), count) for author_id, count in
+        with_author.values_list('author_id')
+        .annotate(count=Count('pk')).order_by('-count')[:limit]
+    ]
+    return _response(decades, citizenships, authors)
+
+
+def facets_cache_key(query_params, limit):
+    """
+    Returns the cache key of the filtered facets for `query_params`.
+
+    The key is built from the normalized (sorted, paging and ordering
+    stripped) parameters and the facets version, which every Book/Author
+    write bumps. The version is read from the database (see CacheVersion),
+    so a write invalidates the cached facets of every process, whether the
+    default cache is shared or per process.
+    """
+    params = sorted(
+        (name, value)
+        for name in query_params if name not in IGNORED_PARAMS
+        for value in query_params.getlist(name)
+    )
+    version = CacheVersion.objects.get_version(CacheVersion.FACETS)
+    digest = hashlib.sha1(repr((params, limit)).encode()).hexdigest()
+    return f'library:facets:{version}:{digest}'
+
+
+def is_filtered(query_params):
+    return any(name not in IGNORED_PARAMS for name in query_params)
+
+
+def get_facets(queryset, query_params, limit=None):
+    """
+    Returns the facets of the current filter/search.
+
+    Unfiltered requests are answered from the rollup tables; filtered ones
+    run `query_facets` and cache the result per filter key.
+
+    Args:
+        queryset (QuerySet): The filtered and searched book queryset.
+        query_params (QueryDict): The request query parameters.
+        limit (int): The maximum number of values returned per facet, clamped to
+            [1, `MAX_LIMIT`].
+    """
+    limit = max(1, min(limit or FACETS_CONFIG['LIMIT'], FACETS_CONFIG['MAX_LIMIT']))
+
+    if not is_filtered(query_params):
+        return rollup_facets(limit)
+
+    key = facets_cache_key(query_params, limit)
+    facets = cache.get(key)
+    if facets is None:
+        facets = query_facets(queryset, limit)
+        cache.set(key, facets, FACETS_CONFIG['CACHE_TIMEOUT'])
+    return facets
@@ -0,0 +1,130 @@
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+from library.models import Author, Book
+
+
+class BookFilter(filters.FilterSet):
+    """
+    FilterSet for the Book model.
+
+    Filters:
+        title, author, publication_date: Exact matches.
+        publication_date__gte, publication_date__lte: Publication date range.
+        year, year__gte, year__lte: Publication year and year range, served by the
+            indexed `publication_year` generated column.
+
+    The `author` choice is validated on the database of the filtered queryset
+    (the snapshot included, see library.snapshots).
+    """
+
+    year = filters.NumberFilter(field_name='publication_year')
+    year__gte = filters.NumberFilter(
+        field_name='publication_year', lookup_expr='gte')
+    year__lte = filters.NumberFilter(
+        field_name='publication_year', lookup_expr='lte')
+
+    class Meta:
+        model = Book
+        fields = {
+            'title': ['exact'],
+            'author': ['exact'],
+            'publication_date': ['exact', 'gte', 'lte'],
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.filters['author'].queryset = Author.objects.using(self.queryset.db)
+
+
+class AuthorFilter(filters.FilterSet):
+    """
+    FilterSet for the Author model.
+
+    Filters:
+        first_name, last_name, citizenship: Exact matches.
+        date_of_birth__gte, date_of_birth__lte: Birth date range.
+        date_of_death__gte, date_of_death__lte: Death date range.
+    """
+
+    class Meta:
+        model = Author
+        fields = {
+            'first_name': ['exact'],
+            'last_name': ['exact'],
+            'citizenship': ['exact'],
+            'date_of_birth': ['gte', 'lte'],
+            'date_of_death': ['gte', 'lte'],
+        }
+
+
+class LibraryOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that lets a view expose an ordering term backed by other columns.
+
+    Views declare `ordering_aliases`, a mapping from a public ordering term to
+    the model fields it sorts by. The direction requested by the client is
+    applied to every mapped field, so `?ordering=-author` on
+    `{'author': ('author_sort_key', 'id')}` orders by `-author_sort_key, -id`.
+
+    Attributes:
+        ordering_aliases (dict): Default aliases, overridden by the view attribute.
+    """
+
+    ordering_aliases = {}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        aliases = getattr(view, 'ordering_aliases', self.ordering_aliases)
+        if not ordering or not aliases:
+            return ordering
+
+        resolved = []
+        for term in ordering:
+            descending = term.startswith('-')
+            name = term.lstrip('-')
+            for field in aliases.get(name, (name,)):
+                resolved.append('-' + field if descending else field)
+        return resolved
+
+
+class SnapshotSearchFilter(SearchFilter):
+    """
+    SearchFilter using the full-text tables of the catalog snapshot.
+
+    On querysets read from the snapshot (see library.snapshots), the views
+    declaring a `snapshot_search_table` are searched through that trigram
+    FTS5 table instead of `LIKE '%term%'` scans: every term matches the rows
+    holding it in one of the indexed columns, case-insensitively, as
+    `icontains` over `search_fields` does. Trigrams need three characters,
+    so shorter terms fall back to `icontains`. Other querysets are searched
+    by SearchFilter.
+    """
+
+    min_fts_length = 3
+
+    def filter_queryset(self, request, queryset, view):
+        from library.snapshots import snapshot
+
+        table = getattr(view, 'snapshot_search_table', None)
+        if table is None or queryset.db != snapshot.alias:
+            return super().filter_queryset(request, queryset, view)
+
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        for term in search_terms:
+            if len(term) >= self.min_fts_length:
+                phrase = '"' + term.replace('"', '""') + '"'
+                queryset = queryset.filter(pk__in=RawSQL(
+                    f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [phrase]))
+            else:
+                condition = Q()
+                for field in search_fields:
+                    condition |= Q(**{f'{field.lstrip("^=@$")}__icontains': term})
+                queryset = queryset.filter(condition)
+        return queryset
@@ -0,0 +1,48 @@
+from library.deletions import delete_author
+from library.jobs import job_handler
+from library.models import Author, Book, FacetCount
+
+
+@job_handler('delete_author')
+def delete_author_job(job):
+    """
+    Deletes the author `params['author_id']` and its books in batches.
+    """
+    author = Author.objects.filter(pk=job.params['author_id']).first()
+    if author is None:
+        return {'deleted_books': 0}
+
+    total = author.books.count()
+    job.report_progress(0, total)
+    deleted = delete_author(
+        author, progress=lambda deleted: job.report_progress(deleted, total))
+    return {'deleted_books': deleted}
+
+
+@job_handler('rebuild_facets')
+def rebuild_facets_job(job):
+    """
+    Recomputes the facet rollup tables from the books table.
+    """
+    FacetCount.objects.rebuild(Book.objects.all())
+    count = FacetCount.objects.count()
+    job.report_progress(count, count)
+    return {'facet_counts': count}
+
+
+@job_handler('build_snapshot')
+def build_snapshot_job(job):
+    """
+    Builds a new catalog snapshot and swaps it in.
+    """
+    from library.snapshots import snapshot
+
+    total = Author.objects.count() + Book.objects.count()
+    copied = {}
+
+    def progress(table, rows):
+        copied[table] = rows
+        job.report_progress(sum(copied.values()), total)
+
+    job.report_progress(0, total)
+    return snapshot.build(progress=progress)
@@ -0,0 +1,106 @@
+import random
+import signal
+import traceback
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+JOBS_CONFIG = {
+    'WORKERS': 2,
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_DELAY': 10,
+    'MAX_RETRY_DELAY': 600,
+    'STALE_TIMEOUT': 300,
+    'START_METHOD': 'spawn',
+    **getattr(settings, 'LIBRARY_JOBS', {}),
+}
+
+_handlers = {}
+
+
+class JobCancelled(Exception):
+    """
+    Raised by `Job.report_progress` in a running job whose cancellation was requested.
+    """
+
+
+def job_handler(name):
+    """
+    Registers the decorated function as the handler of the jobs named `name`.
+
+    The handler is called with the `Job` instance, in a worker process of the
+    `run_jobs` command; it reads its arguments from `job.params`, should call
+    `job.report_progress()` regularly (which raises JobCancelled once the job
+    is cancelled) and returns a JSON serializable result.
+
+    Usage:
+        @job_handler('rebuild_facets')
+        def rebuild_facets(job):
+        ...
+    """
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name):
+    return _handlers[name]
+
+
+def registered_jobs():
+    return sorted(_handlers)
+
+
+def retry_delay(attempts):
+    """
+    Returns the seconds to wait before running a job again after `attempts`
+    failed attempts: exponential backoff with jitter, capped at `MAX_RETRY_DELAY`.
+    """
+    delay = min(JOBS_CONFIG['RETRY_DELAY'] * 2 ** (attempts - 1),
+                JOBS_CONFIG['MAX_RETRY_DELAY'])
+    return delay * random.uniform(0.5, 1.0)
+
+
+def setup_worker():
+    """
+    Initializes a worker process of the pool (with the 'spawn' and
+    'forkserver' start methods the process starts without Django set up).
+
+    SIGINT is ignored: Ctrl-C reaches every process of the group, and the
+    running jobs must finish while the `run_jobs` command drains the pool.
+    """
+    import django
+    from django.apps import apps
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if not apps.ready:
+        django.setup()
+    close_old_connections()
+
+
+def execute(job_id):
+    """
+    Runs the claimed job `job_id` in the current (worker) process and records
+    its outcome: done, cancelled, or failed (and scheduled again while it has
+    attempts left).
+    """
+    from library.models import Job
+
+    job = Job.objects.get(pk=job_id)
+    try:
+        if job.cancel_requested:
+            raise JobCancelled()
+        result = get_handler(job.name)(job)
+    except JobCancelled:
+        job.mark_cancelled()
+    except Exception:
+        job.mark_failed(traceback.format_exc())
+    else:
+        job.mark_done(result)
+    finally:
+        close_old_connections()
+    return job.status
@@ -0,0 +1,78 @@
+# file: library_rest/library/management/commands/benchmark_api.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from library.author_cache import author_cache
+from library.benchmarks import BenchmarkRunner
+from library.benchmarks.scenarios import API_SCENARIOS, QUERY_SCENARIOS, build_context
+from library.pagination import LibraryPagination
+from library_rest.throttling import PrincipalRateThrottle
+
+
+class Command(BaseCommand):
+    """
+    Runs the API benchmark scenarios and prints a JSON report.
+
+    The report contains latency percentiles, queries per request and rows per
+    second for each scenario, plus the code version, so that the output of
+    two commits can be compared. `--no-author-cache` disables the author
+    cache, to measure the author queries it saves.
+
+    Usage:
+        python manage.py benchmark_api --iterations 100 --output bench.json
+        python manage.py benchmark_api --scenario books_list_deep_page
+        python manage.py benchmark_api --no-author-cache
+    """
+
+    help = 'Runs the API benchmark scenarios and prints a JSON report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50,
+                            help='Measured requests per scenario.')
+        parser.add_argument('--warmup', type=int, default=5,
+                            help='Unmeasured requests per scenario.')
+        parser.add_argument('--deep-page', type=int, default=10000,
+                            help='Page number used by the deep page scenarios.')
+        parser.add_argument('--scenario', action='append', default=[],
+                            help='Run only the named scenario (repeatable).')
+        parser.add_argument('--no-author-cache', action='store_true',
+                            help='Disable the author cache (see AuthorCache).')
+        parser.add_argument('--output',
+                            help='Write the report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        scenarios = API_SCENARIOS + QUERY_SCENARIOS
+        if options['scenario']:
+            scenarios = [s for s in scenarios if s.name in options['scenario']]
+            unknown = set(options['scenario']) - {s.name for s in scenarios}
+            if unknown:
+                raise CommandError(
+                    'Unknown scenario(s): {}'.format(', '.join(sorted(unknown))))
+
+        # A single stand-in principal issues every request: do not throttle it.
+        PrincipalRateThrottle.enabled = False
+
+        try:
+            context = build_context(
+                page_size=LibraryPagination.page_size,
+                deep_page=options['deep_page']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['no_author_cache']:
+            author_cache.enabled = False
+
+        runner = BenchmarkRunner(
+            context, iterations=options['iterations'], warmup=options['warmup'])
+        report = json.dumps(runner.run_all(scenarios), indent=2)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+            self.stdout.write(self.style.SUCCESS(
+                f'Report written to {options["output"]}'))
+        else:
+            self.stdout.write(report)
@@ -0,0 +1,48 @@
+# file: library_rest/library/management/commands/benchmark_authorization.py
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from library.benchmarks.authorization import AuthorizationBenchmark
+
+
+class Command(BaseCommand):
+    """
+    Measures the cost of authorized and rejected requests and prints a JSON report.
+
+    The role permission check is measured alone, then complete dispatches of
+    a book retrieve and of a bulk update with and without the required
+    role. A rejected bulk update is answered before its body is parsed.
+
+    Usage:
+        python manage.py benchmark_authorization --iterations 50000
+        python manage.py benchmark_authorization --changes 5000 --output authorization.json
+    """
+
+    help = 'Measures the cost of authorized and rejected requests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000,
+                            help='Requests measured per case.')
+        parser.add_argument('--changes', type=int, default=1000,
+                            help='Books changed by the bulk update request.')
+        parser.add_argument('--write-iterations', type=int, default=20,
+                            help='Authorized bulk updates (and body parses) measured.')
+        parser.add_argument('--output',
+                            help='Write the report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        report = json.dumps(AuthorizationBenchmark(
+            iterations=options['iterations'],
+            changes=options['changes'],
+            write_iterations=options['write_iterations'],
+        ).run(), indent=2)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+            self.stdout.write(self.style.SUCCESS(
+                f'Report written to {options["output"]}'))
+        else:
+            self.stdout.write(report)
@@ -0,0 +1,80 @@
+# file: library_rest/library/management/commands/benchmark_burst.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from library.benchmarks.burst import BurstRunner
+from library.benchmarks.scenarios import API_SCENARIOS, build_context
+from library.pagination import LibraryPagination
+from library.singleflight import list_flight
+from library_rest.throttling import PrincipalRateThrottle
+
+
+DEFAULT_SCENARIOS = ['books_list_first_page', 'books_search_title', 'books_filter_year_range']
+
+
+class Command(BaseCommand):
+    """
+    Runs bursts of identical concurrent requests against GET scenarios of
+    `benchmark_api` and prints a JSON report.
+
+    The report contains the latency percentiles, the duration of a burst and
+    the queries run per burst, which drop when identical list requests are
+    coalesced. `--no-coalescing` disables the coalescing for comparison.
+
+    Usage:
+        python manage.py benchmark_burst --concurrency 32 --rounds 20
+        python manage.py benchmark_burst --scenario books_search_title --no-coalescing
+    """
+
+    help = 'Runs bursts of identical concurrent requests and prints a JSON report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=16,
+                            help='Concurrent requests per burst.')
+        parser.add_argument('--rounds', type=int, default=10,
+                            help='Measured bursts per scenario.')
+        parser.add_argument('--scenario', action='append', default=[],
+                            help='Run only the named GET scenario (repeatable).')
+        parser.add_argument('--no-coalescing', action='store_true',
+                            help='Disable the coalescing of identical list requests.')
+        parser.add_argument('--output',
+                            help='Write the report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        names = options['scenario'] or DEFAULT_SCENARIOS
+        scenarios = [s for s in API_SCENARIOS if s.name in names and s.method == 'GET']
+        unknown = set(names) - {s.name for s in scenarios}
+        if unknown:
+            raise CommandError(
+                'Unknown GET scenario(s): {}'.format(', '.join(sorted(unknown))))
+
+        # A single stand-in principal issues every request: do not throttle it.
+        PrincipalRateThrottle.enabled = False
+
+        try:
+            context = build_context(page_size=LibraryPagination.page_size)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['no_coalescing']:
+            list_flight.enabled = False
+
+        runner = BurstRunner(
+            concurrency=options['concurrency'], rounds=options['rounds'])
+        report = json.dumps({
+            'coalescing': list_flight.enabled,
+            'scenarios': [
+                runner.run(scenario.name, scenario.render(context)[0])
+                for scenario in scenarios
+            ],
+        }, indent=2)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+            self.stdout.write(self.style.SUCCESS(
+                f'Report written to {options["output"]}'))
+        else:
+            self.stdout.write(report)
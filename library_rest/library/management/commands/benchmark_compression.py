@@ -0,0 +1,60 @@
+# file: library_rest/library/management/commands/benchmark_compression.py
+
+import json
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from library.benchmarks.compression import measure_compression
+from library.benchmarks.runner import benchmark_host, stand_in_user
+from library_rest.schema import schema_cache
+
+
+PAYLOAD_PATHS = {
+    'books_list_page_100': '/library/books?page_size=100',
+    'authors_list_page_100': '/library/authors?page_size=100',
+    'books_facets': '/library/books/facets?limit=50',
+}
+
+
+class Command(BaseCommand):
+    """
+    Measures the CPU cost and the size reduction of every response encoding
+    and level on representative payloads (list pages and the OpenAPI schema),
+    and prints the results as JSON.
+
+    Usage:
+        python manage.py benchmark_compression --iterations 50
+    """
+
+    help = 'Measures the CPU vs. bandwidth tradeoff of response compression.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20,
+                            help='Compressions per encoding and level.')
+        parser.add_argument('--output',
+                            help='Write the report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        client = APIClient(SERVER_NAME=benchmark_host(), HTTP_ACCEPT='application/json')
+        client.force_authenticate(user=stand_in_user())
+
+        payloads = {
+            name: client.get(path, HTTP_ACCEPT_ENCODING='identity').content
+            for name, path in PAYLOAD_PATHS.items()
+        }
+        for fmt in ('yaml', 'json'):
+            payloads[f'openapi_{fmt}'] = schema_cache.get(fmt)[0]
+
+        report = json.dumps([
+            measure_compression(name, payload, options['iterations'])
+            for name, payload in payloads.items()
+        ], indent=2)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+            self.stdout.write(self.style.SUCCESS(
+                f'Report written to {options["output"]}'))
+        else:
+            self.stdout.write(report)
@@ -0,0 +1,51 @@
+# file: library_rest/library/management/commands/benchmark_startup.py
+
+import json
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+
+from library.benchmarks.startup import measure_startup
+
+
+class Command(BaseCommand):
+    """
+    Measures the cold start of a worker and prints a JSON report.
+
+    Each run boots the WSGI application in a fresh interpreter with
+    `-X importtime` and runs the warm-up (see library_rest.warmup). The
+    report contains the boot, warm-up and cold start times, the time of each
+    warm-up step and the import time per package and per module.
+
+    Usage:
+        python manage.py benchmark_startup --runs 5
+        python manage.py benchmark_startup --no-warm-up --top 50
+    """
+
+    help = 'Measures the import time and the cold start of a worker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3,
+                            help='Workers booted (fresh interpreters).')
+        parser.add_argument('--top', type=int, default=25,
+                            help='Packages and modules listed in the import breakdown.')
+        parser.add_argument('--no-warm-up', action='store_true',
+                            help='Only boot the workers, without warming them up.')
+        parser.add_argument('--output',
+                            help='Write the report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        try:
+            report = measure_startup(
+                runs=options['runs'], warm_up=not options['no_warm_up'], top=options['top'])
+        except subprocess.CalledProcessError as e:
+            raise CommandError(f'The worker failed to boot:\n{e.stderr[-2000:]}')
+        report = json.dumps(report, indent=2)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+            self.stdout.write(self.style.SUCCESS(
+                f'Report written to {options["output"]}'))
+        else:
+            self.stdout.write(report)
@@ -0,0 +1,53 @@
+# file: library_rest/library/management/commands/benchmark_throttling.py
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from library.benchmarks.throttling import ThrottleBenchmark
+
+
+class Command(BaseCommand):
+    """
+    Measures the cost of a throttling decision and prints a JSON report.
+
+    The bucket stores (shared memory and cache) are measured for one hot
+    principal, for many principals and under contention, then the complete
+    `PrincipalRateThrottle` check of a read and of a write. Worker processes
+    draining one bucket together check that the shared memory store is
+    shared across processes.
+
+    Usage:
+        python manage.py benchmark_throttling --iterations 200000
+        python manage.py benchmark_throttling --threads 16 --processes 8
+    """
+
+    help = 'Measures the cost of the per-principal throttling decisions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100000,
+                            help='Decisions measured per case.')
+        parser.add_argument('--principals', type=int, default=10000,
+                            help='Distinct principals of the many principals case.')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Threads of the contention case.')
+        parser.add_argument('--processes', type=int, default=4,
+                            help='Processes sharing one bucket.')
+        parser.add_argument('--output',
+                            help='Write the report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        report = json.dumps(ThrottleBenchmark(
+            iterations=options['iterations'],
+            principals=options['principals'],
+            threads=options['threads'],
+            processes=options['processes'],
+        ).run(), indent=2)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+            self.stdout.write(self.style.SUCCESS(
+                f'Report written to {options["output"]}'))
+        else:
+            self.stdout.write(report)
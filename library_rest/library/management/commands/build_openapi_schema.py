@@ -0,0 +1,23 @@
+# file: library_rest/library/management/commands/build_openapi_schema.py
+
+from django.core.management.base import BaseCommand
+
+from library_rest.schema import code_version, schema_cache
+
+
+class Command(BaseCommand):
+    """
+    Generates the OpenAPI schema served by `/openapi` into `SCHEMA_CACHE_DIR`,
+    so that workers serve it from disk instead of generating it.
+
+    Usage:
+        python manage.py build_openapi_schema
+    """
+
+    help = 'Generates the cached OpenAPI schema for the current code version.'
+
+    def handle(self, *args, **options):
+        paths = schema_cache.build()
+        self.stdout.write(self.style.SUCCESS(
+            f'Schema for code version {code_version()} written to: ' +
+            ', '.join(path for path in paths if path)))
@@ -0,0 +1,129 @@
+# file: library_rest/library/management/commands/check_query_plans.py
+
+import json
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from library.benchmarks.query_plans import (
+    check_plans, find_regressions, suggest_index, to_baseline
+)
+from library.pagination import LibraryPagination
+
+
+# One baseline per database vendor: the planners of MySQL and SQLite choose differently.
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, f'query_plans.{connection.vendor}.json')
+
+
+class Command(BaseCommand):
+    """
+    EXPLAINs every filter/search/ordering combination of BookViewSet and
+    AuthorViewSet against the current (seeded) database. Combinations of more
+    than `--max-filters` filters are skipped.
+
+    Full scans and filesorts are reported, together with the index that would
+    cover the offending combinations. The command fails when a combination
+    that used an index in the baseline file no longer does, or when there is
+    no baseline to compare against.
+
+    The baseline of the backend serving traffic (`query_plans.mysql.json`,
+    next to manage.py) is committed. Generate it, and regenerate it when a
+    change is meant to alter the plans, on the MySQL database of
+    docker-compose.yaml seeded with the default catalog:
+        python manage.py seed_catalog --clear
+        python manage.py check_query_plans --update-baseline
+
+    Usage:
+        python manage.py check_query_plans
+        python manage.py check_query_plans --baseline query_plans.mysql.json
+    """
+
+    help = 'Checks the query plans of every filter/search/ordering combination.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                            help='Baseline file to compare against.')
+        parser.add_argument('--update-baseline', action='store_true',
+                            help='Write the current plans to the baseline file.')
+        parser.add_argument('--max-filters', type=int, default=2,
+                            help='Maximum number of filters combined in one query.')
+        parser.add_argument('--json', action='store_true',
+                            help='Print the plans as JSON.')
+        parser.add_argument('--verbose-plans', action='store_true',
+                            help='Print the raw EXPLAIN output of flagged combinations.')
+
+    def handle(self, *args, **options):
+        try:
+            results = check_plans(
+                page_size=LibraryPagination.page_size,
+                max_filters=options['max_filters']
+            )
+        except (ValueError, NotImplementedError) as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(to_baseline(results), indent=2))
+        else:
+            self._report(results, options['verbose_plans'])
+
+        if options['update_baseline']:
+            with open(options['baseline'], 'w') as baseline:
+                json.dump(to_baseline(results), baseline, indent=2)
+            self.stdout.write(self.style.SUCCESS(
+                f'Baseline written to {options["baseline"]}'))
+            return
+
+        if not os.path.exists(options['baseline']):
+            raise CommandError(
+                f'No baseline at {options["baseline"]}: generate it with --update-baseline '
+                f'on a database seeded with seed_catalog.')
+
+        with open(options['baseline']) as baseline:
+            regressions = find_regressions(results, json.load(baseline))
+
+        if regressions:
+            raise CommandError(
+                'These combinations stopped using an index:\n  ' +
+                '\n  '.join(regressions))
+
+        self.stdout.write(self.style.SUCCESS('No query plan regressions.'))
+
+    def _report(self, results, verbose):
+        suggestions = defaultdict(list)
+        flagged = 0
+
+        for key, result in sorted(results.items()):
+            plan = result['plan']
+            problems = []
+            if plan.full_scans:
+                problems.append('full scan of ' + ', '.join(plan.full_scans))
+            if plan.filesort:
+                problems.append('filesort')
+            if not problems:
+                continue
+
+            flagged += 1
+            self.stdout.write(f'{key}: ' + '; '.join(problems))
+            if verbose:
+                self.stdout.write(plan.raw)
+
+            suggestion = suggest_index(result['combination'])
+            if suggestion:
+                suggestions[suggestion].append(key)
+
+        self.stdout.write(
+            f'{flagged} of {len(results)} combinations flagged.')
+
+        for (table, fields), keys in sorted(suggestions.items()):
+            self.stdout.write(
+                f'\nSuggested index on {table}: '
+                f'models.Index(fields={list(fields)!r}) covers:')
+            for key in keys:
+                self.stdout.write(f'  {key}')
+
+        if any(result['combination'].search for result in results.values()):
+            self.stdout.write(
+                '\nNote: search uses LIKE \'%term%\', which no B-tree index can serve.')
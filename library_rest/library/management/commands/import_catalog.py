@@ -0,0 +1,92 @@
+# file: library_rest/library/management/commands/import_catalog.py
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from library.catalog_import import IMPORT_CONFIG, CatalogImport
+
+
+class Command(BaseCommand):
+    """
+    Imports authors and books from CSV or NDJSON dumps (see CatalogImport).
+
+    Author rows have `first_name`, `last_name`, `citizenship`, `date_of_birth`
+    and `date_of_death`. Book rows have `title`, `publication_date` and
+    either `author_id` or `author_last_name`, `author_first_name` and
+    `author_date_of_birth`. Authors are imported before books.
+
+    An interrupted import resumes when the same command is run again; the
+    progress is kept in `--state-dir` (by default next to the first input).
+    Rejected rows are written with their reason to `--rejects`.
+
+    Usage:
+        python manage.py import_catalog --authors authors.csv --books books.ndjson
+        python manage.py import_catalog --books books-*.csv --workers 8 --defer-indexes
+        python manage.py import_catalog --books books.csv --no-dedupe --no-load-data
+    """
+
+    help = 'Imports authors and books from CSV or NDJSON files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--authors', nargs='+', default=[],
+                            help='Author files (.csv, .ndjson or .jsonl).')
+        parser.add_argument('--books', nargs='+', default=[],
+                            help='Book files (.csv, .ndjson or .jsonl).')
+        parser.add_argument('--workers', type=int, default=IMPORT_CONFIG['WORKERS'],
+                            help='Processes importing book chunks in parallel (1: no pool).')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_CONFIG['BATCH_SIZE'],
+                            help='Rows per INSERT (or LOAD DATA) and per transaction.')
+        parser.add_argument('--chunk-size', type=int,
+                            default=IMPORT_CONFIG['CHUNK_SIZE'] // (1024 * 1024),
+                            help='Size of the input chunks, in MiB.')
+        parser.add_argument('--state-dir',
+                            help='Directory keeping the progress of the import.')
+        parser.add_argument('--rejects',
+                            help='File receiving the rejected rows (NDJSON).')
+        parser.add_argument('--no-dedupe', action='store_true',
+                            help='Do not look for the books in the database before '
+                                 'inserting them (for loads into an empty catalog).')
+        parser.add_argument('--defer-indexes', action='store_true',
+                            help='Drop the secondary indexes of the books during the '
+                                 'load and build them at the end.')
+        parser.add_argument('--no-load-data', action='store_true',
+                            help='Always use INSERT statements, never LOAD DATA.')
+
+    def _progress(self, started):
+        def report(kind, done, total, counts):
+            counts = counts[kind]
+            rate = counts['processed'] / (time.perf_counter() - started)
+            self.stdout.write(
+                f'{kind}: chunk {done}/{total}, {counts["rows"]} rows, '
+                f'{counts["inserted"]} inserted, {counts["duplicates"]} duplicates, '
+                f'{counts["rejected"]} rejected ({rate:.0f} rows/s)')
+        return report
+
+    def handle(self, *args, **options):
+        if not options['authors'] and not options['books']:
+            raise CommandError('Nothing to import: give --authors and/or --books.')
+
+        try:
+            catalog_import = CatalogImport(
+                authors=options['authors'],
+                books=options['books'],
+                state_dir=options['state_dir'],
+                rejects=options['rejects'],
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                chunk_size=options['chunk_size'] * 1024 * 1024,
+                dedupe=not options['no_dedupe'],
+                defer_indexes=options['defer_indexes'],
+                load_data=not options['no_load_data'] and None,
+            )
+            report = catalog_import.run(progress=self._progress(time.perf_counter()))
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {report["authors"]["inserted"]} authors and '
+            f'{report["books"]["inserted"]} books in {report["duration_s"]:.1f}s '
+            f'({report["rows_per_sec"]:.0f} rows/s).'))
@@ -0,0 +1,97 @@
+# file: library_rest/library/management/commands/load_test.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from library.benchmarks.load import LoadTest, SlowKeycloak
+from library.benchmarks.scenarios import API_SCENARIOS, build_context
+from library.pagination import LibraryPagination
+from library_rest.admission import admission_controller
+from library_rest.throttling import PrincipalRateThrottle
+
+
+DEFAULT_SCENARIOS = [
+    'books_list_first_page',
+    'books_detail',
+    'authors_detail',
+    'books_search_title',
+    'books_list_bulk_page',
+    'books_create',
+]
+
+
+class Command(BaseCommand):
+    """
+    Runs a load test of the API against slowed local stand-ins of its
+    dependencies and prints a JSON report.
+
+    Concurrent clients issue the scenarios of `benchmark_api` in turn while
+    every database query is delayed by `--db-delay` ms and authentication
+    goes through a local Keycloak stand-in answering after
+    `--keycloak-delay` ms. The report contains the statuses, throughput and
+    latencies of each scenario and, per admission class, the peak running
+    and waiting requests and the admitted and rejected ones, to check that
+    a slow dependency results in fast 503s rather than piled-up requests.
+    `--no-admission-control` runs the same load without admission control.
+
+    Usage:
+        python manage.py load_test --concurrency 64 --duration 20 --db-delay 50
+        python manage.py load_test --keycloak-delay 200 --no-admission-control
+    """
+
+    help = 'Runs a load test against slowed local stand-ins and prints a JSON report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=32,
+                            help='Concurrent clients.')
+        parser.add_argument('--duration', type=float, default=10.0,
+                            help='Duration of the test in seconds.')
+        parser.add_argument('--db-delay', type=float, default=20.0,
+                            help='Delay added to every database query, in ms.')
+        parser.add_argument('--keycloak-delay', type=float, default=50.0,
+                            help='Response time of the Keycloak stand-in, in ms.')
+        parser.add_argument('--scenario', action='append', default=[],
+                            help='Issue only the named scenario (repeatable).')
+        parser.add_argument('--no-admission-control', action='store_true',
+                            help='Disable admission control.')
+        parser.add_argument('--output',
+                            help='Write the report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        names = options['scenario'] or DEFAULT_SCENARIOS
+        scenarios = [s for s in API_SCENARIOS if s.name in names]
+        unknown = set(names) - {s.name for s in scenarios}
+        if unknown:
+            raise CommandError(
+                'Unknown scenario(s): {}'.format(', '.join(sorted(unknown))))
+
+        # A single stand-in principal issues every request: do not throttle it.
+        PrincipalRateThrottle.enabled = False
+
+        try:
+            context = build_context(page_size=LibraryPagination.page_size)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['no_admission_control']:
+            admission_controller.enabled = False
+
+        with SlowKeycloak(delay=options['keycloak_delay'] / 1000) as keycloak:
+            with override_settings(KEYCLOAK_CONFIG=keycloak.config):
+                report = LoadTest(
+                    scenarios, context,
+                    concurrency=options['concurrency'],
+                    duration=options['duration'],
+                    db_delay=options['db_delay'] / 1000,
+                ).run()
+        report = json.dumps(report, indent=2)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+            self.stdout.write(self.style.SUCCESS(
+                f'Report written to {options["output"]}'))
+        else:
+            self.stdout.write(report)
@@ -0,0 +1,21 @@
+# file: library_rest/library/management/commands/rebuild_facets.py
+
+from django.core.management.base import BaseCommand
+
+from library.models import Book, FacetCount
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the facet rollup tables from the books table.
+
+    Usage:
+        python manage.py rebuild_facets
+    """
+
+    help = 'Recomputes the facet rollup tables from the books table.'
+
+    def handle(self, *args, **options):
+        FacetCount.objects.rebuild(Book.objects.all())
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {FacetCount.objects.count()} facet counts.'))
@@ -0,0 +1,117 @@
+# file: library_rest/library/management/commands/run_jobs.py
+
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from library.jobs import JOBS_CONFIG, execute, registered_jobs, setup_worker
+from library.models import Job
+
+
+class Command(BaseCommand):
+    """
+    Runs the queued background jobs in a pool of worker processes.
+
+    The command polls the `jobs` table, claims runnable jobs (with
+    `SELECT ... FOR UPDATE SKIP LOCKED` where the database supports it, so
+    several workers, on one or many hosts, can share the queue) and runs each
+    one in a process of the pool. It refreshes the heartbeat of its running
+    jobs on every poll and queues again the jobs of workers that stopped.
+    When a process of the pool dies, its job fails (and is retried) and the
+    pool, which then refuses new work, is replaced. SIGTERM and SIGINT stop
+    claiming new jobs and wait for the running ones.
+
+    Usage:
+        python manage.py run_jobs
+        python manage.py run_jobs --workers 4
+        python manage.py run_jobs --once
+    """
+
+    help = 'Runs the queued background jobs in a pool of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=JOBS_CONFIG['WORKERS'],
+                            help='Number of jobs run concurrently.')
+        parser.add_argument('--poll-interval', type=float,
+                            default=JOBS_CONFIG['POLL_INTERVAL'],
+                            help='Seconds between two polls of an idle queue.')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is empty.')
+
+    def _start_pool(self, workers):
+        context = multiprocessing.get_context(JOBS_CONFIG['START_METHOD'])
+        return ProcessPoolExecutor(workers, mp_context=context, initializer=setup_worker)
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+            self.stdout.write('Stopping: waiting for the running jobs.')
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(
+            f'Worker {worker}: {workers} processes, jobs: {", ".join(registered_jobs())}')
+
+        running = {}
+        pool = self._start_pool(workers)
+        try:
+            while True:
+                for future, job in list(running.items()):
+                    if future.done():
+                        del running[future]
+                        error = future.exception()
+                        if error is None:
+                            status = future.result()
+                        else:
+                            # The worker process died: record the failed attempt.
+                            job.refresh_from_db()
+                            if job.status == Job.RUNNING:
+                                job.mark_failed(repr(error))
+                            status = job.status
+                        self.stdout.write(f'{job.name} #{job.pk}: {status}')
+
+                claimed = False
+                while not stopping and len(running) < workers:
+                    job = Job.objects.claim(worker)
+                    if job is None:
+                        break
+                    claimed = True
+                    try:
+                        running[pool.submit(execute, job.pk)] = job
+                    except BrokenProcessPool:
+                        # A process of the pool died and the pool refuses new work:
+                        # give the job back and replace the pool.
+                        job.release()
+                        self.stdout.write('A worker process died: starting a new pool.')
+                        pool.shutdown(wait=False)
+                        pool = self._start_pool(workers)
+                        break
+                    self.stdout.write(f'{job.name} #{job.pk}: started')
+
+                if stopping and not running:
+                    break
+                if options['once'] and not running and not claimed:
+                    break
+
+                Job.objects.heartbeat(worker)
+                Job.objects.requeue_stale()
+                close_old_connections()
+                if not claimed:
+                    time.sleep(options['poll_interval'])
+        finally:
+            pool.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker} stopped.'))
@@ -0,0 +1,64 @@
+# file: library_rest/library/management/commands/seed_catalog.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from library.benchmarks import CatalogSeeder
+from library.models import Book, FacetCount
+
+
+class Command(BaseCommand):
+    """
+    Seeds the database with a synthetic catalog of authors and books.
+
+    Usage:
+        python manage.py seed_catalog --authors 100000 --books 5000000 --seed 42
+    """
+
+    help = 'Seeds the database with a synthetic catalog of authors and books.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--authors', type=int, default=100000,
+                            help='Number of authors to create.')
+        parser.add_argument('--books', type=int, default=5000000,
+                            help='Number of books to create.')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Number of rows per INSERT statement.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the random generator.')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete the existing catalog before seeding.')
+
+    def _progress(self, label):
+        def report(done, total):
+            self.stdout.write(f'\r{label}: {done}/{total}', ending='')
+            if done == total:
+                self.stdout.write('')
+        return report
+
+    def handle(self, *args, **options):
+        seeder = CatalogSeeder(
+            seed=options['seed'], batch_size=options['batch_size'])
+
+        if options['clear']:
+            self.stdout.write('Deleting the existing catalog...')
+            seeder.clear()
+
+        start = time.perf_counter()
+        authors = seeder.seed_authors(
+            options['authors'], progress=self._progress('Authors'))
+        authors_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        seeder.seed_books(
+            options['books'], authors, progress=self._progress('Books'))
+        books_elapsed = time.perf_counter() - start
+
+        self.stdout.write('Rebuilding the facet rollups...')
+        FacetCount.objects.rebuild(Book.objects.all())
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {options["authors"]} authors in {authors_elapsed:.1f}s '
+            f'and {options["books"]} books in {books_elapsed:.1f}s.'
+        ))
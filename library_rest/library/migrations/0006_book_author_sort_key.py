@@ -0,0 +1,40 @@
+# Generated by Django 6.0.6 on 2026-10-19 10:30
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+def populate_author_sort_key(apps, schema_editor):
+    Author = apps.get_model('library', 'Author')
+    Book = apps.get_model('library', 'Book')
+
+    sort_key = Author.objects.filter(pk=OuterRef('author_id')).annotate(
+        sort_key=Concat('last_name', Value(', '), 'first_name')
+    ).values('sort_key')[:1]
+
+    Book.objects.filter(author__isnull=False).update(
+        author_sort_key=Subquery(sort_key)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0005_remove_book_books_title_7a737c_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='author_sort_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=202),
+        ),
+        migrations.RunPython(
+            populate_author_sort_key, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['author_sort_key', 'id'], name='books_author__a590cc_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.6 on 2026-10-19 10:31
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0006_book_author_sort_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='publication_year',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.datetime.ExtractYear('publication_date'), output_field=models.IntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['publication_year'], name='books_publica_d79f88_idx'),
+        ),
+    ]
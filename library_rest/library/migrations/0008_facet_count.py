@@ -0,0 +1,51 @@
+# Generated by Django 6.0.6 on 2026-10-19 10:33
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_facet_counts(apps, schema_editor):
+    Book = apps.get_model('library', 'Book')
+    FacetCount = apps.get_model('library', 'FacetCount')
+
+    counts = {}
+    books = Book.objects.order_by()
+    for year, count in books.values_list('publication_year').annotate(count=Count('pk')):
+        key = ('decade', str(year // 10 * 10))
+        counts[key] = counts.get(key, 0) + count
+    for citizenship, count in books.filter(author__isnull=False).values_list(
+            'author__citizenship').annotate(count=Count('pk')):
+        counts[('citizenship', citizenship)] = count
+    for author_id, count in books.filter(author__isnull=False).values_list(
+            'author_id').annotate(count=Count('pk')):
+        counts[('author', str(author_id))] = count
+
+    FacetCount.objects.bulk_create([
+        FacetCount(facet=facet, value=value, count=count)
+        for (facet, value), count in counts.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0007_book_publication_year'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('decade', 'Decade'), ('citizenship', 'Citizenship'), ('author', 'Author')], max_length=20)),
+                ('value', models.CharField(max_length=100)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'facet_counts',
+                'indexes': [models.Index(fields=['facet', '-count'], name='facet_count_facet_3bbf12_idx')],
+                'constraints': [models.UniqueConstraint(fields=('facet', 'value'), name='facet_counts_facet_value_uniq')],
+            },
+        ),
+        migrations.RunPython(build_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.6 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0008_facet_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['citizenship'], name='authors_citizen_228d15_idx'),
+        ),
+    ]
@@ -1,2 +1,5 @@
 from .author import Author
 from .book import Book
+from .cache_version import CacheVersion
+from .facet_count import FacetCount
+from .job import Job
@@ -1,4 +1,60 @@
-from django.db import models
+from django.db import connections, models, transaction
+
+from library.models.cache_version import CacheVersion
+from library.models.facet_count import FacetCount, invalidate_facets
+
+
+class AuthorQuerySet(models.QuerySet):
+    """
+    QuerySet of authors keeping the facet rollups and the 'authors' cache
+    version (see AuthorCache) up to date on bulk writes.
+
+    `delete()` and `update()` bypass `Author.save` and `Author.delete`, which
+    do both for single authors; without it the facets would count the
+    deleted books, or the books under their former citizenship, and the
+    other processes would keep serving (and accepting as book authors) the
+    changed or deleted authors.
+
+    Methods:
+        delete(): Deletes the authors and their books, removes the books from the facet
+            rollups and bumps the version once the transaction commits.
+        update(**kwargs): Updates the authors, moves their books between the citizenship
+            rollups and bumps the version once the transaction commits.
+    """
+
+    def _books(self):
+        from library.models.book import Book
+
+        return Book.objects.using(self.db).filter(
+            author__in=list(self.order_by().values_list('pk', flat=True)))
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            deltas = FacetCount.objects.book_deltas(self._books(), sign=-1)
+            result = super().delete()
+            FacetCount.objects.apply_deltas(deltas)
+            CacheVersion.objects.bump_on_commit(CacheVersion.AUTHORS, using=self.db)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.db):
+            if 'citizenship' in kwargs:
+                # Taken before the update, which may change what the queryset matches.
+                books = self._books()
+                deltas = FacetCount.objects.book_deltas(books, sign=-1)
+            updated = super().update(**kwargs)
+            if 'citizenship' in kwargs:
+                # The decade and author rollups cancel out, the citizenship ones remain.
+                deltas.update(FacetCount.objects.book_deltas(books))
+                FacetCount.objects.apply_deltas(deltas)
+            if updated:
+                CacheVersion.objects.bump_on_commit(CacheVersion.AUTHORS, using=self.db)
+        return updated
+
+    update.alters_data = True
 
 
 class Author(models.Model):
@@ -11,9 +67,20 @@ class Author(models.Model):
         citizenship (CharField): The citizenship of the author.
         date_of_birth (DateField): The birth date of the author. Can be null or blank.
         date_of_death (DateField): The death date of the author. Can be null or blank.
+        updated_at (DateTimeField): The timestamp when the author was last updated, used as its
+            version for conditional updates (If-Match).
 
     Methods:
         __str__(): Returns a string representation of the author in the format 'last_name, first_name'.
+        sort_key: The display name used to order books by author, see `Book.author_sort_key`.
+        save(*args, **kwargs): Saves the author and, when renamed, updates the sort key of its books
+            with a single bulk UPDATE. A citizenship change moves its books between facet rollups.
+            Renames and citizenship changes bump the 'authors' cache version (see AuthorCache).
+        delete(*args, **kwargs): Deletes the author and its books, removes them from the facet rollups
+            and bumps the 'authors' cache version. Bulk deletes and updates do the same (see
+            AuthorQuerySet).
+        delete_in_batches(batch_size=1000, progress=None): Deletes the books of the author in bounded
+            batches, then the author.
 
     Meta:
         db_table (str): The name of the database table.
@@ -27,14 +94,119 @@ class Author(models.Model):
     citizenship = models.CharField(max_length=100)
     date_of_birth = models.DateField(null=True, blank=True)
     date_of_death = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AuthorQuerySet.as_manager()
 
     def __str__(self):
+        return self.sort_key
+
+    @property
+    def sort_key(self):
         return f'{self.last_name}, {self.first_name}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'first_name' in field_names and 'last_name' in field_names:
+            instance._loaded_sort_key = instance.sort_key
+        if 'citizenship' in field_names:
+            instance._loaded_citizenship = instance.citizenship
+        return instance
+
+    def save(self, *args, **kwargs):
+        renamed = (
+            not self._state.adding and
+            getattr(self, '_loaded_sort_key', None) != self.sort_key
+        )
+        if self._state.adding:
+            old_citizenship = self.citizenship
+        elif hasattr(self, '_loaded_citizenship'):
+            old_citizenship = self._loaded_citizenship
+        else:
+            old_citizenship = Author.objects.filter(pk=self.pk).values_list(
+                'citizenship', flat=True).first()
+
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            if renamed:
+                self.books.update(author_sort_key=self.sort_key)
+            if old_citizenship != self.citizenship:
+                count = self.books.count()
+                FacetCount.objects.apply_deltas({
+                    (FacetCount.CITIZENSHIP, old_citizenship): -count,
+                    (FacetCount.CITIZENSHIP, self.citizenship): count,
+                })
+            if renamed or old_citizenship != self.citizenship:
+                CacheVersion.objects.bump_on_commit(
+                    CacheVersion.AUTHORS, using=kwargs.get('using'))
+
+        self._loaded_sort_key = self.sort_key
+        self._loaded_citizenship = self.citizenship
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            deltas = FacetCount.objects.book_deltas(self.books.all(), sign=-1)
+            result = super().delete(*args, **kwargs)
+            FacetCount.objects.apply_deltas(deltas)
+            CacheVersion.objects.bump_on_commit(
+                CacheVersion.AUTHORS, using=kwargs.get('using'))
+        return result
+
+    def delete_in_batches(self, batch_size=1000, progress=None):
+        """
+        Deletes the books of the author in batches, then the author.
+
+        `delete` removes every book in a single transaction, which holds its
+        locks for as long as the whole cascade takes. Here each batch is its
+        own short transaction: the primary keys of up to `batch_size` books
+        are read (no model instances are built), their rollup deltas are
+        computed with one GROUP BY, and the rows are removed with a raw
+        DELETE. The cached facets are invalidated once, at the end.
+
+        Args:
+            batch_size (int): The number of books deleted per transaction.
+            progress (callable): Called with the number of books deleted so far after each batch.
+
+        Returns:
+            int: The number of books deleted.
+        """
+        books = self.books.order_by()
+        using = books.db
+        connection = connections[using]
+        table = connection.ops.quote_name(books.model._meta.db_table)
+        pk_column = connection.ops.quote_name(books.model._meta.pk.column)
+
+        deleted = 0
+        while True:
+            with transaction.atomic(using=using):
+                ids = list(books.values_list('pk', flat=True)[:batch_size])
+                if not ids:
+                    break
+                deltas = FacetCount.objects.book_deltas(
+                    books.model.objects.filter(pk__in=ids), sign=-1)
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'DELETE FROM {table} WHERE {pk_column} IN '
+                        f'({", ".join(["%s"] * len(ids))})',
+                        ids,
+                    )
+                FacetCount.objects.apply_deltas(deltas, invalidate=False)
+            deleted += len(ids)
+            if progress is not None:
+                progress(deleted)
+
+        # Also removes any book added while the batches ran.
+        self.delete(using=using)
+        if deleted:
+            invalidate_facets()
+        return deleted
+
     class Meta:
         db_table = 'authors'
         indexes = [
             models.Index(fields=['last_name', 'first_name']),
+            models.Index(fields=['citizenship']),
         ]
         ordering = ['last_name', 'first_name']
         verbose_name_plural = 'Authors'
@@ -1,6 +1,10 @@
-from django.db import models
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models.functions import ExtractYear
 
 from library.models.author import Author
+from library.models.facet_count import FacetCount, book_facet_keys
 
 
 class Book(models.Model):
@@ -10,13 +14,22 @@ class Book(models.Model):
     Attributes:
         title (str): The title of the book.
         author (Author): The author of the book.
+        author_sort_key (str): Copy of the author display name, used to order books by author
+            without joining `authors`. Kept in sync by `Book.save` and `Author.save`.
         publication_date (date): The date the book was published.
+        publication_year (int): The year of `publication_date`, a stored column generated
+            and indexed by the database.
         created_at (datetime): The date and time the book was created.
         updated_at (datetime): The date and time the book was last updated.
 
+    Methods:
+        save(*args, **kwargs): Saves the book, refreshing `author_sort_key` and the facet rollups.
+        delete(*args, **kwargs): Deletes the book and removes it from the facet rollups.
+
     Meta:
         db_table (str): The name of the database table for books.
-        indexes (list): A list of indexes for the table, including one for the title field.
+        indexes (list): A list of indexes for the table, including one for the title field
+            one for ordering (and keyset paging) by author name and one for year ranges.
     """
 
     title = models.CharField(max_length=100)
@@ -26,15 +39,86 @@ class Book(models.Model):
         related_name='books',
         null=True
     )
+    author_sort_key = models.CharField(
+        max_length=202, blank=True, default='', editable=False
+    )
     publication_date = models.DateField()
+    publication_year = models.GeneratedField(
+        expression=ExtractYear('publication_date'),
+        output_field=models.IntegerField(),
+        db_persist=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title + '(' + str(self.publication_date.year) + ')'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'publication_date' in field_names and 'author_id' in field_names:
+            instance._loaded_facet_values = (
+                instance.publication_date, instance.author_id)
+        return instance
+
+    def _facet_keys(self):
+        citizenship = self.author.citizenship if self.author_id else None
+        return book_facet_keys(
+            self.publication_date.year, citizenship, self.author_id)
+
+    def _loaded_facet_keys(self):
+        loaded = getattr(self, '_loaded_facet_values', None)
+        if loaded is None:
+            row = Book.objects.filter(pk=self.pk).values_list(
+                'publication_date', 'author__citizenship', 'author_id').first()
+            return book_facet_keys(row[0].year, row[1], row[2]) if row else []
+
+        publication_date, author_id = loaded
+        if author_id is None:
+            citizenship = None
+        elif author_id == self.author_id:
+            citizenship = self.author.citizenship
+        else:
+            citizenship = Author.objects.filter(pk=author_id).values_list(
+                'citizenship', flat=True).first()
+        return book_facet_keys(publication_date.year, citizenship, author_id)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'author', 'author_id'} & set(update_fields):
+            self.author_sort_key = self.author.sort_key if self.author_id else ''
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'author_sort_key'}
+
+        track_facets = update_fields is None or bool(
+            {'author', 'author_id', 'publication_date'} & set(update_fields))
+
+        with transaction.atomic(using=kwargs.get('using')):
+            deltas = Counter()
+            if track_facets and not self._state.adding:
+                deltas.subtract(self._loaded_facet_keys())
+
+            super().save(*args, **kwargs)
+
+            if track_facets:
+                deltas.update(self._facet_keys())
+                FacetCount.objects.apply_deltas(deltas)
+
+        self._loaded_facet_values = (self.publication_date, self.author_id)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            deltas = Counter()
+            deltas.subtract(self._loaded_facet_keys())
+            result = super().delete(*args, **kwargs)
+            FacetCount.objects.apply_deltas(deltas)
+        return result
+
     class Meta:
         db_table = 'books'
         indexes = [
             models.Index(fields=['title', 'author']),
+            models.Index(fields=['author_sort_key', 'id']),
+            models.Index(fields=['publication_year']),
         ]
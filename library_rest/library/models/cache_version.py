@@ -0,0 +1,59 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+
+class CacheVersionManager(models.Manager):
+    """
+    Manager reading and bumping the cache version counters.
+
+    Methods:
+        get_version(name): Returns the current version of `name` (0 if it was never bumped).
+        bump(name): Increments the version of `name`.
+        bump_on_commit(name, using=None): Increments the version of `name` once the current
+            transaction commits.
+    """
+
+    def get_version(self, name):
+        return self.filter(name=name).values_list('version', flat=True).first() or 0
+
+    def bump(self, name):
+        if self.filter(name=name).update(version=F('version') + 1):
+            return
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(name=name, version=1)
+        except IntegrityError:
+            # Created concurrently between our UPDATE and INSERT.
+            self.filter(name=name).update(version=F('version') + 1)
+
+    def bump_on_commit(self, name, using=None):
+        transaction.on_commit(lambda: self.bump(name), using=using)
+
+
+class CacheVersion(models.Model):
+    """
+    Version counter of data cached in process memory.
+
+    Each process compares the version it loaded its copy at with the one
+    stored here (a primary key lookup) and drops the copy when they differ;
+    writers bump the version after committing. This invalidates the copies
+    of every process without a shared cache server.
+
+    Attributes:
+        name (str): The name of the cached data: 'authors' or 'facets'.
+        version (int): Incremented every time the cached data changes.
+    """
+
+    AUTHORS = 'authors'
+    FACETS = 'facets'
+
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    objects = CacheVersionManager()
+
+    def __str__(self):
+        return f'{self.name}: {self.version}'
+
+    class Meta:
+        db_table = 'cache_versions'
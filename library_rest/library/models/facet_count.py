@@ -0,0 +1,146 @@
+from collections import Counter
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F
+
+from library.models.cache_version import CacheVersion
+
+
+def book_facet_keys(publication_year, citizenship, author_id):
+    """
+    Returns the (facet, value) rollup keys a single book contributes to.
+    """
+    keys = [(FacetCount.DECADE, str(publication_year // 10 * 10))]
+    if author_id is not None:
+        keys.append((FacetCount.CITIZENSHIP, citizenship))
+        keys.append((FacetCount.AUTHOR, str(author_id)))
+    return keys
+
+
+class FacetCountManager(models.Manager):
+    """
+    Manager maintaining the facet rollups.
+
+    Methods:
+        apply_deltas(deltas, invalidate=True): Adds each delta to its (facet, value) counter and,
+            unless `invalidate` is False, invalidates the cached facets.
+        book_deltas(queryset, sign=1): Computes the deltas of adding (or removing, with
+            sign=-1) every book in `queryset`, with one GROUP BY query per facet.
+        rebuild(books): Recomputes every rollup from scratch.
+    """
+
+    def apply_deltas(self, deltas, invalidate=True):
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        with transaction.atomic(using=self.db):
+            for (facet, value), delta in deltas.items():
+                updated = self.filter(facet=facet, value=value).update(
+                    count=F('count') + delta)
+                if updated:
+                    continue
+                try:
+                    with transaction.atomic(using=self.db):
+                        self.create(facet=facet, value=value, count=delta)
+                except IntegrityError:
+                    # Created concurrently between our UPDATE and INSERT.
+                    self.filter(facet=facet, value=value).update(
+                        count=F('count') + delta)
+
+            # Drop the counters that reached zero, looking only at the decremented keys.
+            emptied = {}
+            for (facet, value), delta in deltas.items():
+                if delta < 0:
+                    emptied.setdefault(facet, []).append(value)
+            for facet, values in emptied.items():
+                self.filter(facet=facet, value__in=values, count__lte=0).delete()
+
+        if invalidate:
+            invalidate_facets()
+
+    def book_deltas(self, queryset, sign=1):
+        deltas = Counter()
+        queryset = queryset.order_by()
+
+        for year, count in queryset.values_list('publication_year').annotate(
+                count=Count('pk')):
+            deltas[(self.model.DECADE, str(year // 10 * 10))] += sign * count
+
+        for citizenship, count in queryset.filter(author__isnull=False).values_list(
+                'author__citizenship').annotate(count=Count('pk')):
+            deltas[(self.model.CITIZENSHIP, citizenship)] += sign * count
+
+        for author_id, count in queryset.filter(author__isnull=False).values_list(
+                'author_id').annotate(count=Count('pk')):
+            deltas[(self.model.AUTHOR, str(author_id))] += sign * count
+
+        return deltas
+
+    def rebuild(self, books):
+        deltas = self.book_deltas(books)
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            self.bulk_create([
+                self.model(facet=facet, value=value, count=count)
+                for (facet, value), count in deltas.items() if count > 0
+            ], batch_size=1000)
+        invalidate_facets()
+
+
+def invalidate_facets():
+    """
+    Invalidates every cached filtered facet result by bumping the facets
+    version (see CacheVersion) once the current transaction commits.
+    """
+    CacheVersion.objects.bump_on_commit(CacheVersion.FACETS)
+
+
+class FacetCount(models.Model):
+    """
+    Precomputed book count for one value of a facet (rollup table).
+
+    The rows are kept up to date incrementally by `Book.save`, `Book.delete`,
+    `Author.save` and `Author.delete`; bulk paths apply their deltas through
+    `FacetCount.objects.apply_deltas`.
+
+    Attributes:
+        facet (str): The facet: 'decade', 'citizenship' or 'author'.
+        value (str): The facet value: the first year of the decade, the author
+            citizenship or the author id.
+        count (int): The number of books having that value.
+
+    Meta:
+        db_table (str): The name of the database table.
+        constraints (list): One row per (facet, value).
+        indexes (list): An index to read the top values of a facet.
+    """
+
+    DECADE = 'decade'
+    CITIZENSHIP = 'citizenship'
+    AUTHOR = 'author'
+
+    FACET_CHOICES = [
+        (DECADE, 'Decade'),
+        (CITIZENSHIP, 'Citizenship'),
+        (AUTHOR, 'Author'),
+    ]
+
+    facet = models.CharField(max_length=20, choices=FACET_CHOICES)
+    value = models.CharField(max_length=100)
+    count = models.BigIntegerField(default=0)
+
+    objects = FacetCountManager()
+
+    def __str__(self):
+        return f'{self.facet}={self.value}: {self.count}'
+
+    class Meta:
+        db_table = 'facet_counts'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['facet', 'value'], name='facet_counts_facet_value_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['facet', '-count']),
+        ]
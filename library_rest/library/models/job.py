@@ -0,0 +1,203 @@
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from library.jobs import JOBS_CONFIG, JobCancelled, get_handler, retry_delay
+
+
+class JobManager(models.Manager):
+    """
+    Manager implementing the database-backed job queue.
+
+    Methods:
+        enqueue(name, params=None, created_by='', max_attempts=None): Queues a job.
+        claim(worker): Marks the next runnable job as running for `worker` and returns it.
+        heartbeat(worker): Refreshes the heartbeat of the jobs `worker` is running.
+        requeue_stale(): Queues again the running jobs whose worker stopped sending heartbeats.
+    """
+
+    def enqueue(self, name, params=None, created_by='', max_attempts=None):
+        get_handler(name)
+        return self.create(
+            name=name,
+            params=params or {},
+            created_by=created_by,
+            max_attempts=max_attempts or JOBS_CONFIG['MAX_ATTEMPTS'],
+        )
+
+    def claim(self, worker):
+        now = timezone.now()
+        with transaction.atomic(using=self.db):
+            job = (
+                self.select_for_update(skip_locked=True)
+                .filter(status=self.model.PENDING, run_after__lte=now)
+                .order_by('run_after', 'id')
+                .first()
+            )
+            if job is None:
+                return None
+            # The conditional UPDATE also protects backends without SKIP LOCKED.
+            claimed = self.filter(pk=job.pk, status=self.model.PENDING).update(
+                status=self.model.RUNNING,
+                attempts=models.F('attempts') + 1,
+                locked_by=worker,
+                heartbeat_at=now,
+                started_at=now,
+                updated_at=now,
+            )
+        if not claimed:
+            return None
+        job.refresh_from_db()
+        return job
+
+    def heartbeat(self, worker):
+        return self.filter(status=self.model.RUNNING, locked_by=worker).update(
+            heartbeat_at=timezone.now())
+
+    def requeue_stale(self):
+        now = timezone.now()
+        stale = self.filter(
+            status=self.model.RUNNING,
+            heartbeat_at__lt=now - timedelta(seconds=JOBS_CONFIG['STALE_TIMEOUT']),
+        )
+        failed = stale.filter(attempts__gte=models.F('max_attempts')).update(
+            status=self.model.FAILED, error='The worker running the job stopped.',
+            locked_by='', finished_at=now, updated_at=now)
+        requeued = stale.update(
+            status=self.model.PENDING, locked_by='', run_after=now, updated_at=now)
+        return requeued + failed
+
+
+class Job(models.Model):
+    """
+    Model representing a background job, run by the `run_jobs` worker command.
+
+    Attributes:
+        name (CharField): The name the job handler is registered with (see `library.jobs.job_handler`).
+        params (JSONField): The arguments of the handler.
+        status (CharField): 'pending', 'running', 'done', 'failed' or 'cancelled'.
+        attempts (PositiveIntegerField): The number of times the job has been started.
+        max_attempts (PositiveIntegerField): The number of attempts before the job fails for good.
+        run_after (DateTimeField): The job is not started before this time (retry backoff).
+        progress (BigIntegerField): The units of work done so far.
+        progress_total (BigIntegerField): The total units of work, if known.
+        result (JSONField): The value returned by the handler.
+        error (TextField): The traceback of the last failed attempt.
+        cancel_requested (BooleanField): Whether the job has been asked to stop.
+        locked_by (CharField): The worker running the job.
+        heartbeat_at (DateTimeField): The last time the worker reported the job alive.
+        created_by (CharField): The username of the user who queued the job.
+        created_at (DateTimeField): The timestamp when the job was queued.
+        started_at (DateTimeField): The timestamp when the last attempt started.
+        finished_at (DateTimeField): The timestamp when the job finished.
+        updated_at (DateTimeField): The timestamp when the job was last updated.
+
+    Methods:
+        report_progress(progress, total=None): Records the progress of the running job and
+            raises JobCancelled if its cancellation was requested.
+        cancel(): Cancels a pending job, or asks a running one to stop.
+        mark_done(result), mark_failed(error), mark_cancelled(): Record the outcome of an attempt.
+        release(): Gives back a claimed job that could not be started, without counting the
+            attempt.
+
+    Meta:
+        db_table (str): The name of the database table.
+        indexes (list): An index to find the next runnable job.
+        ordering (list): The default ordering for the model.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+        (CANCELLED, 'Cancelled'),
+    ]
+
+    name = models.CharField(max_length=100)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    run_after = models.DateTimeField(default=timezone.now)
+    progress = models.BigIntegerField(default=0)
+    progress_total = models.BigIntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    cancel_requested = models.BooleanField(default=False)
+    locked_by = models.CharField(max_length=100, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.CharField(max_length=150, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = JobManager()
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
+
+    @property
+    def finished(self):
+        return self.status in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def _update(self, **fields):
+        fields['updated_at'] = timezone.now()
+        for name, value in fields.items():
+            setattr(self, name, value)
+        type(self).objects.filter(pk=self.pk).update(**fields)
+
+    def report_progress(self, progress, total=None):
+        fields = {'progress': progress, 'heartbeat_at': timezone.now()}
+        if total is not None:
+            fields['progress_total'] = total
+        self._update(**fields)
+        self.cancel_requested = type(self).objects.filter(
+            pk=self.pk).values_list('cancel_requested', flat=True).get()
+        if self.cancel_requested:
+            raise JobCancelled()
+
+    def cancel(self):
+        now = timezone.now()
+        jobs = type(self).objects.filter(pk=self.pk)
+        if not jobs.filter(status=self.PENDING).update(
+                status=self.CANCELLED, cancel_requested=True,
+                finished_at=now, updated_at=now):
+            jobs.filter(status=self.RUNNING).update(
+                cancel_requested=True, updated_at=now)
+        self.refresh_from_db()
+
+    def mark_done(self, result):
+        self._update(status=self.DONE, result=result, error='', locked_by='',
+                     finished_at=timezone.now())
+
+    def mark_cancelled(self):
+        self._update(status=self.CANCELLED, locked_by='', finished_at=timezone.now())
+
+    def release(self):
+        self._update(status=self.PENDING, attempts=self.attempts - 1, locked_by='',
+                     heartbeat_at=None)
+
+    def mark_failed(self, error):
+        if self.attempts < self.max_attempts and not self.cancel_requested:
+            self._update(
+                status=self.PENDING, error=error, locked_by='',
+                run_after=timezone.now() + timedelta(seconds=retry_delay(self.attempts)))
+        else:
+            self._update(status=self.FAILED, error=error, locked_by='',
+                         finished_at=timezone.now())
+
+    class Meta:
+        db_table = 'jobs'
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+        ordering = ['-created_at']
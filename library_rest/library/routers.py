@@ -0,0 +1,13 @@
+from django.conf import settings
+
+
+class SnapshotRouter:
+    """
+    Keeps the read-only snapshot database (see library.snapshots) out of the
+    migrations: its schema is created by `Snapshot.build`.
+    """
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == getattr(settings, 'LIBRARY_SNAPSHOT', {}).get('ALIAS', 'snapshot'):
+            return False
+        return None
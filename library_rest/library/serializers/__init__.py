@@ -1,2 +1,8 @@
 from .author_serializer import AuthorSerializer
 from .book_serializer import BookSerializer
+from .facets_serializer import FacetsSerializer, FacetValueSerializer
+from .batch_serializer import BatchRequestSerializer, BatchResponseSerializer
+from .job_serializer import JobSerializer
+from .book_bulk_update_serializer import (
+    BookBulkUpdateSerializer, BookBulkUpdateResultSerializer, BookChangeSerializer,
+    BookChangesSerializer)
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 from library.models import Author
+from library.serializers.field_level_update_mixin import FieldLevelUpdateMixin
 
 
-class AuthorSerializer(serializers.HyperlinkedModelSerializer):
+class AuthorSerializer(FieldLevelUpdateMixin, serializers.HyperlinkedModelSerializer):
     """
     AuthorSerializer is a HyperlinkedModelSerializer for the Author model.
+    Updates only write the changed columns (see FieldLevelUpdateMixin).
     Fields:
         url (HyperlinkedIdentityField): A hyperlink to the detail view of the author.
         id (IntegerField): The unique identifier for the author.
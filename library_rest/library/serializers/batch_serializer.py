@@ -0,0 +1,59 @@
+from rest_framework import serializers
+
+
+class BatchSubRequestSerializer(serializers.Serializer):
+    """
+    BatchSubRequestSerializer describes one request of a batch.
+
+    Fields:
+        id (CharField): Optional client identifier, echoed in the matching response.
+        method (ChoiceField): The HTTP method of the request.
+        path (CharField): The path (and query string) of a `library` endpoint, e.g. '/library/books/1'.
+        body (JSONField): Optional JSON body, for write requests.
+    """
+
+    METHOD_CHOICES = ['GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE']
+
+    id = serializers.CharField(required=False)
+    method = serializers.ChoiceField(choices=METHOD_CHOICES, default='GET')
+    path = serializers.CharField()
+    body = serializers.JSONField(required=False)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """
+    BatchRequestSerializer describes the payload of the batch endpoint.
+
+    Fields:
+        requests (BatchSubRequestSerializer): The requests to dispatch, in order.
+    """
+
+    requests = BatchSubRequestSerializer(many=True, allow_empty=False)
+
+
+class BatchSubResponseSerializer(serializers.Serializer):
+    """
+    BatchSubResponseSerializer describes the response to one request of a batch.
+
+    Fields:
+        id (CharField): The identifier of the matching request, if any.
+        status (IntegerField): The HTTP status code.
+        headers (DictField): The relevant response headers (ETag, Location, Retry-After).
+        body (JSONField): The response body.
+    """
+
+    id = serializers.CharField(required=False)
+    status = serializers.IntegerField()
+    headers = serializers.DictField(child=serializers.CharField())
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    """
+    BatchResponseSerializer describes the response of the batch endpoint.
+
+    Fields:
+        responses (BatchSubResponseSerializer): One response per request, in request order.
+    """
+
+    responses = BatchSubResponseSerializer(many=True)
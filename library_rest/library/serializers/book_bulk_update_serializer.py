@@ -0,0 +1,92 @@
+from rest_framework import serializers
+
+from library.filters import BookFilter
+
+
+class BookChangesSerializer(serializers.Serializer):
+    """
+    BookChangesSerializer describes the field assignments of a bulk update.
+
+    Fields:
+        title (CharField): The new title.
+        author (IntegerField): The primary key of the new author.
+        publication_date (DateField): The new publication date.
+    """
+
+    title = serializers.CharField(max_length=100, required=False)
+    author = serializers.IntegerField(required=False)
+    publication_date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError('At least one field must be assigned.')
+        return attrs
+
+
+class BookChangeSerializer(BookChangesSerializer):
+    """
+    BookChangeSerializer describes the changes of one book in a bulk update.
+
+    Fields:
+        id (IntegerField): The primary key of the book.
+        title, author, publication_date: See BookChangesSerializer.
+    """
+
+    id = serializers.IntegerField()
+
+    def validate(self, attrs):
+        if len(attrs) < 2:
+            raise serializers.ValidationError('At least one field must be assigned.')
+        return attrs
+
+
+class BookBulkUpdateSerializer(serializers.Serializer):
+    """
+    BookBulkUpdateSerializer describes the payload of the bulk update endpoint.
+
+    Exactly one of the two forms must be used:
+    - `filter` and `set`: assigns the `set` fields to every book matching `filter`, whose keys
+      are the filters of the book list (e.g. {"author": 5, "year__lte": 1950}).
+    - `changes`: applies per-book changes, e.g. [{"id": 1, "publication_date": "1951-07-16"}].
+
+    Fields:
+        filter (DictField): The books to update, as book list filters.
+        set (BookChangesSerializer): The fields assigned to every matching book.
+        changes (BookChangeSerializer): The changes of each book.
+    """
+
+    filter = serializers.DictField(required=False, allow_empty=False)
+    set = BookChangesSerializer(required=False)
+    changes = BookChangeSerializer(many=True, required=False, allow_empty=False)
+
+    def validate_filter(self, value):
+        unknown = set(value) - set(BookFilter.base_filters)
+        if unknown:
+            raise serializers.ValidationError(
+                'Unknown filter(s): {}.'.format(', '.join(sorted(unknown))))
+        return value
+
+    def validate(self, attrs):
+        if 'changes' in attrs:
+            if 'filter' in attrs or 'set' in attrs:
+                raise serializers.ValidationError(
+                    "Use either 'filter' and 'set' or 'changes'.")
+        elif 'filter' not in attrs or 'set' not in attrs:
+            raise serializers.ValidationError(
+                "Both 'filter' and 'set' are required, unless 'changes' is given.")
+        return attrs
+
+
+class BookBulkUpdateResultSerializer(serializers.Serializer):
+    """
+    BookBulkUpdateResultSerializer describes the outcome of a bulk update.
+
+    Fields:
+        matched (IntegerField): The number of books matched by the filter or the ids.
+        updated (IntegerField): The number of books actually changed.
+        not_found (ListField): The ids of `changes` that match no book.
+    """
+
+    matched = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    not_found = serializers.ListField(child=serializers.IntegerField())
@@ -2,52 +2,57 @@ from rest_framework import serializers
 
 from library.models.book import Book
 from library.serializers.author_serializer import AuthorSerializer
+from library.serializers.cached_author_fields import (
+    CachedAuthorListSerializer, CachedAuthorNameField, CachedAuthorRelatedField,
+    CachedAuthorUrlField)
+from library.serializers.field_level_update_mixin import FieldLevelUpdateMixin
 from library.models.author import Author
 
 
-class BookSerializer(serializers.HyperlinkedModelSerializer):
+class BookSerializer(FieldLevelUpdateMixin, serializers.HyperlinkedModelSerializer):
     """
     BookSerializer is a HyperlinkedModelSerializer for the Book model.
 
+    Updates only write the changed columns (see FieldLevelUpdateMixin), and an unchanged
+    `author` is not looked up again. The author name and URL, and the validation of a new
+    `author`, are served by the AuthorCache (a list of books loads its missing authors with
+    one query), so reading and writing books does not query the authors table.
+
     Fields:
         url (HyperlinkedIdentityField): URL for the book detail view.
-        author_name (StringRelatedField): Name of the author, read-only.
-        author_url (HyperlinkedRelatedField): URL for the author detail view, read-only.
-        author (PrimaryKeyRelatedField): Primary key of the author, write-only, optional.
-        year (SerializerMethodField): Year of publication, read-only.
+        author_name (CachedAuthorNameField): Name of the author, read-only.
+        author_url (CachedAuthorUrlField): URL for the author detail view, read-only.
+        author (CachedAuthorRelatedField): Primary key of the author, write-only, optional.
+        year (IntegerField): Year of publication, read-only, read from the stored
+            `publication_year` column.
         id (IntegerField): Primary key of the book.
         title (CharField): Title of the book.
         publication_date (DateField): Publication date of the book.
         created_at (DateTimeField): Timestamp when the book was created.
         updated_at (DateTimeField): Timestamp when the book was last updated.
-
-    Methods:
-        get_year(obj): Returns the year of the publication date.
     """
 
     url = serializers.HyperlinkedIdentityField(
         view_name='book-detail', read_only=True
     )
 
-    author_name = serializers.StringRelatedField(
+    author_name = CachedAuthorNameField(
         source='author', read_only=True
     )
 
-    author_url = serializers.HyperlinkedRelatedField(
+    author_url = CachedAuthorUrlField(
         view_name='author-detail', read_only=True, source='author'
     )
 
-    author = serializers.PrimaryKeyRelatedField(
+    author = CachedAuthorRelatedField(
         write_only=True, queryset=Author.objects.all()
     )
 
-    year = serializers.SerializerMethodField(read_only=True)
-
-    def get_year(self, obj) -> int:
-        return obj.publication_date.year
+    year = serializers.IntegerField(source='publication_year', read_only=True)
 
     class Meta:
         model = Book
+        list_serializer_class = CachedAuthorListSerializer
         fields = [
             'id',
             'url',
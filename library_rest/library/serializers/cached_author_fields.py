@@ -0,0 +1,108 @@
+from django.db import models
+from rest_framework import serializers
+
+from library.author_cache import CachedAuthor, author_cache, get_author_cache
+from library.serializers.instance_related_field import InstanceRelatedField
+
+
+def _request(field):
+    return field.context.get('request')
+
+
+def _cached_author(field, instance):
+    author_id = getattr(instance, instance._meta.get_field(field.source).attname)
+    if author_id is None:
+        return None
+    return get_author_cache(instance._state.db).get(author_id, _request(field))
+
+
+class CachedAuthorNameField(serializers.StringRelatedField):
+    """
+    StringRelatedField rendering the author name from the AuthorCache.
+
+    The author is read through the `author_id` column of the instance, so no
+    query is made for cached authors. Behaves as StringRelatedField when the
+    cache is disabled.
+    """
+
+    def get_attribute(self, instance):
+        if not author_cache.enabled:
+            return super().get_attribute(instance)
+        return _cached_author(self, instance)
+
+    def to_representation(self, value):
+        if isinstance(value, CachedAuthor):
+            return value.name
+        return super().to_representation(value)
+
+
+class CachedAuthorUrlField(serializers.HyperlinkedRelatedField):
+    """
+    HyperlinkedRelatedField rendering the author URL from the AuthorCache.
+
+    The path of the author detail endpoint is cached with the author, only
+    the host of the request is added to it. Behaves as
+    HyperlinkedRelatedField when the cache is disabled.
+    """
+
+    def get_attribute(self, instance):
+        if not author_cache.enabled:
+            return super().get_attribute(instance)
+        return _cached_author(self, instance)
+
+    def to_representation(self, value):
+        if not isinstance(value, CachedAuthor):
+            return super().to_representation(value)
+        request = _request(self)
+        return request.build_absolute_uri(value.path) if request is not None else value.path
+
+
+class CachedAuthorRelatedField(InstanceRelatedField):
+    """
+    InstanceRelatedField validating new authors against the AuthorCache.
+
+    A submitted primary key found in the cache is resolved to an Author
+    holding the cached fields (enough for `Book.save` to compute the sort key
+    and the facet rollups) instead of being looked up in `queryset`. Behaves
+    as InstanceRelatedField when the cache is disabled.
+    """
+
+    def to_internal_value(self, data):
+        if not author_cache.enabled or isinstance(data, bool):
+            return super().to_internal_value(data)
+        instance = getattr(self.root, 'instance', None)
+        if instance is not None and hasattr(instance, '_meta'):
+            # An unchanged author is taken from the instance.
+            current = getattr(instance, instance._meta.get_field(self.source).attname)
+            if current is not None and str(current) == str(data):
+                return super().to_internal_value(data)
+
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        author = author_cache.get(pk, _request(self))
+        if author is None:
+            self.fail('does_not_exist', pk_value=data)
+        return author.instance()
+
+
+class CachedAuthorListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer loading the authors of a page of books into the AuthorCache
+    with one query, before the books are serialized one by one. The authors
+    are loaded from the database the books were read from.
+    """
+
+    author_attname = 'author_id'
+
+    def to_representation(self, data):
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        if author_cache.enabled:
+            data = list(data)
+            author_ids = {getattr(item, self.author_attname) for item in data}
+            author_ids.discard(None)
+            if author_ids:
+                get_author_cache(data[0]._state.db).get_many(author_ids, _request(self))
+        return super().to_representation(data)
@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+
+class FacetValueSerializer(serializers.Serializer):
+    """
+    FacetValueSerializer describes one value of a facet.
+
+    Fields:
+        value (CharField): The facet value (decade start year, citizenship or author id).
+        label (CharField): A human readable label for the value.
+        count (IntegerField): The number of books having that value.
+    """
+
+    value = serializers.CharField()
+    label = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class FacetsSerializer(serializers.Serializer):
+    """
+    FacetsSerializer describes the book counts returned next to search results.
+
+    Fields:
+        decade (FacetValueSerializer): Books per publication decade.
+        citizenship (FacetValueSerializer): Books per author citizenship.
+        author (FacetValueSerializer): Books per author.
+    """
+
+    decade = FacetValueSerializer(many=True)
+    citizenship = FacetValueSerializer(many=True)
+    author = FacetValueSerializer(many=True)
@@ -0,0 +1,54 @@
+from django.core.exceptions import FieldDoesNotExist
+
+
+class FieldLevelUpdateMixin:
+    """
+    ModelSerializer mixin writing only the columns an update actually changes.
+
+    `ModelSerializer.update` assigns every validated value and calls `save()`,
+    which issues an UPDATE of every column and bumps the `auto_now` fields
+    even when nothing changed. With this mixin the validated values are
+    compared with the instance first: unchanged values are dropped, a request
+    changing nothing does not touch the database at all, and the others are
+    saved with `save(update_fields=...)` (the changed fields plus the
+    `auto_now` ones).
+
+    Methods:
+        get_changed_fields(instance, validated_data): Returns the validated values that differ
+            from the instance.
+        update(instance, validated_data): Saves the changed fields only.
+    """
+
+    def get_changed_fields(self, instance, validated_data):
+        changed = {}
+        for attr, value in validated_data.items():
+            try:
+                field = instance._meta.get_field(attr)
+            except FieldDoesNotExist:
+                changed[attr] = value
+                continue
+            if field.is_relation and value is not None:
+                current, value_key = getattr(instance, field.attname), value.pk
+            else:
+                current, value_key = getattr(instance, attr), value
+            if current != value_key:
+                changed[attr] = value
+        return changed
+
+    def update(self, instance, validated_data):
+        changed = self.get_changed_fields(instance, validated_data)
+        if not changed:
+            return instance
+
+        opts = instance._meta
+        if not set(changed) <= {field.name for field in opts.concrete_fields}:
+            # Many-to-many or non-field attributes: use the default update.
+            return super().update(instance, changed)
+
+        for attr, value in changed.items():
+            setattr(instance, attr, value)
+        auto_now = [
+            field.name for field in opts.concrete_fields if getattr(field, 'auto_now', False)
+        ]
+        instance.save(update_fields=[*changed, *auto_now])
+        return instance
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+
+class InstanceRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that does not look up an unchanged relation again.
+
+    When the serializer updates an instance and the submitted primary key is
+    the one the instance already points to, the related object is taken from
+    the instance (or, if it is not loaded, a bare instance carrying the
+    primary key is returned) instead of querying `queryset` to validate it:
+    the relation was valid when it was saved. Other values are validated as
+    usual.
+    """
+
+    def to_internal_value(self, data):
+        instance = getattr(self.root, 'instance', None)
+        if instance is not None and hasattr(instance, '_meta') and data is not None:
+            field = instance._meta.get_field(self.source)
+            current = getattr(instance, field.attname)
+            if current is not None and str(current) == str(data):
+                if field.is_cached(instance):
+                    return getattr(instance, field.name)
+                return field.related_model(pk=current)
+        return super().to_internal_value(data)
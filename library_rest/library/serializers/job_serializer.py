@@ -0,0 +1,59 @@
+from rest_framework import serializers
+
+from library.models import Job
+
+
+class JobSerializer(serializers.HyperlinkedModelSerializer):
+    """
+    JobSerializer is a read-only HyperlinkedModelSerializer for the Job model.
+
+    Fields:
+        url (HyperlinkedIdentityField): URL for the job detail view, to poll its status.
+        id (IntegerField): Primary key of the job.
+        name (CharField): The kind of job, e.g. 'delete_author'.
+        params (JSONField): The arguments of the job.
+        status (CharField): 'pending', 'running', 'done', 'failed' or 'cancelled'.
+        attempts (IntegerField): The number of times the job has been started.
+        max_attempts (IntegerField): The number of attempts before the job fails for good.
+        run_after (DateTimeField): The job is not started before this time.
+        progress (IntegerField): The units of work done so far.
+        progress_total (IntegerField): The total units of work, if known.
+        result (JSONField): The result of the job, once done.
+        error (CharField): The error of the last failed attempt.
+        cancel_requested (BooleanField): Whether the job has been asked to stop.
+        created_by (CharField): The user who queued the job.
+        created_at (DateTimeField): Timestamp when the job was queued.
+        started_at (DateTimeField): Timestamp when the last attempt started.
+        finished_at (DateTimeField): Timestamp when the job finished.
+    Meta:
+        model (Model): The model that is being serialized.
+        fields (list): The list of fields to be included in the serialization.
+        read_only_fields (list): Every field: jobs are created by the endpoints that start them.
+    """
+
+    url = serializers.HyperlinkedIdentityField(
+        view_name='job-detail', read_only=True
+    )
+
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'url',
+            'name',
+            'params',
+            'status',
+            'attempts',
+            'max_attempts',
+            'run_after',
+            'progress',
+            'progress_total',
+            'result',
+            'error',
+            'cancel_requested',
+            'created_by',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,147 @@
+import hashlib
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+COALESCING_CONFIG = {
+    'ENABLED': True,
+    'CROSS_PROCESS': False,
+    'CACHE': 'default',
+    'LOCK_TIMEOUT': 10,
+    'RESULT_TIMEOUT': 1,
+    'POLL_INTERVAL': 0.01,
+    **getattr(settings, 'LIBRARY_COALESCING', {}),
+}
+
+
+class _Call:
+    """
+    An in-flight computation and, once it is done, its result or exception.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical computations.
+
+    `do(key, fn)` runs `fn` unless a computation with the same `key` is
+    already in flight in the process, in which case it waits for that one and
+    returns its result (or raises its exception). Nothing is kept once the
+    computation is done: unlike a cache, only callers arriving while it runs
+    share its result.
+
+    With `cross_process` enabled the leader of a process also takes a lock
+    in the `cache` backend, so that the processes sharing it (e.g. the
+    workers of a node, with a memcached or redis cache) coalesce too: the
+    holder stores its result for `result_timeout` seconds and the others
+    poll for it, computing it themselves if the lock expires or is released
+    without a result. The stored result may thus be served up to
+    `result_timeout` seconds after it was computed.
+
+    Attributes:
+        enabled (bool): Whether callers should coalesce through this instance.
+        cross_process (bool): Whether processes coalesce through the cache backend.
+        cache_alias (str): The cache backend holding the locks and the results.
+        lock_timeout (float): Seconds after which a lock of a dead holder expires.
+        result_timeout (float): Seconds a result stays available to other processes.
+        poll_interval (float): Seconds between two polls of a waiting process.
+
+    Methods:
+        make_key(*parts): Returns a key identifying `parts`.
+        do(key, fn): Returns the result of `fn`, shared with concurrent calls with the same key.
+        in_flight(): Returns the number of computations in flight in the process.
+    """
+
+    def __init__(self, enabled=True, cross_process=False, cache_alias='default',
+                 lock_timeout=10, result_timeout=1, poll_interval=0.01):
+        self.enabled = enabled
+        self.cross_process = cross_process
+        self.cache_alias = cache_alias
+        self.lock_timeout = lock_timeout
+        self.result_timeout = result_timeout
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts):
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            if self.cross_process:
+                call.result = self._do_shared(key, fn)
+            else:
+                call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def _do_shared(self, key, fn):
+        cache = caches[self.cache_alias]
+        lock_key = f'library:singleflight:lock:{key}'
+        result_key = f'library:singleflight:result:{key}'
+
+        result = cache.get(result_key)
+        if result is not None:
+            return result
+
+        token = uuid.uuid4().hex
+        if not cache.add(lock_key, token, self.lock_timeout):
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                result = cache.get(result_key)
+                if result is not None:
+                    return result
+                if cache.get(lock_key) is None:
+                    break
+            return fn()
+
+        try:
+            result = fn()
+            cache.set(result_key, result, self.result_timeout)
+            return result
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+
+list_flight = SingleFlight(
+    enabled=COALESCING_CONFIG['ENABLED'],
+    cross_process=COALESCING_CONFIG['CROSS_PROCESS'],
+    cache_alias=COALESCING_CONFIG['CACHE'],
+    lock_timeout=COALESCING_CONFIG['LOCK_TIMEOUT'],
+    result_timeout=COALESCING_CONFIG['RESULT_TIMEOUT'],
+    poll_interval=COALESCING_CONFIG['POLL_INTERVAL'],
+)
@@ -0,0 +1,245 @@
+import os
+import time
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from library.author_cache import AUTHOR_CACHE_CONFIG, AuthorCache, register_author_cache
+from library.models import Author, Book, Job
+
+
+SNAPSHOT_CONFIG = {
+    'ENABLED': False,
+    'ALIAS': 'snapshot',
+    'PATH': os.path.join(settings.BASE_DIR, '.snapshots', 'catalog.sqlite3'),
+    'BATCH_SIZE': 10000,
+    # Seconds after which reads go back to the database, None to serve any snapshot.
+    'MAX_AGE': None,
+    **getattr(settings, 'LIBRARY_SNAPSHOT', {}),
+}
+
+# Full-text tables of the snapshot: their columns and the query filling them.
+FTS_TABLES = {
+    'books_fts': (
+        ('title', 'author_last_name', 'author_first_name'),
+        'SELECT b.id, b.title, COALESCE(a.last_name, \'\'), COALESCE(a.first_name, \'\') '
+        'FROM books b LEFT JOIN authors a ON a.id = b.author_id',
+    ),
+    'authors_fts': (
+        ('first_name', 'last_name'),
+        'SELECT id, first_name, last_name FROM authors',
+    ),
+}
+
+
+class Snapshot:
+    """
+    Read-only SQLite copy of the catalog (the `authors` and `books` tables,
+    with the same schema and indexes, plus trigram full-text tables), to
+    serve catalog reads without a database connection.
+
+    The file is opened through the `alias` database, read-only, immutable and
+    memory-mapped (see the `snapshot` entry of `DATABASES`), by each worker
+    thread. `build` writes a new snapshot next to the current one and
+    renames it over it: open connections keep reading the previous file
+    until `using` notices the new one, closes them and the next query opens
+    the new file. Reads are as fresh as the last build.
+
+    Configured with the `LIBRARY_SNAPSHOT` setting:
+        ENABLED (bool): Whether the viewsets read from the snapshot.
+        ALIAS (str): The database alias of the snapshot.
+        PATH (str): The snapshot file.
+        BATCH_SIZE (int): The rows copied per query when building.
+        MAX_AGE (int): Seconds after which an outdated snapshot is not served, None for no limit.
+
+    Methods:
+        identity(): Returns the identity of the current file, None if there is none.
+        using(): Returns the alias to read from, or None to read from the database.
+        build(progress=None): Builds a new snapshot and swaps it in.
+    """
+
+    def __init__(self, alias, path, enabled=False, batch_size=10000, max_age=None):
+        self.alias = alias
+        self.path = path
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.max_age = max_age
+
+    def identity(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def using(self):
+        if not self.enabled:
+            return None
+        identity = self.identity()
+        if identity is None:
+            return None
+        if self.max_age is not None and time.time() - identity[1] / 1e9 > self.max_age:
+            return None
+
+        # Connections are per thread: each one moves to a new file on its next query.
+        connection = connections[self.alias]
+        if getattr(connection, 'snapshot_identity', None) != identity:
+            connection.close()
+            connection.snapshot_identity = identity
+        return self.alias
+
+    def _open_target(self, path):
+        # A writable connection to the new file, configured like the snapshot alias.
+        source = connections[self.alias]
+        settings_dict = {**source.settings_dict, 'NAME': path, 'OPTIONS': {}}
+        target = type(source)(settings_dict, alias=f'{self.alias}-build')
+        with target.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode = OFF')
+            cursor.execute('PRAGMA synchronous = OFF')
+        return target
+
+    def _copy(self, target, model, progress=None):
+        fields = [field for field in model._meta.concrete_fields if not field.generated]
+        adapters = []
+        for field in fields:
+            internal_type = field.get_internal_type()
+            if internal_type == 'DateTimeField':
+                adapters.append(target.ops.adapt_datetimefield_value)
+            elif internal_type == 'DateField':
+                adapters.append(target.ops.adapt_datefield_value)
+            else:
+                adapters.append(None)
+
+        quote = target.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(field.column) for field in fields),
+            ', '.join(['%s'] * len(fields)))
+        rows = model.objects.order_by('pk').values_list(*[field.attname for field in fields])
+
+        copied, last = 0, None
+        with target.cursor() as cursor:
+            while True:
+                batch = list((rows.filter(pk__gt=last) if last is not None else rows)[
+                    :self.batch_size])
+                if not batch:
+                    break
+                cursor.executemany(sql, [
+                    [value if adapt is None else adapt(value)
+                     for adapt, value in zip(adapters, row)]
+                    for row in batch
+                ])
+                copied += len(batch)
+                last = batch[-1][0]
+                if progress is not None:
+                    progress(model._meta.db_table, copied)
+        return copied
+
+    def build(self, progress=None):
+        """
+        Copies the catalog into a new snapshot and swaps it in atomically.
+
+        The tables are read in primary key order, in one transaction, so that
+        the copy is consistent (with MySQL's default REPEATABLE READ
+        isolation). The rows are inserted before the indexes and the
+        full-text tables are built, then the file is analyzed and renamed over
+        the current snapshot.
+
+        Args:
+            progress (callable): Called with the table and the rows copied so far after
+                each batch.
+
+        Returns:
+            dict: The rows copied per table, the size of the snapshot and the duration.
+        """
+        start = time.perf_counter()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+        target = self._open_target(temporary)
+        try:
+            with target.schema_editor(atomic=False) as editor:
+                editor.create_model(Author)
+                editor.create_model(Book)
+                # The indexes (deferred SQL) are built when the editor exits, after the load.
+                target.set_autocommit(False)
+                with transaction.atomic():
+                    counts = {
+                        model._meta.db_table: self._copy(target, model, progress)
+                        for model in (Author, Book)
+                    }
+                target.commit()
+                target.set_autocommit(True)
+
+            with target.cursor() as cursor:
+                for table, (columns, select) in FTS_TABLES.items():
+                    cursor.execute(
+                        f"CREATE VIRTUAL TABLE {table} USING fts5("
+                        f"{', '.join(columns)}, content='', tokenize='trigram')")
+                    cursor.execute(
+                        f"INSERT INTO {table} (rowid, {', '.join(columns)}) {select}")
+                cursor.execute('CREATE TABLE snapshot_info (name TEXT PRIMARY KEY, value TEXT)')
+                cursor.execute(
+                    'INSERT INTO snapshot_info VALUES (%s, %s)',
+                    ['built_at', timezone.now().isoformat()])
+                cursor.execute('ANALYZE')
+        except BaseException:
+            target.close()
+            os.remove(temporary)
+            raise
+        target.close()
+
+        with open(temporary, 'rb') as file:
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+
+        return {
+            **counts,
+            'size': os.path.getsize(self.path),
+            'duration_s': time.perf_counter() - start,
+        }
+
+
+class SnapshotAuthorCache(AuthorCache):
+    """
+    AuthorCache of the books read from the snapshot: the authors are loaded
+    from the snapshot and dropped when a new snapshot is swapped in.
+    """
+
+    def __init__(self, snapshot, **kwargs):
+        super().__init__(using=snapshot.alias, **kwargs)
+        self.snapshot = snapshot
+
+    def get_version(self):
+        return self.snapshot.identity()
+
+
+def start_snapshot_build(created_by=''):
+    """
+    Queues a 'build_snapshot' job, unless one is already waiting to run.
+
+    Returns:
+        Job: The queued job.
+    """
+    pending = Job.objects.filter(name='build_snapshot', status=Job.PENDING).first()
+    if pending is not None:
+        return pending
+    return Job.objects.enqueue('build_snapshot', created_by=created_by)
+
+
+snapshot = Snapshot(
+    SNAPSHOT_CONFIG['ALIAS'],
+    SNAPSHOT_CONFIG['PATH'],
+    enabled=SNAPSHOT_CONFIG['ENABLED'],
+    batch_size=SNAPSHOT_CONFIG['BATCH_SIZE'],
+    max_age=SNAPSHOT_CONFIG['MAX_AGE'],
+)
+
+snapshot_author_cache = register_author_cache(snapshot.alias, SnapshotAuthorCache(
+    snapshot,
+    max_size=AUTHOR_CACHE_CONFIG['MAX_SIZE'],
+    enabled=AUTHOR_CACHE_CONFIG['ENABLED'],
+))
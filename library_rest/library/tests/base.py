@@ -0,0 +1,62 @@
+from datetime import date
+
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from library.benchmarks.runner import stand_in_user
+from library.models import Author, Book
+from library_rest.throttling import PrincipalRateThrottle
+
+
+class LibraryAPITestMixin:
+    """
+    API test case mixin authenticating as a Keycloak user holding every library role.
+
+    Throttling is disabled, so that the buckets of earlier runs do not leak
+    into the tests.
+
+    Methods:
+        authenticate(roles=BENCHMARK_ROLES): Authenticates the client as a user with `roles`.
+        create_author(**fields): Creates an author with default fields.
+        create_book(**fields): Creates a book with default fields.
+    """
+
+    def setUp(self):
+        super().setUp()
+        throttling = PrincipalRateThrottle.enabled
+        PrincipalRateThrottle.enabled = False
+        self.addCleanup(setattr, PrincipalRateThrottle, 'enabled', throttling)
+        self.user = self.authenticate()
+
+    def authenticate(self, *args, **kwargs):
+        user = stand_in_user(*args, **kwargs)
+        self.client.force_authenticate(user)
+        return user
+
+    def create_author(self, **fields):
+        return Author.objects.create(**{
+            'first_name': 'Italo',
+            'last_name': 'Calvino',
+            'citizenship': 'IT',
+            'date_of_birth': date(1923, 10, 15),
+            **fields,
+        })
+
+    def create_book(self, **fields):
+        return Book.objects.create(**{
+            'title': 'Il barone rampante',
+            'publication_date': date(1957, 6, 1),
+            **fields,
+        })
+
+
+class LibraryAPITestCase(LibraryAPITestMixin, APITestCase):
+    """
+    APITestCase of the library API (see LibraryAPITestMixin).
+    """
+
+
+class LibraryAPITransactionTestCase(LibraryAPITestMixin, APITransactionTestCase):
+    """
+    APITransactionTestCase of the library API (see LibraryAPITestMixin), for
+    tests whose writes must be committed, e.g. to be read by another connection.
+    """
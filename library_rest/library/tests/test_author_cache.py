@@ -0,0 +1,59 @@
+from django.contrib import admin
+from django.test import RequestFactory
+
+from library.admin.author_admin import AuthorAdmin
+from library.author_cache import author_cache
+from library.models import Author, CacheVersion
+from library.tests.base import LibraryAPITestCase
+
+
+class AuthorCacheInvalidationTests(LibraryAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.create_author()
+        author_cache.clear()
+        self.addCleanup(author_cache.clear)
+        # Another process caching the author.
+        self.assertIsNotNone(author_cache.get(self.author.pk))
+
+    def version(self):
+        return CacheVersion.objects.get_version(CacheVersion.AUTHORS)
+
+    def test_admin_bulk_delete_bumps_the_version(self):
+        version = self.version()
+        request = RequestFactory().post('/admin/library/author/')
+        with self.captureOnCommitCallbacks(execute=True):
+            AuthorAdmin(Author, admin.site).delete_queryset(
+                request, Author.objects.filter(pk=self.author.pk))
+
+        self.assertGreater(self.version(), version)
+        self.assertIsNone(author_cache.get(self.author.pk))
+
+        # The deleted author is rejected (400), not accepted and failing on its foreign key.
+        response = self.client.post('/library/books', {
+            'title': 'Palomar', 'author': self.author.pk, 'publication_date': '1983-01-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_update_bumps_the_version(self):
+        version = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Author.objects.filter(pk=self.author.pk).update(last_name='Pavese')
+
+        self.assertGreater(self.version(), version)
+        self.assertEqual(author_cache.get(self.author.pk).last_name, 'Pavese')
+
+    def test_empty_bulk_update_keeps_the_version(self):
+        version = self.version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Author.objects.filter(pk=0).update(last_name='Pavese')
+        self.assertEqual(self.version(), version)
+
+    def test_save_and_delete_bump_the_version(self):
+        for write in (lambda: setattr(self.author, 'last_name', 'Pavese') or self.author.save(),
+                      self.author.delete):
+            version = self.version()
+            with self.captureOnCommitCallbacks(execute=True):
+                write()
+            self.assertGreater(self.version(), version)
@@ -0,0 +1,43 @@
+from unittest import mock
+
+from library.models import Author
+from library.tests.base import LibraryAPITestCase
+from library.views.author_view_set import AuthorViewSet
+from library.views.book_view_set import BookViewSet
+
+
+AUTHOR = {'first_name': 'Elsa', 'last_name': 'Morante', 'citizenship': 'IT'}
+
+
+class BatchViewTests(LibraryAPITestCase):
+
+    def batch(self, *requests):
+        response = self.client.post('/library/batch', {'requests': list(requests)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return [item['status'] for item in response.data['responses']], response.data['responses']
+
+    def test_failing_write_does_not_fail_the_batch(self):
+        author = self.create_author()
+        with mock.patch.object(AuthorViewSet, 'perform_update', side_effect=RuntimeError('boom')), \
+                self.assertLogs('library.views.batch_view', 'ERROR'):
+            statuses, responses = self.batch(
+                {'method': 'POST', 'path': '/library/authors', 'body': AUTHOR},
+                {'method': 'PATCH', 'path': f'/library/authors/{author.pk}',
+                 'body': {'last_name': 'Moravia'}},
+                {'method': 'POST', 'path': '/library/authors',
+                 'body': {**AUTHOR, 'last_name': 'Ginzburg'}},
+            )
+
+        self.assertEqual(statuses, [201, 500, 201])
+        self.assertEqual(responses[1]['body'], {'detail': 'A server error occurred.'})
+        self.assertEqual(Author.objects.filter(first_name='Elsa').count(), 2)
+
+    def test_failing_read_does_not_fail_the_batch(self):
+        with mock.patch.object(BookViewSet, 'get_object', side_effect=RuntimeError('boom')), \
+                self.assertLogs('library.views.batch_view', 'ERROR'):
+            statuses, _ = self.batch(
+                {'method': 'GET', 'path': '/library/books/1'},
+                {'method': 'POST', 'path': '/library/authors', 'body': AUTHOR},
+            )
+
+        self.assertEqual(statuses, [500, 201])
@@ -0,0 +1,170 @@
+import json
+import os
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from library.catalog_import import CatalogImport, Checkpoint, plan_chunks
+from library.models import Author, Book
+
+
+AUTHORS_CSV = """first_name,last_name,citizenship,date_of_birth,date_of_death
+Italo,Calvino,IT,1923-10-15,1985-09-19
+Italo,Calvino,IT,1923-10-15,1985-09-19
+Primo,Levi,IT,not-a-date,
+Natalia,Ginzburg,IT,1916-07-14,1991-10-07
+Elsa,Morante,IT,1912-08-18,1985-11-25
+"""
+
+
+class ImportFilesMixin:
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def write_ndjson(self, name, records):
+        return self.write(name, ''.join(
+            record if isinstance(record, str) else json.dumps(record) + '\n'
+            for record in records))
+
+    def catalog_import(self, **options):
+        return CatalogImport(state_dir=os.path.join(self.directory, 'state'),
+                             workers=1, **options)
+
+
+class PlanChunksTests(ImportFilesMixin, SimpleTestCase):
+
+    def test_csv_chunks_end_at_line_ends(self):
+        path = self.write('books.csv', 'title,publication_date\n' + ''.join(
+            f'Book {number},2001-01-01\n' for number in range(100)))
+        with open(path, 'rb') as file:
+            content = file.read()
+
+        header, chunks = plan_chunks(path, 100)
+
+        self.assertEqual(header, ['title', 'publication_date'])
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(chunks[0][0], len('title,publication_date\n'))
+        self.assertEqual(chunks[-1][1], len(content))
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(content[end - 1:end], b'\n')
+
+    def test_ndjson_has_no_header(self):
+        path = self.write_ndjson('books.ndjson', [{'title': 'Book'}] * 3)
+        self.assertEqual(plan_chunks(path, 1 << 20), (None, [(0, os.path.getsize(path))]))
+
+    def test_csv_without_header(self):
+        with self.assertRaises(ValueError):
+            plan_chunks(self.write('books.csv', ''), 100)
+
+
+class CatalogImportTests(ImportFilesMixin, TestCase):
+
+    def test_round_trip(self):
+        morante = Author.objects.create(
+            first_name='Elsa', last_name='Morante', citizenship='IT',
+            date_of_birth=date(1912, 8, 18))
+        Book.objects.create(title='La storia', author=morante,
+                            publication_date=date(1974, 6, 20))
+        calvino = {'author_last_name': 'Calvino', 'author_first_name': 'Italo',
+                   'author_date_of_birth': '1923-10-15'}
+        authors = self.write('authors.csv', AUTHORS_CSV)
+        books = self.write_ndjson('books.ndjson', [
+            {'title': 'Il barone rampante', 'publication_date': '1957-06-01', **calvino},
+            {'title': 'Il barone rampante', 'publication_date': '1957-06-01', **calvino},
+            {'title': 'Lessico famigliare', 'publication_date': '1963-01-01',
+             'author_last_name': 'Ginzburg', 'author_first_name': 'Natalia',
+             'author_date_of_birth': '1916-07-14'},
+            {'title': 'La storia', 'publication_date': '1974-06-20', 'author_id': morante.pk},
+            {'title': 'Anonimo', 'publication_date': '2001-01-01'},
+            {'title': 'Se questo è un uomo', 'publication_date': '1947-10-11',
+             'author_last_name': 'Levi', 'author_first_name': 'Primo'},
+            'not json\n',
+        ])
+
+        report = self.catalog_import(authors=[authors], books=[books], batch_size=2).run()
+
+        counts = {'rows': 5, 'inserted': 2, 'duplicates': 2, 'rejected': 1, 'processed': 5}
+        self.assertEqual(report['authors'], counts)
+        counts = {'rows': 7, 'inserted': 3, 'duplicates': 2, 'rejected': 2, 'processed': 7}
+        self.assertEqual(report['books'], counts)
+        self.assertEqual(Author.objects.count(), 3)
+        self.assertEqual(
+            sorted(Book.objects.values_list('title', 'author_sort_key')),
+            [('Anonimo', ''), ('Il barone rampante', 'Calvino, Italo'),
+             ('La storia', 'Morante, Elsa'), ('Lessico famigliare', 'Ginzburg, Natalia')])
+
+        with open(report['rejects'], encoding='utf-8') as file:
+            reasons = [json.loads(line)['reason'] for line in file]
+        self.assertEqual(reasons, [
+            "invalid date_of_birth: 'not-a-date'",
+            'unknown author: Levi, Primo (None)',
+            'malformed record',
+        ])
+
+        # Running it again finds every chunk done.
+        report = self.catalog_import(authors=[authors], books=[books], batch_size=2).run()
+        self.assertEqual(report['books']['processed'], 0)
+        self.assertEqual(Book.objects.count(), 4)
+
+    def test_resumes_after_a_batch_committed_without_its_checkpoint(self):
+        books = self.write('books.csv', 'title,publication_date\n' + ''.join(
+            f'Book {number},2001-01-01\n' for number in range(5)))
+        save = Checkpoint.save
+
+        def interrupted_save(checkpoint):
+            if checkpoint.inserted:
+                raise KeyboardInterrupt
+            save(checkpoint)
+
+        with mock.patch.object(Checkpoint, 'save', interrupted_save):
+            with self.assertRaises(KeyboardInterrupt):
+                self.catalog_import(books=[books], batch_size=2, dedupe=False).run()
+        self.assertEqual(Book.objects.count(), 2)
+
+        report = self.catalog_import(books=[books], batch_size=2, dedupe=False).run()
+
+        self.assertEqual(report['books']['inserted'], 3)
+        self.assertEqual(report['books']['duplicates'], 2)
+        self.assertEqual(
+            sorted(Book.objects.values_list('title', flat=True)),
+            [f'Book {number}' for number in range(5)])
+
+
+class DeferredIndexTests(ImportFilesMixin, TransactionTestCase):
+
+    def book_indexes(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Book._meta.db_table)
+        return {index.name for index in Book._meta.indexes} & set(constraints)
+
+    def test_interrupted_import_restores_the_indexes(self):
+        books = self.write('books.csv', 'title,publication_date\nBook,2001-01-01\n')
+        indexes = self.book_indexes()
+        self.assertEqual(len(indexes), 3)
+
+        with mock.patch('library.catalog_import.import_chunk', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.catalog_import(books=[books], defer_indexes=True).run()
+        # Only the (title, author) index used by dedupe is kept during the load.
+        self.assertEqual(len(self.book_indexes()), 1)
+
+        report = self.catalog_import(books=[books], defer_indexes=True).run()
+
+        self.assertEqual(report['books']['inserted'], 1)
+        self.assertEqual(self.book_indexes(), indexes)
+        with open(os.path.join(self.directory, 'state', 'plan.json')) as file:
+            self.assertEqual(json.load(file)['deferred_indexes'], [])
@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from library.models import Author, Book
+from library.tests.base import LibraryAPITestCase
+
+
+class FieldLevelUpdateTests(LibraryAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.create_author()
+        self.book = self.create_book(author=self.author)
+
+    def test_noop_patch_writes_nothing(self):
+        updated_at = Book.objects.get(pk=self.book.pk).updated_at
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f'/library/books/{self.book.pk}', {'title': self.book.title}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if q['sql'].lstrip().upper().startswith('UPDATE')])
+        self.assertEqual(Book.objects.get(pk=self.book.pk).updated_at, updated_at)
+
+    def test_update_fields_hold_the_changed_columns(self):
+        save = Author.save
+        with mock.patch.object(Author, 'save', autospec=True, side_effect=save) as spy:
+            response = self.client.put(f'/library/authors/{self.author.pk}', {
+                'first_name': self.author.first_name,
+                'last_name': 'Pavese',
+                'citizenship': self.author.citizenship,
+                'date_of_birth': '1923-10-15',
+            }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(spy.call_args.kwargs['update_fields']), ['last_name', 'updated_at'])
+        self.assertEqual(Author.objects.get(pk=self.author.pk).last_name, 'Pavese')
+
+
+class ConditionalUpdateTests(LibraryAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = f'/library/authors/{self.create_author().pk}'
+
+    def etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def patch(self, data, **headers):
+        return self.client.patch(self.url, data, format='json', headers=headers)
+
+    def test_patch_without_if_match(self):
+        response = self.patch({'last_name': 'Levi'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['last_name'], 'Levi')
+
+    def test_matching_if_match(self):
+        etag = self.etag()
+        response = self.patch({'last_name': 'Levi'}, if_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response['ETag'], self.etag())
+
+    def test_stale_if_match(self):
+        etag = self.etag()
+        self.assertEqual(self.patch({'last_name': 'Levi'}).status_code, 200)
+
+        response = self.patch({'last_name': 'Sciascia'}, if_match=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(Author.objects.get().last_name, 'Levi')
+
+    def test_weak_etag(self):
+        response = self.patch({'last_name': 'Levi'}, if_match='W/' + self.etag())
+        self.assertEqual(response.status_code, 200)
+
+    def test_wildcard(self):
+        self.assertEqual(self.patch({'last_name': 'Levi'}, if_match='*').status_code, 200)
+
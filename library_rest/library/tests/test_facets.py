@@ -0,0 +1,123 @@
+from datetime import date
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import RequestFactory, TestCase
+
+from library.admin.author_admin import AuthorAdmin
+from library.facets import facets_cache_key
+from library.models import Author, Book, CacheVersion, FacetCount
+from library.tests.base import LibraryAPITestCase
+
+
+class FacetsViewTests(LibraryAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        author = self.create_author()
+        for year in (1947, 1957, 1963):
+            self.create_book(author=author, publication_date=date(year, 1, 1))
+
+    def test_limit_is_clamped(self):
+        for limit, expected in (('-5', 1), ('0', 3), ('1000', 3), ('x', 3)):
+            with self.subTest(limit=limit):
+                response = self.client.get('/library/books/facets', {'limit': limit})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data[FacetCount.DECADE]), expected)
+
+    def test_filtered_limit_is_clamped(self):
+        response = self.client.get(
+            '/library/books/facets', {'limit': '-5', 'year__gte': '1950'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data[FacetCount.DECADE]), 1)
+
+    def test_writes_invalidate_cached_facets(self):
+        params = {'year__gte': '1950'}
+        self.assertEqual(
+            self.client.get('/library/books/facets', params).data[FacetCount.DECADE][0]['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_book(author=Author.objects.get(), publication_date=date(1952, 1, 1))
+
+        self.assertEqual(
+            self.client.get('/library/books/facets', params).data[FacetCount.DECADE][0]['count'], 2)
+
+    def test_cache_key_follows_database_version(self):
+        # Another process bumping the version changes the key, whatever the cache backend.
+        query_params = QueryDict('year__gte=1950')
+        key = facets_cache_key(query_params, 10)
+        cache.clear()
+        CacheVersion.objects.bump(CacheVersion.FACETS)
+        self.assertNotEqual(facets_cache_key(query_params, 10), key)
+
+
+class BulkAuthorWriteTests(LibraryAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.calvino = self.create_author()
+        self.levi = self.create_author(first_name='Primo', last_name='Levi',
+                                       date_of_birth=date(1919, 7, 31))
+        self.create_book(author=self.calvino)
+        self.create_book(author=self.calvino, title='Palomar', publication_date=date(1983, 1, 1))
+        self.create_book(author=self.levi, title='La tregua', publication_date=date(1963, 1, 1))
+
+    def assertRollupsMatchBooks(self):
+        expected = {
+            key: count
+            for key, count in FacetCount.objects.book_deltas(Book.objects.all()).items() if count
+        }
+        self.assertEqual(
+            {(facet, value): count
+             for facet, value, count in FacetCount.objects.values_list('facet', 'value', 'count')},
+            expected)
+
+    def test_queryset_delete(self):
+        Author.objects.filter(pk=self.calvino.pk).delete()
+
+        self.assertEqual(Book.objects.count(), 1)
+        self.assertRollupsMatchBooks()
+
+    def test_admin_bulk_delete(self):
+        request = RequestFactory().post('/admin/library/author/')
+        AuthorAdmin(Author, admin.site).delete_queryset(
+            request, Author.objects.filter(pk=self.levi.pk))
+
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertRollupsMatchBooks()
+
+    def test_queryset_update_of_citizenship(self):
+        # The updated authors no longer match the filter once updated.
+        Author.objects.filter(citizenship='IT', last_name='Calvino').update(citizenship='CU')
+
+        self.assertRollupsMatchBooks()
+        self.assertEqual(
+            FacetCount.objects.get(facet=FacetCount.CITIZENSHIP, value='CU').count, 2)
+
+    def test_queryset_update_of_other_fields(self):
+        Author.objects.update(first_name='Anonimo')
+        self.assertRollupsMatchBooks()
+
+
+class ApplyDeltasTests(TestCase):
+
+    def test_emptied_counters_are_deleted(self):
+        FacetCount.objects.apply_deltas({
+            (FacetCount.DECADE, '1950'): 2,
+            (FacetCount.DECADE, '1960'): 1,
+        })
+        FacetCount.objects.apply_deltas({(FacetCount.DECADE, '1960'): -1})
+
+        self.assertEqual(
+            dict(FacetCount.objects.values_list('value', 'count')), {'1950': 2})
+
+    def test_only_decremented_keys_are_deleted(self):
+        # A counter left at zero by another path is not touched by unrelated deltas.
+        FacetCount.objects.create(facet=FacetCount.AUTHOR, value='7', count=0)
+        FacetCount.objects.apply_deltas({(FacetCount.DECADE, '1950'): 1})
+        FacetCount.objects.apply_deltas({(FacetCount.DECADE, '1950'): -1})
+
+        self.assertEqual(
+            list(FacetCount.objects.values_list('facet', 'value')),
+            [(FacetCount.AUTHOR, '7')])
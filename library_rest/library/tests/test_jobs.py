@@ -0,0 +1,146 @@
+import signal
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+
+from library.jobs import JOBS_CONFIG, JobCancelled, execute, job_handler, retry_delay, setup_worker
+from library.models import Job
+
+
+@job_handler('test_echo')
+def echo_job(job):
+    job.report_progress(1, 1)
+    return job.params
+
+
+class EnqueueMixin:
+
+    def enqueue(self, **fields):
+        job = Job.objects.enqueue('test_echo', {'value': 1}, max_attempts=2)
+        if fields:
+            Job.objects.filter(pk=job.pk).update(**fields)
+            job.refresh_from_db()
+        return job
+
+
+class JobQueueTests(EnqueueMixin, TestCase):
+
+    def test_enqueue_unknown_job(self):
+        with self.assertRaises(KeyError):
+            Job.objects.enqueue('no_such_job')
+
+    def test_claim_takes_the_oldest_runnable_job(self):
+        later = self.enqueue(run_after=timezone.now() + timedelta(hours=1))
+        first = self.enqueue()
+        second = self.enqueue()
+
+        job = Job.objects.claim('worker-1')
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.RUNNING, 1, 'worker-1'))
+        self.assertIsNotNone(job.heartbeat_at)
+
+        self.assertEqual(Job.objects.claim('worker-2').pk, second.pk)
+        # The delayed job is not runnable yet.
+        self.assertIsNone(Job.objects.claim('worker-3'))
+        self.assertEqual(Job.objects.get(pk=later.pk).status, Job.PENDING)
+
+    def test_release_does_not_count_the_attempt(self):
+        self.enqueue()
+        job = Job.objects.claim('worker-1')
+        job.release()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.PENDING, 0, ''))
+
+    def test_failed_attempts_are_retried_with_backoff(self):
+        self.enqueue()
+        job = Job.objects.claim('worker-1')
+        before = timezone.now()
+        job.mark_failed('boom')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (Job.PENDING, 'boom'))
+        delay = (job.run_after - before).total_seconds()
+        self.assertGreaterEqual(delay, JOBS_CONFIG['RETRY_DELAY'] * 0.5 - 1)
+        self.assertLessEqual(delay, JOBS_CONFIG['RETRY_DELAY'] + 1)
+
+        # The last attempt fails for good.
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        job = Job.objects.claim('worker-1')
+        job.mark_failed('boom again')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_retry_delay_is_capped(self):
+        with mock.patch('library.jobs.random.uniform', return_value=1.0):
+            self.assertEqual(retry_delay(1), JOBS_CONFIG['RETRY_DELAY'])
+            self.assertEqual(retry_delay(2), JOBS_CONFIG['RETRY_DELAY'] * 2)
+            self.assertEqual(retry_delay(50), JOBS_CONFIG['MAX_RETRY_DELAY'])
+
+    def test_requeue_stale(self):
+        stale = timezone.now() - timedelta(seconds=JOBS_CONFIG['STALE_TIMEOUT'] + 1)
+        retried = self.enqueue(status=Job.RUNNING, attempts=1, heartbeat_at=stale, locked_by='w')
+        exhausted = self.enqueue(status=Job.RUNNING, attempts=2, heartbeat_at=stale, locked_by='w')
+        alive = self.enqueue(
+            status=Job.RUNNING, attempts=1, heartbeat_at=timezone.now(), locked_by='w')
+
+        self.assertEqual(Job.objects.requeue_stale(), 2)
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[retried.pk], Job.PENDING)
+        self.assertEqual(statuses[exhausted.pk], Job.FAILED)
+        self.assertEqual(statuses[alive.pk], Job.RUNNING)
+
+    def test_heartbeat(self):
+        old = timezone.now() - timedelta(minutes=1)
+        mine = self.enqueue(status=Job.RUNNING, heartbeat_at=old, locked_by='worker-1')
+        other = self.enqueue(status=Job.RUNNING, heartbeat_at=old, locked_by='worker-2')
+
+        self.assertEqual(Job.objects.heartbeat('worker-1'), 1)
+        self.assertGreater(Job.objects.get(pk=mine.pk).heartbeat_at, old)
+        self.assertEqual(Job.objects.get(pk=other.pk).heartbeat_at, old)
+
+    def test_cancel_pending_job(self):
+        job = self.enqueue()
+        job.cancel()
+        self.assertEqual(job.status, Job.CANCELLED)
+        self.assertIsNone(Job.objects.claim('worker-1'))
+
+    def test_cancelled_job_is_not_retried(self):
+        self.enqueue()
+        job = Job.objects.claim('worker-1')
+        job.cancel()
+        job.mark_failed('boom')
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.FAILED)
+
+
+class JobExecutionTests(EnqueueMixin, TransactionTestCase):
+    """
+    `execute` closes the connection when it is done, as in a worker process,
+    which a TestCase transaction would not survive.
+    """
+
+    def test_execute_records_the_result(self):
+        self.enqueue()
+        job = Job.objects.claim('worker-1')
+        self.assertEqual(execute(job.pk), Job.DONE)
+        job.refresh_from_db()
+        self.assertEqual((job.result, job.progress, job.progress_total), ({'value': 1}, 1, 1))
+
+    def test_cancel_running_job(self):
+        self.enqueue()
+        job = Job.objects.claim('worker-1')
+        Job.objects.get(pk=job.pk).cancel()
+
+        with self.assertRaises(JobCancelled):
+            job.report_progress(1)
+        self.assertEqual(execute(job.pk), Job.CANCELLED)
+
+
+class SetupWorkerTests(SimpleTestCase):
+
+    def test_workers_ignore_sigint(self):
+        handler = signal.getsignal(signal.SIGINT)
+        self.addCleanup(signal.signal, signal.SIGINT, handler)
+        setup_worker()
+        self.assertIs(signal.getsignal(signal.SIGINT), signal.SIG_IGN)
@@ -0,0 +1,91 @@
+from django.contrib.auth.models import User
+
+from library.models import Book
+from library.tests.base import LibraryAPITestCase, LibraryAPITransactionTestCase
+from library_rest.permissions import ROLES_ATTR
+
+
+class CountingTokenInfo(dict):
+    """
+    Token payload counting the reads of its realm roles.
+    """
+
+    reads = 0
+
+    def __getitem__(self, key):
+        if key == 'realm_access':
+            self.reads += 1
+        return super().__getitem__(key)
+
+
+class BookFixtureMixin:
+
+    def setUp(self):
+        super().setUp()
+        self.book = self.create_book(author=self.create_author())
+        self.url = f'/library/books/{self.book.pk}'
+        self.data = {'title': 'Palomar', 'publication_date': '1983-01-01',
+                     'author': self.book.author_id}
+
+
+class KeycloakRolePermissionTests(BookFixtureMixin, LibraryAPITestCase):
+
+    def test_allowed(self):
+        self.authenticate(roles=['view-books'])
+        self.assertEqual(self.client.get('/library/books').status_code, 200)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_forbidden_before_the_body_is_parsed(self):
+        self.authenticate(roles=['view-books'])
+        response = self.client.post(
+            '/library/books', '{not json', content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_updates_require_the_write_role(self):
+        self.authenticate(roles=['view-books'])
+        self.assertEqual(self.client.patch(self.url, self.data, format='json').status_code, 403)
+        self.assertEqual(self.client.put(self.url, self.data, format='json').status_code, 403)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).title, 'Il barone rampante')
+
+        self.authenticate(roles=['create-book'])
+        self.assertEqual(self.client.put(self.url, self.data, format='json').status_code, 200)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).title, 'Palomar')
+        response = self.client.patch(self.url, {'title': 'Marcovaldo'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).title, 'Marcovaldo')
+
+    def test_user_without_token(self):
+        self.client.force_authenticate(User(pk=1, username='staff'))
+        response = self.client.get('/library/books')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['detail'], 'Invalid token.')
+
+    def test_anonymous(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/library/books').status_code, 403)
+
+
+class BatchPermissionTests(BookFixtureMixin, LibraryAPITransactionTestCase):
+    """
+    Batches, whose reads run on other threads (and connections) than the test.
+    """
+
+    def test_each_sub_request_is_checked(self):
+        user = self.authenticate(roles=['view-books'])
+        user.token_info = CountingTokenInfo(user.token_info)
+
+        response = self.client.post('/library/batch', {'requests': [
+            {'method': 'GET', 'path': '/library/books'},
+            {'method': 'GET', 'path': self.url},
+            {'method': 'POST', 'path': '/library/books', 'body': self.data},
+            {'method': 'PATCH', 'path': self.url, 'body': {'title': 'Palomar'}},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item['status'] for item in response.data['responses']], [200, 200, 403, 403])
+        self.assertEqual(Book.objects.get().title, 'Il barone rampante')
+        # The roles are resolved once for the whole batch.
+        self.assertEqual(user.token_info.reads, 1)
+        self.assertEqual(getattr(user, ROLES_ATTR), frozenset(['view-books']))
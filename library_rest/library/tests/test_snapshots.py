@@ -0,0 +1,106 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+from library.author_cache import author_cache
+from library.models import Book
+from library.snapshots import snapshot, snapshot_author_cache
+from library.tests.base import LibraryAPITransactionTestCase
+
+
+class SnapshotReadTests(LibraryAPITransactionTestCase):
+    """
+    Reads served from a snapshot built into a temporary file.
+    """
+
+    databases = {'default', 'snapshot'}
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'catalog.sqlite3')
+        for name, value in (('path', path), ('enabled', True)):
+            patcher = mock.patch.object(snapshot, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Registered last, so that it runs first: the test database of the alias is
+        # in memory and must not be flushed through the read-only snapshot.
+        connection = connections[snapshot.alias]
+        self.addCleanup(connection.settings_dict.__setitem__, 'NAME',
+                        connection.settings_dict['NAME'])
+        self.addCleanup(connection.close)
+        connection.settings_dict['NAME'] = f'{Path(path).as_uri()}?mode=ro&immutable=1'
+        connection.close()
+
+        for cache in (author_cache, snapshot_author_cache):
+            cache.clear()
+            self.addCleanup(cache.clear)
+
+        self.author = self.create_author()
+        self.book = self.create_book(author=self.author)
+        snapshot.build()
+
+    def list_books(self, **params):
+        response = self.client.get('/library/books', params,
+                                   headers={'accept': 'application/json'})
+        self.assertEqual(response.status_code, 200)
+        return [(book['title'], book['author_name']) for book in response.json()['results']]
+
+    def test_list_reads_the_snapshot(self):
+        Book.objects.filter(pk=self.book.pk).update(title='Il visconte dimezzato')
+
+        self.assertEqual(self.list_books(), [('Il barone rampante', 'Calvino, Italo')])
+
+        snapshot.build()
+        self.assertEqual(self.list_books(), [('Il visconte dimezzato', 'Calvino, Italo')])
+
+    def test_search_uses_the_full_text_table(self):
+        self.create_book(title='Palomar')
+        snapshot.build()
+
+        with mock.patch('library.filters.RawSQL', wraps=RawSQL) as raw_sql:
+            self.assertEqual(self.list_books(search='barone'),
+                             [('Il barone rampante', 'Calvino, Italo')])
+            self.assertEqual(self.list_books(search='calvino'),
+                             [('Il barone rampante', 'Calvino, Italo')])
+        self.assertEqual(raw_sql.call_count, 2)
+
+        # Terms shorter than a trigram fall back to LIKE.
+        self.assertEqual(self.list_books(search='om'), [('Palomar', None)])
+
+    def test_retrieve_and_conditional_updates_use_the_database(self):
+        url = f'/library/books/{self.book.pk}'
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.patch(url, {'title': 'Il cavaliere inesistente'},
+                                     format='json', headers={'if_match': etag})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['title'], 'Il cavaliere inesistente')
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.client.patch(url, {'title': 'Palomar'},
+                                     format='json', headers={'if_match': response['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).title, 'Palomar')
+
+    def test_author_cache_per_database(self):
+        self.assertEqual(self.list_books(), [('Il barone rampante', 'Calvino, Italo')])
+
+        self.author.last_name = 'Pavese'
+        self.author.save()
+
+        # Books read from the snapshot name the author it holds, until it is rebuilt.
+        self.assertEqual(self.list_books(), [('Il barone rampante', 'Calvino, Italo')])
+        response = self.client.get(f'/library/books/{self.book.pk}')
+        self.assertEqual(response.data['author_name'], 'Pavese, Italo')
+
+        snapshot.build()
+        self.assertEqual(self.list_books(), [('Il barone rampante', 'Pavese, Italo')])
@@ -5,7 +5,9 @@ from . import views
 router = routers.DefaultRouter(trailing_slash=False)
 router.register(r'books', views.BookViewSet)
 router.register(r'authors', views.AuthorViewSet)
+router.register(r'jobs', views.JobViewSet)
 
 urlpatterns = [
+    path('batch', views.BatchView.as_view(), name='batch'),
     path('', include(router.urls)),
 ]
@@ -1,2 +1,4 @@
 from .author_view_set import AuthorViewSet
 from .book_view_set import BookViewSet
+from .batch_view import BatchView
+from .job_view_set import JobViewSet
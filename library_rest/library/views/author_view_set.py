@@ -1,25 +1,39 @@
 # file: library_rest/library/views/author_view_set.py
 
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.response import Response
 from library.models import Author
-from library.serializers import AuthorSerializer
+from library.serializers import AuthorSerializer, JobSerializer
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.filters import OrderingFilter
 
+from library.deletions import delete_author, start_author_deletion
+from library.filters import AuthorFilter, SnapshotSearchFilter
 from library.pagination import LibraryPagination
+from library.views.conditional_update_mixin import ConditionalUpdateMixin
+from library.views.snapshot_read_mixin import SnapshotReadMixin
 from library_rest.decorators import keycloak_role_required
 
 
-class AuthorViewSet(viewsets.ModelViewSet):
+class AuthorViewSet(SnapshotReadMixin, ConditionalUpdateMixin, viewsets.ModelViewSet):
     """
     A viewset for viewing and editing Author instances.
 
     This viewset provides the following features:
     - Lists, retrieves, creates, updates, and deletes Author objects.
-    - Supports filtering by 'first_name', 'last_name', and 'citizenship'.
+    - Supports filtering by 'first_name', 'last_name', and 'citizenship', and by birth and death
+      date ranges ('date_of_birth__gte', 'date_of_birth__lte', 'date_of_death__gte',
+      'date_of_death__lte'), see AuthorFilter.
     - Allows searching by 'first_name' and 'last_name'.
     - Supports ordering by 'first_name' and 'last_name', with default ordering by 'last_name' then 'first_name'.
     - Uses a custom pagination class (LibraryPagination).
+    - Retrieve and update responses carry an ETag; updates honour `If-Match` (see
+      ConditionalUpdateMixin) and write only the changed columns.
+    - Deletes the books of an author in bounded batches; with `Prefer: respond-async` the
+      deletion runs as a background job, whose status can be polled at `library/jobs/<id>`.
+    - With `LIBRARY_SNAPSHOT['ENABLED']`, lists read from the local catalog snapshot
+      and search it through its 'authors_fts' full-text table (see SnapshotReadMixin).
 
     Attributes:
         queryset (QuerySet): The queryset of Author objects.
@@ -28,8 +42,9 @@ class AuthorViewSet(viewsets.ModelViewSet):
         search_fields (list): Fields to enable search functionality.
         ordering_fields (list): Fields that can be used for ordering results.
         ordering (list): Default ordering for the queryset.
-        filterset_fields (list): Fields that can be used for filtering results.
+        filterset_class (FilterSet): The FilterSet defining the available filters.
         pagination_class (Pagination): The pagination class to use for paginating results.
+        snapshot_search_table (str): The full-text table searched on the snapshot.
 
     Methods:
         list(request, *args, **kwargs): Returns a paginated list of authors.
@@ -43,13 +58,14 @@ class AuthorViewSet(viewsets.ModelViewSet):
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
 
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, SnapshotSearchFilter]
 
     search_fields = ['first_name', 'last_name']
     ordering_fields = ['first_name', 'last_name']
     ordering = ['last_name', 'first_name']
-    filterset_fields = ['first_name', 'last_name', 'citizenship']
+    filterset_class = AuthorFilter
     pagination_class = LibraryPagination
+    snapshot_search_table = 'authors_fts'
 
     @keycloak_role_required("view-books")
     def list(self, request):
@@ -102,7 +118,7 @@ class AuthorViewSet(viewsets.ModelViewSet):
         return super().create(request)
 
     @keycloak_role_required("create-author")
-    def update(self, request, pk=None):
+    def update(self, request, pk=None, **kwargs):
         """
         Updates an existing book instance.
 
@@ -110,15 +126,27 @@ class AuthorViewSet(viewsets.ModelViewSet):
         has the "create-author" role via the `keycloak_role_required` decorator. If the user
         has the required role, it updates the specified book; otherwise, access is denied.
 
+        Only the changed columns are written and a request changing nothing writes nothing.
+        With an `If-Match` header the update is applied only if the instance has not been
+        modified since the ETag was issued; otherwise a 412 response is returned.
+
         Args:
           request: The HTTP request object containing the updated book data.
           pk: The primary key of the book instance to update.
+          **kwargs: `partial=True` when called by `partial_update`.
 
         Returns:
           Response: A DRF Response object containing the serialized book details or an error message.
         """
-        return super().update(request, pk)
-
+        return super().update(request, pk, **kwargs)
+
+    @extend_schema(
+        parameters=[OpenApiParameter(
+            'Prefer', str, OpenApiParameter.HEADER,
+            description="'respond-async' queues a job deleting the author and answers "
+                        "202 with the job.")],
+        responses={204: None, 202: JobSerializer}
+    )
     @keycloak_role_required("create-author")
     def destroy(self, request, pk=None):
         """
@@ -128,6 +156,10 @@ class AuthorViewSet(viewsets.ModelViewSet):
         has the "create-author" role via the `keycloak_role_required` decorator. If the user
         has the required role, it deletes the specified book; otherwise, access is denied.
 
+        The books of the author are deleted in bounded batches (see
+        `Author.delete_in_batches`). When the request carries `Prefer: respond-async`,
+        a 'delete_author' job is queued instead and the 202 response points to the job.
+
         Args:
           request: The HTTP request object.
           pk: The primary key of the book instance to delete.
@@ -135,7 +167,20 @@ class AuthorViewSet(viewsets.ModelViewSet):
         Returns:
           Response: A DRF Response object indicating success or failure of the deletion.
         """
-        return super().destroy(request, pk)
+        if 'respond-async' not in request.headers.get('Prefer', ''):
+            return super().destroy(request, pk)
+
+        job = start_author_deletion(self.get_object(), request.user.username)
+        serializer = JobSerializer(job, context={'request': request})
+        return Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': serializer.data['url'],
+                     'Preference-Applied': 'respond-async'},
+        )
+
+    def perform_destroy(self, instance):
+        delete_author(instance)
 
     @keycloak_role_required("create-author")
     def partial_update(self, request, pk=None):
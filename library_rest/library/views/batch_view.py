@@ -0,0 +1,188 @@
+# file: library_rest/library/views/batch_view.py
+
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from library.serializers.batch_serializer import (
+    BatchRequestSerializer, BatchResponseSerializer
+)
+from library.views.author_view_set import AuthorViewSet
+from library.views.book_view_set import BookViewSet
+from library.views.job_view_set import JobViewSet
+
+
+BATCH_CONFIG = {
+    'MAX_REQUESTS': 20,
+    'MAX_WORKERS': 4,
+    **getattr(settings, 'LIBRARY_BATCH', {}),
+}
+
+# Viewsets reachable through the batch endpoint: the `library` router.
+BATCH_VIEWSETS = (BookViewSet, AuthorViewSet, JobViewSet)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+FORWARDED_HEADERS = ('ETag', 'Location', 'Retry-After')
+
+# Request metadata that describes the outer request body, not the sub-requests.
+BODY_META = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_CONTENT_TYPE',
+             'HTTP_CONTENT_LENGTH', 'HTTP_IF_MATCH', 'HTTP_IF_NONE_MATCH')
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(
+    max_workers=BATCH_CONFIG['MAX_WORKERS'], thread_name_prefix='library-batch')
+
+
+class BatchView(APIView):
+    """
+    Dispatches several requests against the `library` router in one round trip.
+
+    The batch is authenticated once; each sub-request then runs through its
+    viewset as the same user, so the role every action declares with
+    `keycloak_role_required` is still checked, against the role set resolved
+    once for the batch (see library_rest.permissions.get_realm_roles).
+    Consecutive read requests (GET, HEAD, OPTIONS) run concurrently in a
+    thread pool; write requests run one at a time, in order, after every
+    request that precedes them. Pool threads keep their
+    database connections as long as `CONN_MAX_AGE` allows. A sub-request
+    raising an unexpected exception gets a 500 response of its own; the
+    other sub-requests are still answered.
+
+    The batch itself is not throttled: each sub-request takes a token from
+    the bucket of its own scope (see library_rest.throttling).
+
+    Attributes:
+        max_requests (int): The maximum number of sub-requests per batch.
+        throttle_classes (list): Empty, the sub-requests are throttled.
+
+    Methods:
+        post(request): Dispatches the sub-requests and returns all the responses.
+    """
+
+    max_requests = BATCH_CONFIG['MAX_REQUESTS']
+    throttle_classes = []
+
+    def _build_request(self, request, sub_request):
+        url = urlsplit(sub_request['path'])
+        payload = b''
+        if 'body' in sub_request:
+            payload = json.dumps(sub_request['body']).encode()
+
+        environ = {
+            key: value for key, value in request.META.items()
+            if key not in BODY_META and not key.startswith('wsgi.')
+        }
+        environ.update({
+            'REQUEST_METHOD': sub_request['method'],
+            'PATH_INFO': url.path,
+            'QUERY_STRING': url.query,
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(payload)),
+            'HTTP_ACCEPT': 'application/json',
+            'wsgi.input': io.BytesIO(payload),
+            'wsgi.url_scheme': request.scheme,
+        })
+
+        django_request = WSGIRequest(environ)
+        # Authenticate the sub-request as the user of the batch.
+        django_request._force_auth_user = request.user
+        django_request._force_auth_token = request.auth
+        return django_request
+
+    def _dispatch(self, request, sub_request):
+        try:
+            match = resolve(urlsplit(sub_request['path']).path)
+        except Resolver404:
+            return status.HTTP_404_NOT_FOUND, {}, {'detail': 'Not found.'}
+
+        if getattr(match.func, 'cls', None) not in BATCH_VIEWSETS:
+            return status.HTTP_400_BAD_REQUEST, {}, {
+                'detail': 'Only library endpoints can be batched.'}
+
+        try:
+            response = match.func(
+                self._build_request(request, sub_request), *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        except Exception:
+            # Only this sub-request fails: the others (and their committed writes) are answered.
+            logger.exception('Batch sub-request %s %s failed',
+                             sub_request['method'], sub_request['path'])
+            return status.HTTP_500_INTERNAL_SERVER_ERROR, {}, {
+                'detail': 'A server error occurred.'}
+
+        headers = {
+            name: response[name] for name in FORWARDED_HEADERS if response.has_header(name)
+        }
+        if hasattr(response, 'data'):
+            body = response.data
+        elif response.content:
+            body = json.loads(response.content)
+        else:
+            body = None
+        return response.status_code, headers, body
+
+    def _dispatch_in_thread(self, request, sub_request):
+        try:
+            return self._dispatch(request, sub_request)
+        finally:
+            close_old_connections()
+
+    @extend_schema(request=BatchRequestSerializer, responses=BatchResponseSerializer)
+    def post(self, request):
+        """
+        Dispatches a batch of requests.
+
+        Args:
+          request: The HTTP request object, whose body lists the sub-requests.
+
+        Returns:
+          Response: A DRF Response object with one response per sub-request, in order.
+        """
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        sub_requests = serializer.validated_data['requests']
+
+        if len(sub_requests) > self.max_requests:
+            raise ValidationError({'requests': [
+                f'A batch can contain at most {self.max_requests} requests.']})
+
+        results = [None] * len(sub_requests)
+        pending = []
+
+        def wait_pending():
+            for index, future in pending:
+                results[index] = future.result()
+            pending.clear()
+
+        for index, sub_request in enumerate(sub_requests):
+            if sub_request['method'] in SAFE_METHODS:
+                pending.append((index, executor.submit(
+                    self._dispatch_in_thread, request, sub_request)))
+            else:
+                wait_pending()
+                results[index] = self._dispatch(request, sub_request)
+        wait_pending()
+
+        responses = []
+        for sub_request, (status_code, headers, body) in zip(sub_requests, results):
+            response = {'status': status_code, 'headers': headers, 'body': body}
+            if 'id' in sub_request:
+                response['id'] = sub_request['id']
+            responses.append(response)
+
+        return Response({'responses': responses})
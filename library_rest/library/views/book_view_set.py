@@ -1,36 +1,60 @@
 # file: library_rest/library/views/book_view_set.py
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from library.models.book import Book
 from library.serializers.book_serializer import BookSerializer
+from library.serializers.book_bulk_update_serializer import (
+    BookBulkUpdateSerializer, BookBulkUpdateResultSerializer)
+from library.serializers.facets_serializer import FacetsSerializer
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
+from library.bulk_updates import update_books, update_matching_books
+from library.facets import get_facets
+from library.filters import BookFilter, LibraryOrderingFilter, SnapshotSearchFilter
 from library.pagination import LibraryPagination
+from library.views.coalesced_list_mixin import CoalescedListMixin
+from library.views.conditional_update_mixin import ConditionalUpdateMixin
+from library.views.snapshot_read_mixin import SnapshotReadMixin
 from library_rest.decorators import keycloak_role_required
 
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(SnapshotReadMixin, CoalescedListMixin, ConditionalUpdateMixin,
+                  viewsets.ModelViewSet):
     """
     A viewset for viewing and editing Book instances.
 
     This viewset provides the following features:
     - List, retrieve, create, update, and delete operations for Book objects.
-    - Filtering by 'title', 'author', and 'publication_date'.
+    - Filtering by 'title', 'author', and 'publication_date', plus publication date ranges
+      ('publication_date__gte', 'publication_date__lte'), year ('year') and year ranges
+      ('year__gte', 'year__lte'), see BookFilter.
     - Searching by 'title', 'author__last_name', and 'author__first_name'.
     - Ordering by 'title', 'author', and 'publication_date' (default ordering by 'title').
+      'author' (and its alias 'author_name') orders by the author display name through the
+      indexed `author_sort_key` column, without joining the authors table.
     - Pagination using the custom LibraryPagination class.
     - Access to endpoints is restricted by Keycloak roles.
+    - Retrieve and update responses carry an ETag; updates honour `If-Match` (see
+      ConditionalUpdateMixin) and write only the changed columns.
+    - Bulk updates of many books in one request ('bulk-update').
+    - Concurrent identical list requests are computed once (see CoalescedListMixin).
+    - With `LIBRARY_SNAPSHOT['ENABLED']`, lists read from the local catalog snapshot
+      and search it through its 'books_fts' full-text table (see SnapshotReadMixin).
 
     Attributes:
       queryset (QuerySet): The queryset of all Book objects.
       serializer_class (Serializer): The serializer class for Book objects.
       filter_backends (list): The list of filter backends for filtering, searching, and ordering.
-      filterset_fields (list): Fields available for filtering.
+      filterset_class (FilterSet): The FilterSet defining the available filters.
       search_fields (list): Fields available for search.
       ordering_fields (list): Fields available for ordering.
       ordering (list): Default ordering.
+      ordering_aliases (dict): Ordering terms mapped to the columns they sort by.
       pagination_class (Pagination): The pagination class used for paginating results.
+      snapshot_search_table (str): The full-text table searched on the snapshot.
 
     Methods:
       list(request, *args, **kwargs): Returns a paginated list of books, restricted by 'view-books' role.
@@ -39,16 +63,24 @@ class BookViewSet(viewsets.ModelViewSet):
       update(request, pk=None, *args, **kwargs): Updates a book, restricted by 'create-book' role.
       destroy(request, pk=None, *args, **kwargs): Deletes a book, restricted by 'create-book' role.
       partial_update(request, pk=None, *args, **kwargs): Partially updates a book, restricted by 'create-book' role.
+      facets(request): Returns facet counts for the current filter/search, restricted by 'view-books' role.
+      bulk_update(request): Updates many books at once, restricted by 'create-book' role.
     """
 
     queryset = Book.objects.all()
     serializer_class = BookSerializer
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
-    filterset_fields = ['title', 'author', 'publication_date']
+    filter_backends = [DjangoFilterBackend,
+                       LibraryOrderingFilter, SnapshotSearchFilter]
+    filterset_class = BookFilter
     search_fields = ['title', 'author__last_name', 'author__first_name']
-    ordering_fields = ['title', 'author', 'publication_date']
+    ordering_fields = ['title', 'author', 'author_name', 'publication_date']
     ordering = ['title']
+    ordering_aliases = {
+        'author': ('author_sort_key', 'id'),
+        'author_name': ('author_sort_key', 'id'),
+    }
     pagination_class = LibraryPagination
+    snapshot_search_table = 'books_fts'
 
     @keycloak_role_required("view-books")
     def list(self, request):
@@ -103,7 +135,7 @@ class BookViewSet(viewsets.ModelViewSet):
         return super().create(request)
 
     @keycloak_role_required("create-book")
-    def update(self, request, pk=None):
+    def update(self, request, pk=None, **kwargs):
         """
         Updates an existing book instance.
 
@@ -111,14 +143,19 @@ class BookViewSet(viewsets.ModelViewSet):
         has the "create-book" role via the `keycloak_role_required` decorator. If the user
         has the required role, it updates the specified book; otherwise, access is denied.
 
+        Only the changed columns are written and a request changing nothing writes nothing.
+        With an `If-Match` header the update is applied only if the instance has not been
+        modified since the ETag was issued; otherwise a 412 response is returned.
+
         Args:
           request: The HTTP request object containing the updated book data.
           pk: The primary key of the book instance to update.
+          **kwargs: `partial=True` when called by `partial_update`.
 
         Returns:
           Response: A DRF Response object containing the serialized book details or an error message.
         """
-        return super().update(request, pk)
+        return super().update(request, pk, **kwargs)
 
     @keycloak_role_required("create-book")
     def destroy(self, request, pk=None):
@@ -155,3 +192,63 @@ class BookViewSet(viewsets.ModelViewSet):
           Response: A DRF Response object containing the serialized book details or an error message.
         """
         return super().partial_update(request, pk)
+
+    @extend_schema(
+        parameters=[OpenApiParameter(
+            'limit', int, description='Maximum number of values per facet.')],
+        responses=FacetsSerializer
+    )
+    @action(detail=False, methods=['get'])
+    @keycloak_role_required("view-books")
+    def facets(self, request):
+        """
+        Returns facet counts (books per decade, per author citizenship and per author).
+
+        The same filter and search parameters accepted by `list` narrow the counted
+        books. Unfiltered counts are read from the precomputed rollup tables,
+        filtered ones are computed with bounded aggregate queries and cached per
+        filter key.
+
+        Args:
+          request: The HTTP request object.
+
+        Returns:
+          Response: A DRF Response object containing the facet counts.
+        """
+        try:
+            limit = int(request.query_params.get('limit', 0))
+        except ValueError:
+            limit = 0
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(get_facets(queryset, request.query_params, limit))
+
+    @extend_schema(request=BookBulkUpdateSerializer, responses=BookBulkUpdateResultSerializer)
+    @action(detail=False, methods=['post'], url_path='bulk-update')
+    @keycloak_role_required("create-book")
+    def bulk_update(self, request):
+        """
+        Updates many books in one request.
+
+        The body either assigns the `set` fields to every book matching `filter` (the
+        filters accepted by `list`), with a single UPDATE statement, or applies a list of
+        per-book `changes`, written with batched bulk updates. The role is checked once
+        for the whole request, and the facet rollups and the cached facets are refreshed
+        once for all the updated books.
+
+        Args:
+          request: The HTTP request object containing the bulk update.
+
+        Returns:
+          Response: A DRF Response object containing the number of matched and updated
+          books and the ids of `changes` matching no book.
+        """
+        serializer = BookBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if 'changes' in data:
+            result = update_books(data['changes'])
+        else:
+            result = update_matching_books(data['filter'], data['set'])
+        return Response(BookBulkUpdateResultSerializer(result).data)
@@ -0,0 +1,60 @@
+# file: library_rest/library/views/coalesced_list_mixin.py
+
+from django.http import HttpResponse
+
+from library.singleflight import list_flight
+from library_rest.permissions import get_realm_roles
+
+
+class CoalescedListMixin:
+    """
+    ViewSet mixin coalescing concurrent identical `list` requests.
+
+    During traffic spikes many workers run the same list query (COUNT
+    included) at once. With this mixin the requests of a process that share
+    the coalescing key (see `get_coalescing_key`: the normalized query
+    parameters, the host and the role set of the caller) while one of them
+    is being computed wait for it and receive its rendered bytes, so the
+    queries and the serialization run once. See SingleFlight for the
+    optional coalescing across processes.
+
+    Only responses of non-HTML renderers are coalesced: the browsable API
+    renders user-specific content.
+
+    Attributes:
+        singleflight (SingleFlight): The SingleFlight coalescing the requests.
+
+    Methods:
+        get_coalescing_key(request): Returns the key of identical requests, or None to skip
+            coalescing.
+    """
+
+    singleflight = list_flight
+
+    def get_coalescing_key(self, request):
+        if not self.singleflight.enabled:
+            return None
+        if getattr(request, 'accepted_media_type', '').startswith('text/html'):
+            return None
+
+        roles = sorted(get_realm_roles(request.user) or ())
+        params = sorted(request.query_params.lists())
+        return self.singleflight.make_key(
+            type(self).__name__, request.scheme, request.get_host(), request.path,
+            request.accepted_media_type, params, roles)
+
+    def _render_list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.accepted_renderer = request.accepted_renderer
+        response.accepted_media_type = request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        return response.status_code, response.rendered_content, response['Content-Type']
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_coalescing_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+
+        status_code, content, content_type = self.singleflight.do(
+            key, lambda: self._render_list(request, *args, **kwargs))
+        return HttpResponse(content, status=status_code, content_type=content_type)
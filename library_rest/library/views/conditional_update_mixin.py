@@ -0,0 +1,82 @@
+# file: library_rest/library/views/conditional_update_mixin.py
+
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource has been modified since it was read.'
+    default_code = 'precondition_failed'
+
+
+class ConditionalUpdateMixin:
+    """
+    ViewSet mixin adding optimistic concurrency control to updates.
+
+    `retrieve` and `update` responses carry an ETag derived from the
+    `etag_field` (`updated_at`) of the object. A PUT or PATCH sending that
+    ETag in `If-Match` is only applied if the object has not been modified
+    since: the ETag is checked against the loaded object and, when the update
+    changes something, again under a row lock right before the UPDATE, so a
+    concurrent write results in 412 Precondition Failed instead of being
+    silently overwritten. Requests without `If-Match` keep the
+    last-write-wins behaviour. Weak ETags (`W/"..."`, as produced by the
+    compression middleware) are accepted.
+
+    Attributes:
+        etag_field (str): The model field used as the version of the object.
+
+    Methods:
+        get_etag(instance): Returns the ETag of `instance`.
+        check_if_match(instance): Raises PreconditionFailed if `If-Match` does not match `instance`.
+    """
+
+    etag_field = 'updated_at'
+
+    def get_etag(self, instance):
+        value = getattr(instance, self.etag_field)
+        return '"{:x}"'.format(int(value.timestamp() * 1_000_000))
+
+    def _etag_response(self, instance, data):
+        response = Response(data)
+        response['ETag'] = self.get_etag(instance)
+        return response
+
+    def check_if_match(self, instance):
+        header = self.request.headers.get('If-Match')
+        if header is None:
+            return
+        etags = [etag.removeprefix('W/') for etag in parse_etags(header)]
+        if '*' not in etags and self.get_etag(instance) not in etags:
+            raise PreconditionFailed()
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self._etag_response(instance, self.get_serializer(instance).data)
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        self.check_if_match(instance)
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return self._etag_response(serializer.instance, serializer.data)
+
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        if 'If-Match' not in self.request.headers or not serializer.get_changed_fields(
+                instance, serializer.validated_data):
+            serializer.save()
+            return
+
+        with transaction.atomic():
+            current = type(instance).objects.select_for_update().filter(
+                pk=instance.pk).values_list(self.etag_field, flat=True).first()
+            if current != getattr(instance, self.etag_field):
+                raise PreconditionFailed()
+            serializer.save()
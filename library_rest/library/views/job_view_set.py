@@ -0,0 +1,91 @@
+# file: library_rest/library/views/job_view_set.py
+
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import extend_schema
+
+from library.models import Job
+from library.pagination import LibraryPagination
+from library.serializers import JobSerializer
+from library_rest.decorators import keycloak_role_required
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    A viewset for following and cancelling background jobs.
+
+    Jobs are queued by the endpoints that start heavy operations (e.g. deleting an author
+    with `Prefer: respond-async`) and run by the `run_jobs` worker command. Users only see
+    the jobs they queued.
+
+    Attributes:
+        queryset (QuerySet): The queryset of Job objects.
+        serializer_class (Serializer): The serializer class for Job objects.
+        filter_backends (list): The list of filter backends.
+        filterset_fields (list): Fields that can be used to filter the jobs.
+        pagination_class (Pagination): The pagination class to use for paginating results.
+
+    Methods:
+        list(request): Returns a paginated list of the jobs of the user.
+        retrieve(request, pk=None): Returns the status and progress of a job.
+        cancel(request, pk=None): Cancels a pending job, or asks a running one to stop.
+    """
+
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['name', 'status']
+    pagination_class = LibraryPagination
+
+    def get_queryset(self):
+        return super().get_queryset().filter(created_by=self.request.user.username)
+
+    @keycloak_role_required("view-books")
+    def list(self, request):
+        """
+        Lists the jobs queued by the requesting user, most recent first.
+
+        Args:
+          request: The HTTP request object.
+
+        Returns:
+          Response: A DRF Response object containing the serialized list of jobs.
+        """
+        return super().list(request)
+
+    @keycloak_role_required("view-books")
+    def retrieve(self, request, pk=None):
+        """
+        Retrieves the status, progress and result of a job.
+
+        Args:
+          request: The HTTP request object.
+          pk: The primary key of the job.
+
+        Returns:
+          Response: A DRF Response object containing the serialized job.
+        """
+        return super().retrieve(request, pk)
+
+    @extend_schema(request=None, responses=JobSerializer)
+    @action(detail=True, methods=['post'])
+    @keycloak_role_required("view-books")
+    def cancel(self, request, pk=None):
+        """
+        Cancels a job.
+
+        A pending job is cancelled immediately; a running job stops the next time it
+        reports its progress. Finished jobs are left unchanged.
+
+        Args:
+          request: The HTTP request object.
+          pk: The primary key of the job.
+
+        Returns:
+          Response: A DRF Response object containing the serialized job.
+        """
+        job = self.get_object()
+        job.cancel()
+        return Response(self.get_serializer(job).data)
@@ -0,0 +1,35 @@
+# file: library_rest/library/views/snapshot_read_mixin.py
+
+from library.snapshots import snapshot
+
+
+class SnapshotReadMixin:
+    """
+    ViewSet mixin serving reads from the catalog snapshot.
+
+    When the snapshot is enabled and present (see Snapshot.using), the
+    querysets of the `snapshot_actions` are read from the local read-only
+    SQLite snapshot instead of the database, so catalog reads need no
+    database connection. Reads are as fresh as the last snapshot build.
+    Every other action uses the database: writes and facets, and `retrieve`,
+    whose ETag must be the one `If-Match` is checked against on update (see
+    ConditionalUpdateMixin), not that of a row the snapshot may hold from
+    before the last write.
+
+    Attributes:
+        snapshot (Snapshot): The snapshot to read from.
+        snapshot_actions (tuple): The actions served from the snapshot.
+        snapshot_search_table (str): The full-text table searched on the snapshot (see
+            SnapshotSearchFilter), None to search with `LIKE`.
+    """
+
+    snapshot = snapshot
+    snapshot_actions = ('list',)
+    snapshot_search_table = None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, 'action', None) not in self.snapshot_actions:
+            return queryset
+        alias = self.snapshot.using()
+        return queryset if alias is None else queryset.using(alias)
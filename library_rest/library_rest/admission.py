@@ -0,0 +1,235 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from .metrics import register_collector
+
+
+ADMISSION_CONFIG = {
+    'ENABLED': True,
+    'PATHS': ['/library/'],
+    # Query parameters making a list request expensive.
+    'SEARCH_PARAMS': ['search'],
+    # Path suffixes of expensive requests (a batch runs several requests).
+    'SEARCH_SUFFIXES': ['/facets', '/batch'],
+    # Reads with a larger page_size are expensive.
+    'MAX_READ_PAGE_SIZE': 20,
+    'RETRY_AFTER': 1,
+    'CLASSES': {
+        'read': {'LIMIT': 16, 'QUEUE': 32, 'TIMEOUT': 2.0},
+        'search': {'LIMIT': 4, 'QUEUE': 8, 'TIMEOUT': 1.0},
+        'write': {'LIMIT': 4, 'QUEUE': 8, 'TIMEOUT': 2.0},
+    },
+    **getattr(settings, 'ADMISSION_CONTROL', {}),
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class Rejected(Exception):
+    """
+    Raised when a request is not admitted.
+
+    Attributes:
+        reason (str): 'queue_full' or 'deadline'.
+    """
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionQueue:
+    """
+    Concurrency limit with a bounded wait queue, for one class of requests.
+
+    At most `limit` requests run at once; up to `queue_size` more wait for a
+    slot, each until its deadline. A request arriving when the queue is full,
+    or whose deadline passes while waiting, is rejected.
+
+    Attributes:
+        name (str): The name of the class of requests.
+        limit (int): The maximum number of requests running at once.
+        queue_size (int): The maximum number of waiting requests.
+        timeout (float): The maximum time in seconds a request may wait.
+        in_flight (int): The number of running requests.
+        waiting (int): The number of waiting requests.
+        admitted (int): The number of requests admitted so far.
+        rejected (dict): The number of requests rejected so far, per reason.
+        wait_seconds (float): The total time admitted requests waited.
+
+    Methods:
+        acquire(deadline): Waits for a slot until `deadline` (a `time.monotonic()` value).
+        release(): Frees the slot of a finished request.
+    """
+
+    def __init__(self, name, limit, queue_size, timeout):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = {'queue_full': 0, 'deadline': 0}
+        self.wait_seconds = 0.0
+        self._condition = threading.Condition()
+
+    def _reject(self, reason):
+        self.rejected[reason] += 1
+        raise Rejected(reason)
+
+    def acquire(self, deadline):
+        start = time.monotonic()
+        with self._condition:
+            if start >= deadline:
+                self._reject('deadline')
+            if self.in_flight < self.limit and not self.waiting:
+                self.in_flight += 1
+                self.admitted += 1
+                return
+            if self.waiting >= self.queue_size:
+                self._reject('queue_full')
+
+            self.waiting += 1
+            try:
+                while self.in_flight >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._reject('deadline')
+                    self._condition.wait(remaining)
+                self.in_flight += 1
+                self.admitted += 1
+                self.wait_seconds += time.monotonic() - start
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+
+class AdmissionController:
+    """
+    Per-process admission control of the API requests.
+
+    Requests to `PATHS` are sorted into classes by `classify` (cheap reads,
+    expensive searches and exports, writes), each with its own
+    AdmissionQueue, so that a slow dependency (MySQL, Keycloak) cannot tie
+    every worker thread up: once a class is saturated, its requests are
+    rejected at once instead of piling up until they time out.
+
+    A request's deadline is its class `TIMEOUT` from its arrival, taken from
+    the `X-Request-Start` header set by the proxy (`t=<seconds since the
+    epoch>`, with milli or microsecond precision also accepted) when present,
+    so that the time spent in the proxy and server queues counts. A client
+    may shorten it with `X-Request-Timeout` (seconds).
+
+    Configured with the `ADMISSION_CONTROL` setting:
+        ENABLED (bool): Whether requests are subject to admission control.
+        PATHS (list): Path prefixes of the controlled requests.
+        SEARCH_PARAMS (list): Query parameters making a read a search.
+        SEARCH_SUFFIXES (list): Path suffixes making a request a search.
+        MAX_READ_PAGE_SIZE (int): Reads with a larger `page_size` are searches.
+        RETRY_AFTER (int): The `Retry-After` of rejected requests, in seconds.
+        CLASSES (dict): LIMIT, QUEUE and TIMEOUT of each class of requests.
+
+    Methods:
+        classify(request): Returns the class of `request`, or None if it is not controlled.
+        deadline(request, queue): Returns the `time.monotonic()` deadline of `request`.
+        admit(request): Waits for a slot; returns the queue to release, None if the request
+            is not controlled, or raises Rejected.
+    """
+
+    def __init__(self, config):
+        self.enabled = config['ENABLED']
+        self.paths = tuple(config['PATHS'])
+        self.search_params = config['SEARCH_PARAMS']
+        self.search_suffixes = tuple(config['SEARCH_SUFFIXES'])
+        self.max_read_page_size = config['MAX_READ_PAGE_SIZE']
+        self.retry_after = config['RETRY_AFTER']
+        self.queues = {
+            name: AdmissionQueue(name, options['LIMIT'], options['QUEUE'], options['TIMEOUT'])
+            for name, options in config['CLASSES'].items()
+        }
+
+    def classify(self, request):
+        path = request.path_info
+        if not path.startswith(self.paths):
+            return None
+        if path.rstrip('/').endswith(self.search_suffixes):
+            return 'search'
+        if request.method not in SAFE_METHODS:
+            return 'write'
+        if any(request.GET.get(param) for param in self.search_params):
+            return 'search'
+        try:
+            if int(request.GET.get('page_size', 0)) > self.max_read_page_size:
+                return 'search'
+        except ValueError:
+            pass
+        return 'read'
+
+    @staticmethod
+    def _request_start(request):
+        value = request.META.get('HTTP_X_REQUEST_START', '').removeprefix('t=')
+        try:
+            started = float(value)
+        except ValueError:
+            return None
+        # Proxies send seconds, milliseconds or microseconds since the epoch.
+        while started > 1e11:
+            started /= 1000
+        return started if math.isfinite(started) else None
+
+    def deadline(self, request, queue):
+        now = time.monotonic()
+        timeout = queue.timeout
+        try:
+            timeout = min(timeout, float(request.META['HTTP_X_REQUEST_TIMEOUT']))
+        except (KeyError, ValueError):
+            pass
+
+        started = self._request_start(request)
+        if started is not None:
+            now -= max(0.0, time.time() - started)
+        return now + timeout
+
+    def admit(self, request):
+        if not self.enabled:
+            return None
+        name = self.classify(request)
+        queue = self.queues.get(name)
+        if queue is None:
+            return None
+        queue.acquire(self.deadline(request, queue))
+        return queue
+
+    def collect(self):
+        """
+        Yields the admission metrics (see library_rest.metrics).
+        """
+        queues = self.queues.values()
+        yield ('admission_limit', 'gauge', 'Maximum concurrent requests per class.',
+               [({'class': q.name}, q.limit) for q in queues])
+        yield ('admission_queue_size', 'gauge', 'Maximum waiting requests per class.',
+               [({'class': q.name}, q.queue_size) for q in queues])
+        yield ('admission_in_flight', 'gauge', 'Requests running per class.',
+               [({'class': q.name}, q.in_flight) for q in queues])
+        yield ('admission_waiting', 'gauge', 'Requests waiting for a slot per class.',
+               [({'class': q.name}, q.waiting) for q in queues])
+        yield ('admission_admitted_total', 'counter', 'Requests admitted per class.',
+               [({'class': q.name}, q.admitted) for q in queues])
+        yield ('admission_rejected_total', 'counter', 'Requests rejected per class and reason.',
+               [({'class': q.name, 'reason': reason}, count)
+                for q in queues for reason, count in q.rejected.items()])
+        yield ('admission_wait_seconds_total', 'counter',
+               'Time admitted requests waited for a slot per class.',
+               [({'class': q.name}, q.wait_seconds) for q in queues])
+
+
+admission_controller = AdmissionController(ADMISSION_CONFIG)
+register_collector(admission_controller.collect)
@@ -1,10 +1,9 @@
 
+import threading
+
 from rest_framework import authentication
 from rest_framework import exceptions
 
-from keycloak import KeycloakOpenID
-import keycloak.exceptions
-
 from django.conf import settings
 
 from datetime import datetime
@@ -13,20 +12,59 @@ import json
 from django.contrib.auth.models import AbstractBaseUser
 
 
-from drf_spectacular.extensions import OpenApiAuthenticationExtension
+_keycloak = threading.local()
+
+
+def get_keycloak_openid():
+    """
+    Returns the Keycloak client of the current thread, built on first use.
+
+    The client is reused (with its HTTP connections) by the requests the
+    thread serves, but not shared between threads: `userinfo` temporarily
+    sets the token of the request on the headers of the client.
 
+    `python-keycloak` (and the HTTP and crypto stacks it pulls in) is imported
+    here rather than at module level: this module is imported by every worker
+    when DRF loads its settings, while only requests carrying a token need it.
+    """
+    client = getattr(_keycloak, 'client', None)
+    if client is None:
+        from keycloak import KeycloakOpenID
 
-class KeyCloakAuthenticationSchema(OpenApiAuthenticationExtension):
-    # full import path OR class ref
-    target_class = 'library_rest.authentications.KeyCloakAuthentication'
-    name = 'KeyCloakAuthentication'  # name used in the schema
+        client = _keycloak.client = KeycloakOpenID(
+            server_url=settings.KEYCLOAK_CONFIG['KEYCLOAK_SERVER_URL'],
+            client_id=settings.KEYCLOAK_CONFIG['KEYCLOAK_CLIENT_ID'],
+            realm_name=settings.KEYCLOAK_CONFIG['KEYCLOAK_REALM'],
+            client_secret_key=settings.KEYCLOAK_CONFIG['KEYCLOAK_CLIENT_SECRET_KEY']
+        )
+    return client
 
-    def get_security_definition(self, auto_schema):
-        return {
-            'type': 'apiKey',
-            'in': 'header',
-            'name': 'api_key',
-        }
+
+class KeyCloakUser(object):
+    """
+    Lightweight, non-persistent user built from a Keycloak token.
+
+    Attributes:
+        username (str): The Keycloak `preferred_username`.
+        user_info (dict): The payload returned by the Keycloak userinfo endpoint.
+        token_info (dict): The payload returned by the Keycloak introspection endpoint.
+    """
+
+    @classmethod
+    def from_keycloak(cls, user_info, token_info):
+        user = cls()
+        user.username = user_info['preferred_username']
+        user.email = user_info['email']
+        user.first_name = user_info['given_name']
+        user.last_name = user_info['family_name']
+        user.is_superuser = False
+        user.is_staff = False
+        user.is_active = True
+        user.is_authenticated = True
+        user.last_login = timezone.now()
+        user.user_info = user_info
+        user.token_info = token_info
+        return user
 
 
 class KeyCloakAuthentication(authentication.BaseAuthentication):
@@ -38,14 +76,10 @@ class KeyCloakAuthentication(authentication.BaseAuthentication):
 
         access_token = access_token.replace("Bearer ", "")
 
-        try:
-            keycloak_openid = KeycloakOpenID(
-                server_url=settings.KEYCLOAK_CONFIG['KEYCLOAK_SERVER_URL'],
-                client_id=settings.KEYCLOAK_CONFIG['KEYCLOAK_CLIENT_ID'],
-                realm_name=settings.KEYCLOAK_CONFIG['KEYCLOAK_REALM'],
-                client_secret_key=settings.KEYCLOAK_CONFIG['KEYCLOAK_CLIENT_SECRET_KEY']
-            )
+        keycloak_openid = get_keycloak_openid()
+        import keycloak.exceptions
 
+        try:
             user_info = keycloak_openid.userinfo(
                 access_token
             )
@@ -62,20 +96,4 @@ class KeyCloakAuthentication(authentication.BaseAuthentication):
             raise exceptions.AuthenticationFailed(
                 'Keycloak connection error')
 
-        class User(object):
-            pass
-
-        user = User()
-        user.username = user_info['preferred_username']
-        user.email = user_info['email']
-        user.first_name = user_info['given_name']
-        user.last_name = user_info['family_name']
-        user.is_superuser = False
-        user.is_staff = False
-        user.is_active = True
-        user.is_authenticated = True
-        user.last_login = timezone.now()
-        user.user_info = user_info
-        user.token_info = token_info
-
-        return (user, None)
+        return (KeyCloakUser.from_keycloak(user_info, token_info), None)
@@ -0,0 +1,121 @@
+import zlib
+
+from django.conf import settings
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+
+
+COMPRESSION_CONFIG = {
+    'MIN_SIZE': 1024,
+    'LEVEL': 6,
+    'ZSTD_LEVEL': 3,
+    'ENCODINGS': ['zstd', 'gzip', 'deflate'],
+    **getattr(settings, 'RESPONSE_COMPRESSION', {}),
+}
+
+
+class ZlibCompressor:
+    """
+    Incremental gzip (wbits=31) or deflate (zlib format, wbits=15) compressor.
+    """
+
+    def __init__(self, level, wbits):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def sync(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class ZstdCompressor:
+    """
+    Incremental zstd compressor, backed by `compression.zstd` or `zstandard`.
+    """
+
+    def __init__(self, level):
+        if zstd is not None:
+            self._compressor = zstd.ZstdCompressor(level=level)
+            self._flush_block = zstd.ZstdCompressor.FLUSH_BLOCK
+        else:
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+            self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def sync(self):
+        return self._compressor.flush(self._flush_block)
+
+
+def zstd_available():
+    return zstd is not None or zstandard is not None
+
+
+def available_encodings():
+    """
+    Returns the configured encodings the runtime supports, in preference order.
+    """
+    return [
+        encoding for encoding in COMPRESSION_CONFIG['ENCODINGS']
+        if encoding in ('gzip', 'deflate') or (encoding == 'zstd' and zstd_available())
+    ]
+
+
+def get_compressor(encoding, level=None):
+    """
+    Returns an incremental compressor for `encoding` ('zstd', 'gzip' or 'deflate').
+    """
+    if encoding == 'zstd':
+        return ZstdCompressor(level or COMPRESSION_CONFIG['ZSTD_LEVEL'])
+    wbits = 31 if encoding == 'gzip' else 15
+    return ZlibCompressor(level or COMPRESSION_CONFIG['LEVEL'], wbits)
+
+
+def compress(data, encoding, level=None):
+    compressor = get_compressor(encoding, level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def negotiate(accept_encoding, encodings=None):
+    """
+    Picks the encoding to use for an `Accept-Encoding` header.
+
+    The client q-values decide which encodings are acceptable; among those the
+    server preference order (`encodings`) wins.
+
+    Returns:
+        str: The selected encoding, or None to send the response uncompressed.
+    """
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    for encoding in encodings if encodings is not None else available_encodings():
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > 0:
+            return encoding
+    return None
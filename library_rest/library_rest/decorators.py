@@ -1,14 +1,20 @@
 # file: library_rest/decorators.py
 
 from functools import wraps
-from django.conf import settings
-from rest_framework.response import Response
-from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
+
+from library_rest.permissions import has_realm_role
 
 
 def keycloak_role_required(required_role):
     """
-    Decorator to enforce that the requesting user has a specific Keycloak realm role.
+    Decorator declaring the Keycloak realm role required by a viewset action.
+
+    The role is recorded on the handler (`required_role`) and enforced by
+    `KeycloakRolePermission` (see library_rest.permissions) with the other
+    permissions, before the handler runs and before the request body is
+    parsed. The wrapper checks the role again, against the role set resolved
+    once per request, for views whose permission classes leave it out.
 
     Args:
         required_role (str): The name of the required Keycloak realm role.
@@ -20,7 +26,9 @@ def keycloak_role_required(required_role):
         - Checks if the authenticated user possesses the specified Keycloak realm role.
         - If the user has the required role, the view function is executed.
         - If the user does not have the required role, returns a 403 Forbidden response.
-        - If there is an error accessing the token or roles, returns a 401 Unauthorized response.
+        - If the user carries no readable token, returns a 401 Unauthorized response.
+        - Exceptions raised by the view function itself (validation errors, 404, ...) are left
+          to the DRF exception handler.
 
     Usage:
         @keycloak_role_required('admin')
@@ -29,21 +37,11 @@ def keycloak_role_required(required_role):
     """
     def decorator(view_func):
         @wraps(view_func)
-        def _wrapped_view(request, *args, **kwargs):
-
-            if settings.DEBUG and request.request.user.is_superuser:
-                print("DEBUG: Superuser access granted.")
-                return view_func(request, *args, **kwargs)
-
-            try:
-                realm_roles = request.request.user.token_info['realm_access'].get('roles', [
-                ])
-
-                if required_role in realm_roles:
-                    return view_func(request, *args, **kwargs)
-                else:
-                    return Response({"detail": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN)
-            except Exception:
-                return Response({"detail": "Invalid token."}, status=status.HTTP_401_UNAUTHORIZED)
+        def _wrapped_view(view, *args, **kwargs):
+            if not has_realm_role(view.request, required_role):
+                raise PermissionDenied()
+            return view_func(view, *args, **kwargs)
+
+        _wrapped_view.required_role = required_role
         return _wrapped_view
     return decorator
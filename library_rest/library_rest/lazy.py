@@ -0,0 +1,43 @@
+import threading
+
+from django.utils.module_loading import import_string
+
+
+class LazyView:
+    """
+    URL callback importing its class-based view on first use.
+
+    Views that only some requests need (the OpenAPI schema and its Redoc
+    page) pull in large modules; routing to a LazyView keeps them out of the
+    worker boot. `load()` imports the view ahead of time, e.g. during the
+    warm-up (see library_rest.warmup).
+
+    Attributes:
+        view_path (str): The dotted path of the view class.
+        initkwargs (dict): The arguments passed to `as_view()`.
+
+    Methods:
+        load(): Imports the view class and returns its view function.
+    """
+
+    # DRF views are CSRF exempt, which CsrfViewMiddleware reads from the callback.
+    csrf_exempt = True
+
+    def __init__(self, view_path, **initkwargs):
+        self.view_path = view_path
+        self.initkwargs = initkwargs
+        self._view = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._view is None:
+            with self._lock:
+                if self._view is None:
+                    self._view = import_string(self.view_path).as_view(**self.initkwargs)
+        return self._view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.load()(request, *args, **kwargs)
+
+    def __repr__(self):
+        return f'LazyView({self.view_path!r})'
@@ -0,0 +1,53 @@
+from django.http import HttpResponse, HttpResponseForbidden
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_collectors = []
+
+
+def register_collector(collector):
+    """
+    Registers a metrics collector.
+
+    A collector is a callable yielding `(name, type, help, samples)` tuples,
+    `samples` being a list of `(labels, value)` pairs with `labels` a dict.
+    """
+    _collectors.append(collector)
+    return collector
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', r'\\').replace('"', r'\"'))
+        for key, value in labels.items())
+    return '{' + pairs + '}'
+
+
+def render_metrics():
+    """
+    Renders the metrics of every collector in the Prometheus text format.
+    """
+    lines = []
+    for collector in _collectors:
+        for name, kind, help_text, samples in collector():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """
+    Serves the metrics of the process in the Prometheus text format.
+
+    Restricted to the `ACCESS_LIST` addresses, like the OpenAPI schema.
+    """
+    from .permissions import AccessListPermission
+
+    if not AccessListPermission().has_permission(request, None):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
@@ -0,0 +1,142 @@
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+from .admission import Rejected, admission_controller
+from .compression import COMPRESSION_CONFIG, get_compressor, negotiate
+
+
+# Content types whose bodies are already compressed.
+COMPRESSED_CONTENT_TYPES = _lazy_re_compile(
+    r'^(image/(?!svg)|video/|audio/|font/woff|application/'
+    r'(zip|gzip|x-gzip|zstd|x-7z-compressed|x-bzip2|x-xz|pdf|octet-stream))'
+)
+
+# Content types of pages that can reflect input next to secrets (CSRF tokens in the
+# admin and the browsable API): compressing them would expose the secrets to BREACH.
+UNSAFE_CONTENT_TYPES = _lazy_re_compile(r'^(text/html|application/xhtml\+xml)')
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with zstd, gzip or deflate.
+
+    The encoding is negotiated from `Accept-Encoding` (zstd only when the
+    runtime provides it), both buffered and streaming responses are handled
+    (streaming bodies are compressed chunk by chunk and flushed after each
+    chunk), and the following responses are left untouched: bodies shorter
+    than `MIN_SIZE`, responses with a status other than 2xx (e.g. 304),
+    responses that already have a `Content-Encoding` (such as the
+    precompressed OpenAPI schema), already compressed content types and
+    HTML pages. HTML pages (the admin, the browsable API) carry CSRF tokens
+    next to reflected input, which the compressed length would leak
+    (BREACH); the JSON API responses carry no such secrets.
+
+    Configured with the `RESPONSE_COMPRESSION` setting:
+        MIN_SIZE (int): Minimum body size in bytes worth compressing.
+        LEVEL (int): gzip/deflate compression level.
+        ZSTD_LEVEL (int): zstd compression level.
+        ENCODINGS (list): Enabled encodings, in server preference order.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = COMPRESSION_CONFIG['MIN_SIZE']
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def _compressible(self, response):
+        if not 200 <= response.status_code < 300 or response.status_code == 204:
+            return False
+        if response.has_header('Content-Encoding'):
+            return False
+        content_type = response.get('Content-Type', '')
+        if COMPRESSED_CONTENT_TYPES.match(content_type) or UNSAFE_CONTENT_TYPES.match(content_type):
+            return False
+        if response.streaming:
+            length = response.get('Content-Length')
+            return length is None or int(length) >= self.min_size
+        return len(response.content) >= self.min_size
+
+    @staticmethod
+    def _stream(compressor, chunks):
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.sync()
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @staticmethod
+    async def _astream(compressor, chunks):
+        async for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.sync()
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def process_response(self, request, response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if not self._compressible(response):
+            return response
+
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        compressor = get_compressor(encoding)
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self._astream(
+                    compressor, response.streaming_content)
+            else:
+                response.streaming_content = self._stream(
+                    compressor, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            response.content = compressor.compress(response.content) + compressor.flush()
+            response.headers['Content-Length'] = str(len(response.content))
+
+        # The compressed body is a different representation: weaken the ETag.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+class AdmissionControlMiddleware:
+    """
+    Sheds load when the API is saturated.
+
+    Each request to the API is admitted by the AdmissionController (see
+    library_rest.admission): it runs if its class of requests has a free
+    slot, waits in the bounded queue of its class otherwise, and is rejected
+    at once with 503 Service Unavailable and `Retry-After` when the queue is
+    full or its deadline passes. Rejected requests never reach the views,
+    the database or Keycloak. Placed first, so that rejecting is cheap.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.controller = admission_controller
+
+    def __call__(self, request):
+        try:
+            queue = self.controller.admit(request)
+        except Rejected as e:
+            response = JsonResponse(
+                {'detail': 'The server is overloaded, retry later.', 'reason': e.reason},
+                status=503)
+            response['Retry-After'] = str(self.controller.retry_after)
+            return response
+
+        if queue is None:
+            return self.get_response(request)
+        try:
+            return self.get_response(request)
+        finally:
+            queue.release()
@@ -0,0 +1,26 @@
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from drf_spectacular.openapi import AutoSchema as SpectacularAutoSchema
+
+
+class KeyCloakAuthenticationSchema(OpenApiAuthenticationExtension):
+    # full import path OR class ref
+    target_class = 'library_rest.authentications.KeyCloakAuthentication'
+    name = 'KeyCloakAuthentication'  # name used in the schema
+
+    def get_security_definition(self, auto_schema):
+        return {
+            'type': 'apiKey',
+            'in': 'header',
+            'name': 'api_key',
+        }
+
+
+class AutoSchema(SpectacularAutoSchema):
+    """
+    The `DEFAULT_SCHEMA_CLASS` of the project.
+
+    DRF imports the schema class the first time a schema is generated, so
+    declaring it here registers the extensions above exactly when they are
+    needed, without importing the drf-spectacular generator in workers that
+    only serve the API.
+    """
@@ -1,4 +1,4 @@
-from rest_framework import permissions
+from rest_framework import exceptions, permissions, status
 from django.conf import settings
 
 
@@ -20,3 +20,80 @@ class AccessListPermission(permissions.BasePermission):
         allowed_ips = getattr(settings, 'ACCESS_LIST', [])
         ip_address = request.META.get('REMOTE_ADDR')
         return ip_address in allowed_ips
+
+
+class InvalidToken(exceptions.APIException):
+    """
+    The token of the request carries no readable realm roles (401).
+    """
+
+    status_code = status.HTTP_401_UNAUTHORIZED
+    default_detail = 'Invalid token.'
+    default_code = 'invalid_token'
+
+
+# Attribute of a user holding its realm roles once resolved.
+ROLES_ATTR = '_realm_roles'
+
+_unresolved = object()
+
+
+def get_realm_roles(user):
+    """
+    Returns the Keycloak realm roles of `user` as a frozenset, or None when the
+    user carries no readable token.
+
+    The roles are resolved once and kept on the user object, which the
+    authentication builds per request: every check of the request, and of
+    the sub-requests of a batch (run as the same user), reuses them.
+    """
+    roles = getattr(user, ROLES_ATTR, _unresolved)
+    if roles is _unresolved:
+        try:
+            roles = frozenset(user.token_info['realm_access'].get('roles', ()))
+        except (AttributeError, KeyError, TypeError):
+            roles = None
+        setattr(user, ROLES_ATTR, roles)
+    return roles
+
+
+def get_required_role(view):
+    """
+    Returns the realm role required by the current action of `view`, declared
+    with `keycloak_role_required` on its handler, or None.
+    """
+    action = getattr(view, 'action', None) or view.request.method.lower()
+    return getattr(getattr(view, action, None), 'required_role', None)
+
+
+def has_realm_role(request, role):
+    """
+    Returns whether the user of `request` has the realm role `role`.
+
+    Raises:
+        InvalidToken: If the user carries no readable token.
+    """
+    user = request.user
+    if settings.DEBUG and user.is_superuser:
+        return True
+
+    roles = get_realm_roles(user)
+    if roles is None:
+        raise InvalidToken()
+    return role in roles
+
+
+class KeycloakRolePermission(permissions.BasePermission):
+    """
+    Allows an action only to the users having the realm role its handler
+    declares with `keycloak_role_required`; actions declaring no role are
+    allowed.
+
+    DRF checks permissions before running the handler, and request bodies are
+    parsed on first access, so a rejected request is answered before its body
+    is read. Users without a readable token get a 401 response.
+    """
+
+    def has_permission(self, request, view):
+        role = get_required_role(view)
+        return role is None or has_realm_role(request, role)
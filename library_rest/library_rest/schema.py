@@ -0,0 +1,195 @@
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+from .compression import available_encodings, compress, negotiate
+
+
+SCHEMA_PACKAGES = ('Django', 'djangorestframework', 'drf-spectacular', 'django-filter')
+
+SCHEMA_RENDERERS = {
+    'yaml': OpenApiYamlRenderer,
+    'json': OpenApiJsonRenderer,
+}
+
+# The schema is compressed once, so use the strongest levels.
+SCHEMA_COMPRESSION_LEVELS = {
+    'zstd': 19,
+    'gzip': 9,
+    'deflate': 9,
+}
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """
+    Returns the version the cached schema is valid for.
+
+    `settings.CODE_VERSION` (e.g. the deployed commit) is used when set;
+    otherwise the version is a hash of the project sources and of the
+    versions of the packages that shape the schema. Computed once per process.
+    """
+    if getattr(settings, 'CODE_VERSION', None):
+        return settings.CODE_VERSION
+
+    digest = hashlib.sha1()
+    for package in SCHEMA_PACKAGES:
+        try:
+            digest.update(f'{package}={version(package)}'.encode())
+        except PackageNotFoundError:
+            pass
+
+    for root, dirs, files in os.walk(settings.BASE_DIR):
+        dirs[:] = sorted(
+            d for d in dirs
+            if not d.startswith('.') and d not in ('__pycache__', 'migrations')
+        )
+        for name in sorted(files):
+            if name.endswith('.py'):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, settings.BASE_DIR).encode())
+                with open(path, 'rb') as source:
+                    digest.update(source.read())
+
+    return digest.hexdigest()[:16]
+
+
+class SchemaCache:
+    """
+    Process-wide cache of the rendered OpenAPI schema.
+
+    Each format is rendered once per code version and kept in memory together
+    with its precompressed encodings (zstd, gzip, deflate). When
+    `settings.SCHEMA_CACHE_DIR` is set, the files are also written there (by
+    the first worker or by the `build_openapi_schema` command) and read back
+    by the other workers.
+
+    Methods:
+        get(fmt): Returns (content, {encoding: compressed_content}, etag) for 'yaml' or 'json'.
+        build(): Renders every format and writes it to the cache directory.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._data = None
+
+    def _path(self, fmt, suffix=''):
+        directory = getattr(settings, 'SCHEMA_CACHE_DIR', None)
+        if not directory:
+            return None
+        return os.path.join(directory, f'openapi-{code_version()}.{fmt}{suffix}')
+
+    def _generate(self):
+        if self._data is None:
+            generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(
+                urlconf=spectacular_settings.SERVE_URLCONF)
+            self._data = generator.get_schema(request=None, public=True)
+        return self._data
+
+    @staticmethod
+    def _write(path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as tmp:
+            tmp.write(content)
+        os.replace(tmp_path, path)
+
+    def _load(self, fmt):
+        path = self._path(fmt)
+        encodings = available_encodings()
+        paths = [path] + [f'{path}.{encoding}' for encoding in encodings] if path else []
+        if paths and all(os.path.exists(p) for p in paths):
+            with open(path, 'rb') as content:
+                data = content.read()
+            compressed = {}
+            for encoding in encodings:
+                with open(f'{path}.{encoding}', 'rb') as content:
+                    compressed[encoding] = content.read()
+            return data, compressed
+
+        renderer = SCHEMA_RENDERERS[fmt]()
+        data = renderer.render(
+            self._generate(), renderer.media_type, renderer_context={})
+        compressed = {
+            encoding: compress(data, encoding, SCHEMA_COMPRESSION_LEVELS[encoding])
+            for encoding in encodings
+        }
+        if path:
+            self._write(path, data)
+            for encoding, content in compressed.items():
+                self._write(f'{path}.{encoding}', content)
+        return data, compressed
+
+    def get(self, fmt):
+        entry = self._entries.get(fmt)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(fmt)
+                if entry is None:
+                    content, compressed = self._load(fmt)
+                    etag = '"{}-{}"'.format(
+                        fmt, hashlib.sha1(content).hexdigest()[:16])
+                    entry = self._entries[fmt] = (content, compressed, etag)
+        return entry
+
+    def build(self):
+        for fmt in SCHEMA_RENDERERS:
+            self.get(fmt)
+        return [self._path(fmt) for fmt in SCHEMA_RENDERERS]
+
+
+schema_cache = SchemaCache()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    SpectacularAPIView serving a precomputed schema.
+
+    The schema is generated once per code version (see `SchemaCache`) instead
+    of walking every viewset and serializer on each request, and served with
+    an ETag (answering If-None-Match with 304) and, when accepted, with one
+    of the precompressed encodings, which CompressionMiddleware leaves alone.
+    Permissions (`SERVE_PERMISSIONS`, i.e. AccessListPermission) are checked
+    as usual before `get` runs.
+
+    Requests selecting a language (`lang`) or a version (`version`) fall back
+    to the uncached SpectacularAPIView behaviour.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('lang') or request.GET.get('version'):
+            return super().get(request, *args, **kwargs)
+
+        fmt = request.accepted_renderer.format
+        content, compressed, etag = schema_cache.get(fmt)
+
+        encoding = negotiate(
+            request.headers.get('Accept-Encoding', ''), list(compressed))
+
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        elif encoding:
+            response = HttpResponse(
+                compressed[encoding], content_type=request.accepted_media_type)
+            response['Content-Encoding'] = encoding
+        else:
+            response = HttpResponse(
+                content, content_type=request.accepted_media_type)
+
+        response['ETag'] = etag
+        response['Content-Disposition'] = 'inline; filename="{}.{}"'.format(
+            spectacular_settings.TITLE or 'schema', fmt)
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
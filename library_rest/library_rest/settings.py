@@ -54,7 +54,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'library_rest.middleware.AdmissionControlMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'library_rest.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -88,6 +90,9 @@ WSGI_APPLICATION = 'library_rest.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+SNAPSHOT_PATH = os.path.abspath(django_env(
+    'SNAPSHOT_PATH', default=os.path.join(BASE_DIR, '.snapshots', 'catalog.sqlite3')))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.mysql',
@@ -96,9 +101,26 @@ DATABASES = {
         'PASSWORD': mysql_env('MYSQL_PASSWORD'),
         'HOST': mysql_env('MYSQL_HOST', default='localhost'),
         'PORT': mysql_env('MYSQL_PORT', default='3306'),
-    }
+        'OPTIONS': {
+            # Lets import_catalog use LOAD DATA LOCAL INFILE (the server must allow it too).
+            'local_infile': mysql_env.bool('MYSQL_LOCAL_INFILE', default=False),
+        },
+    },
+    # Read-only catalog snapshot, see library.snapshots. Opened read-only (mode=ro),
+    # immutable and memory-mapped; connections are kept and reopened when a new
+    # snapshot is swapped in. The test database of the alias is an empty in-memory one.
+    'snapshot': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'{Path(SNAPSHOT_PATH).as_uri()}?mode=ro&immutable=1',
+        'CONN_MAX_AGE': None,
+        'OPTIONS': {
+            'init_command': 'PRAGMA mmap_size = 1073741824',
+        },
+    },
 }
 
+DATABASE_ROUTERS = ['library.routers.SnapshotRouter']
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -151,23 +173,49 @@ CORS_ORIGIN_WHITELIST = (
 
 ACCESS_LIST = ['127.0.0.1', '::1']
 
+# Whether workers build URLs, serializers, the OpenAPI schema and the Keycloak client
+# when they boot (see library_rest.warmup) instead of on their first requests.
+WARM_UP = django_env.bool('WARM_UP', default=False)
+
+# Whether the HTML browsable API is served (by default only with DEBUG).
+BROWSABLE_API = django_env.bool('BROWSABLE_API', default=DEBUG)
+
 REST_FRAMEWORK = {
     # YOUR SETTINGS
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
+        # Realm roles declared per action with keycloak_role_required.
+        'library_rest.permissions.KeycloakRolePermission',
     ],
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_SCHEMA_CLASS': 'library_rest.openapi.AutoSchema',
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if BROWSABLE_API else []),
         'rest_framework.renderers.JSONRenderer',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'library_rest.authentications.KeyCloakAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
-    ]
+    ],
+    # Token buckets per principal and scope, see library_rest.throttling.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'library_rest.throttling.PrincipalRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'list': '1200/min',
+        'search': '120/min',
+        'export': '60/min',
+        'write': '300/min',
+    },
 }
 
+# Version the precomputed OpenAPI schema is valid for (e.g. the deployed commit).
+# When unset, a hash of the sources is used, see library_rest.schema.code_version.
+CODE_VERSION = django_env('CODE_VERSION', default=None)
+
+SCHEMA_CACHE_DIR = django_env(
+    'SCHEMA_CACHE_DIR', default=os.path.join(BASE_DIR, '.schema_cache'))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Library App API',
     'DESCRIPTION': 'Library description',
@@ -188,6 +236,89 @@ CSRF_TRUSTED_ORIGINS = [
     'http://127.0.0.1:4200',
 ]
 
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'LEVEL': 6,
+    'ZSTD_LEVEL': 3,
+    'ENCODINGS': ['zstd', 'gzip', 'deflate'],
+}
+
+# Per-process concurrency limits of the API, see library_rest.admission.
+ADMISSION_CONTROL = {
+    'ENABLED': django_env.bool('ADMISSION_CONTROL', default=True),
+    'RETRY_AFTER': 1,
+    'CLASSES': {
+        'read': {'LIMIT': 16, 'QUEUE': 32, 'TIMEOUT': 2.0},
+        'search': {'LIMIT': 4, 'QUEUE': 8, 'TIMEOUT': 1.0},
+        'write': {'LIMIT': 4, 'QUEUE': 8, 'TIMEOUT': 2.0},
+    },
+}
+
+THROTTLING = {
+    'ENABLED': django_env.bool('THROTTLING', default=True),
+    'STORE': django_env('THROTTLE_STORE', default='shared_memory'),
+    # By default in $XDG_RUNTIME_DIR, or .throttle next to manage.py (see
+    # library_rest.throttling.default_store_path), never a shared temporary directory.
+    'PATH': django_env('THROTTLE_STORE_PATH', default=None),
+}
+
+LIBRARY_FACETS = {
+    'LIMIT': 10,
+    'MAX_LIMIT': 50,
+    'CACHE_TIMEOUT': 60,
+}
+
+LIBRARY_BATCH = {
+    'MAX_REQUESTS': 20,
+    'MAX_WORKERS': 4,
+}
+
+LIBRARY_DELETION = {
+    'BATCH_SIZE': 1000,
+}
+
+LIBRARY_BULK_UPDATE = {
+    'MAX_ROWS': 10000,
+    'MAX_CHANGES': 1000,
+    'BATCH_SIZE': 500,
+}
+
+LIBRARY_AUTHOR_CACHE = {
+    'ENABLED': True,
+    'MAX_SIZE': 10000,
+}
+
+LIBRARY_COALESCING = {
+    'ENABLED': True,
+    'CROSS_PROCESS': False,
+    'CACHE': 'default',
+    'LOCK_TIMEOUT': 10,
+    'RESULT_TIMEOUT': 1,
+}
+
+LIBRARY_JOBS = {
+    'WORKERS': 2,
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_DELAY': 10,
+    'MAX_RETRY_DELAY': 600,
+    'STALE_TIMEOUT': 300,
+}
+
+# Serve the catalog reads from the read-only snapshot, see library.snapshots.
+LIBRARY_SNAPSHOT = {
+    'ENABLED': django_env.bool('SNAPSHOT_READS', default=False),
+    'ALIAS': 'snapshot',
+    'PATH': SNAPSHOT_PATH,
+    'MAX_AGE': django_env.int('SNAPSHOT_MAX_AGE', default=None),
+}
+
+LIBRARY_IMPORT = {
+    'BATCH_SIZE': 5000,
+    'CHUNK_SIZE': 32 * 1024 * 1024,
+    'WORKERS': 4,
+}
+
 KEYCLOAK_CONFIG = {
     'KEYCLOAK_SERVER_URL': django_env('KEYCLOAK_SERVER_URL'),
     'KEYCLOAK_REALM': django_env('KEYCLOAK_REALM'),
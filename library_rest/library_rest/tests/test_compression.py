@@ -0,0 +1,31 @@
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from library_rest.middleware import CompressionMiddleware
+
+
+BODY = 'x' * 4096
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+
+    def process(self, response):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_compresses_json(self):
+        response = self.process(JsonResponse({'value': BODY}))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertLess(len(response.content), len(BODY))
+
+    def test_skips_html(self):
+        for content_type in ('text/html; charset=utf-8', 'application/xhtml+xml'):
+            with self.subTest(content_type=content_type):
+                response = self.process(HttpResponse(BODY, content_type=content_type))
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(response.content, BODY.encode())
+                self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_skips_small_bodies(self):
+        response = self.process(JsonResponse({'value': 'x'}))
+        self.assertFalse(response.has_header('Content-Encoding'))
@@ -0,0 +1,158 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import SimpleTestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from library.benchmarks.runner import stand_in_user
+from library_rest.throttling import (
+    PrincipalRateThrottle, SharedMemoryBucketStore, default_store_path, parse_rate, refill,
+)
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': rates,
+    })
+
+
+class TokenBucketTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.store = SharedMemoryBucketStore(os.path.join(directory.name, 'buckets.bin'), 64)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('120/min'), (120, 2.0))
+        self.assertEqual(parse_rate('10/s'), (10, 10.0))
+
+    def test_refill(self):
+        self.assertEqual(refill(0.5, 0.0, 1.0, 10, 0.5), (True, 0.0, 0.0))
+        self.assertEqual(refill(5, 0.0, 100.0, 10, 1.0), (True, 9.0, 0.0))
+        allowed, tokens, wait = refill(0.0, 0.0, 1.0, 10, 0.5)
+        self.assertFalse(allowed)
+        self.assertEqual((tokens, wait), (0.5, 1.0))
+
+    def test_rejects_an_empty_bucket_until_it_refills(self):
+        for _ in range(3):
+            self.assertEqual(self.store.consume('key', 3, 1.0, now=100.0), (True, 0.0))
+        self.assertEqual(self.store.consume('key', 3, 1.0, now=100.0), (False, 1.0))
+        self.assertEqual(self.store.consume('key', 3, 1.0, now=100.5), (False, 0.5))
+        self.assertEqual(self.store.consume('key', 3, 1.0, now=101.0), (True, 0.0))
+
+    def test_buckets_are_per_key(self):
+        self.store.consume('key', 1, 1.0, now=100.0)
+        self.assertFalse(self.store.consume('key', 1, 1.0, now=100.0)[0])
+        self.assertTrue(self.store.consume('other', 1, 1.0, now=100.0)[0])
+
+    def test_store_is_private(self):
+        self.store.consume('key', 1, 1.0)
+        self.assertEqual(os.stat(self.store.path).st_mode & 0o777, 0o600)
+
+    def test_refuses_a_symbolic_link(self):
+        target = os.path.join(self.directory, 'target')
+        with open(target, 'w') as file:
+            file.write('kept')
+        os.symlink(target, self.store.path)
+
+        with self.assertRaises(OSError):
+            self.store.consume('key', 1, 1.0)
+        with open(target) as file:
+            self.assertEqual(file.read(), 'kept')
+
+    def test_refuses_a_file_of_another_user(self):
+        if os.getuid() != 0:
+            self.skipTest('Giving a file to another user requires root.')
+        open(self.store.path, 'w').close()
+        os.chown(self.store.path, 65534, -1)
+
+        with self.assertRaises(PermissionError):
+            self.store.consume('key', 1, 1.0)
+        self.assertEqual(os.path.getsize(self.store.path), 0)
+
+    def test_default_path_is_not_shared(self):
+        with mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': '/run/user/1000'}):
+            self.assertEqual(default_store_path(), '/run/user/1000/library_rest-throttle.bin')
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertEqual(
+                default_store_path(),
+                os.path.join(settings.BASE_DIR, '.throttle', 'library_rest-throttle.bin'))
+
+
+class ScopeAndPrincipalTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.throttle = PrincipalRateThrottle()
+
+    def request(self, method='get', path='/library/books', data=None, user=None):
+        request = Request(getattr(self.factory, method)(path, data))
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_get_scope(self):
+        view = mock.Mock(spec=['action'], action='list')
+        cases = [
+            (self.request(), 'list'),
+            (self.request(data={'search': 'calvino'}), 'search'),
+            (self.request(data={'page_size': 100}), 'export'),
+            (self.request(data={'page_size': 'all'}), 'list'),
+            (self.request('post'), 'write'),
+            (self.request('delete'), 'write'),
+        ]
+        for request, scope in cases:
+            with self.subTest(method=request.method, params=dict(request.query_params)):
+                self.assertEqual(self.throttle.get_scope(request, view), scope)
+
+        self.assertEqual(
+            self.throttle.get_scope(self.request(), mock.Mock(spec=['action'], action='facets')),
+            'search')
+        self.assertEqual(
+            self.throttle.get_scope(self.request('post'), mock.Mock(throttle_scope='batch')),
+            'batch')
+
+    def test_get_principal(self):
+        keycloak_user = stand_in_user(username='reader')
+        self.assertEqual(
+            self.throttle.get_principal(self.request(user=keycloak_user)),
+            'keycloak:library-benchmark:reader')
+        django_user = User(pk=7, username='staff')
+        self.assertEqual(self.throttle.get_principal(self.request(user=django_user)), 'user:7')
+        self.assertEqual(self.throttle.get_principal(self.request()), 'address:127.0.0.1')
+
+    @throttle_rates(list='10/min', write=None)
+    def test_rates_follow_the_settings(self):
+        self.assertEqual(self.throttle.rates, {'list': (10, 10 / 60)})
+        self.assertTrue(self.throttle.allow_request(self.request('post'), None))
+
+
+class ThrottledRequestTests(APITestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        store = SharedMemoryBucketStore(os.path.join(directory.name, 'buckets.bin'), 64)
+        for name, value in (('store', store), ('enabled', True)):
+            patcher = mock.patch.object(PrincipalRateThrottle, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client.force_authenticate(stand_in_user())
+
+    @throttle_rates(list='2/min')
+    def test_rejects_with_retry_after(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get('/library/books').status_code, 200)
+        response = self.client.get('/library/books')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+
+        # Another principal has its own bucket.
+        self.client.force_authenticate(stand_in_user(username='other'))
+        self.assertEqual(self.client.get('/library/books').status_code, 200)
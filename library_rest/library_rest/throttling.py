@@ -0,0 +1,340 @@
+import fcntl
+import functools
+import hashlib
+import mmap
+import os
+import stat
+import struct
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import register_collector
+
+
+THROTTLING_CONFIG = {
+    'ENABLED': True,
+    # 'shared_memory' (one node, every worker process) or 'cache'.
+    'STORE': 'shared_memory',
+    # None for default_store_path().
+    'PATH': None,
+    'SLOTS': 65536,
+    'CACHE': 'default',
+    # Query parameters making a list request a search.
+    'SEARCH_PARAMS': ['search'],
+    # Actions throttled as searches.
+    'SEARCH_ACTIONS': ['facets'],
+    # Reads with a larger page_size are exports.
+    'MAX_LIST_PAGE_SIZE': 20,
+    **getattr(settings, 'THROTTLING', {}),
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Key hash (0 for a free slot), tokens left, time of the last update.
+SLOT = struct.Struct('<Qdd')
+
+# Slots probed for a key before the least recently updated one is reused.
+PROBES = 8
+
+
+@functools.lru_cache(maxsize=65536)
+def key_hash(key):
+    """
+    Returns the 64-bit hash of `key`, the same in every process (unlike `hash`).
+    """
+    value = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+def refill(tokens, updated_at, now, capacity, rate):
+    """
+    Takes a token from a bucket last updated at `updated_at`.
+
+    Returns:
+        tuple: (allowed, tokens left, seconds until the next token).
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / rate
+
+
+def default_store_path():
+    """
+    Returns the default file of the shared memory store, in a directory other
+    users cannot write to: `$XDG_RUNTIME_DIR` when set, `.throttle` next to
+    manage.py otherwise.
+    """
+    directory = os.environ.get('XDG_RUNTIME_DIR') or os.path.join(settings.BASE_DIR, '.throttle')
+    return os.path.join(directory, 'library_rest-throttle.bin')
+
+
+class SharedMemoryBucketStore:
+    """
+    Token buckets in a memory-mapped file shared by the worker processes of a node.
+
+    The file holds a fixed table of `slots` buckets addressed by the hash of
+    their key, probing `PROBES` slots; when they all hold other keys, the
+    least recently updated bucket is reused (an idle bucket has refilled and
+    is the same as a new one). Updates hold a thread lock and an exclusive
+    `flock` on the file, which costs a couple of microseconds uncontended.
+    The file is opened on first use in each process, so that it is not shared
+    across a fork. It is created private to the user; a symbolic link, or a
+    file that is not a regular file owned by the user, is refused rather than
+    truncated and written to.
+
+    Methods:
+        consume(key, capacity, rate, now): Takes a token from the bucket of `key`.
+    """
+
+    def __init__(self, path, slots):
+        self.path = path
+        self.slots = slots
+        self._lock = threading.Lock()
+        self._pid = None
+        self._file = None
+        self._map = None
+
+    def _open(self):
+        size = self.slots * SLOT.size
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+        try:
+            status = os.fstat(fd)
+            if not stat.S_ISREG(status.st_mode) or status.st_uid != os.getuid():
+                raise PermissionError(
+                    f'{self.path}: the throttle store must be a regular file owned by this user.')
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            self._map = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._file = fd
+        self._pid = os.getpid()
+
+    def consume(self, key, capacity, rate, now=None):
+        """
+        Takes a token from the bucket of `key`, created full.
+
+        Returns:
+            tuple: (allowed, seconds until the next token).
+        """
+        hashed = key_hash(key)
+        first = hashed % self.slots
+        with self._lock:
+            if self._pid != os.getpid():
+                self._open()
+            buffer = self._map
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            try:
+                if now is None:
+                    now = time.time()
+                offset = oldest = None
+                oldest_at = float('inf')
+                for probe in range(PROBES):
+                    position = (first + probe) % self.slots * SLOT.size
+                    slot_hash, tokens, updated_at = SLOT.unpack_from(buffer, position)
+                    if slot_hash == hashed:
+                        offset = position
+                        break
+                    if updated_at < oldest_at:
+                        oldest, oldest_at = position, updated_at
+                if offset is None:
+                    offset, tokens, updated_at = oldest, capacity, now
+
+                allowed, tokens, wait = refill(tokens, updated_at, now, capacity, rate)
+                SLOT.pack_into(buffer, offset, hashed, tokens, now)
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+        return allowed, wait
+
+
+class CacheBucketStore:
+    """
+    Token buckets in a Django cache, for deployments spanning several nodes.
+
+    The read-modify-write of a bucket is not atomic across processes, so
+    concurrent requests of one principal may occasionally both get the last
+    token, and each decision costs a round trip to the cache.
+
+    Methods:
+        consume(key, capacity, rate, now): Takes a token from the bucket of `key`.
+    """
+
+    prefix = 'throttle:'
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def consume(self, key, capacity, rate, now=None):
+        cache = caches[self.alias]
+        if now is None:
+            now = time.time()
+        tokens, updated_at = cache.get(self.prefix + key, (capacity, now))
+        allowed, tokens, wait = refill(tokens, updated_at, now, capacity, rate)
+        # Kept until the bucket would be full again.
+        cache.set(self.prefix + key, (tokens, now), int((capacity - tokens) / rate) + 1)
+        return allowed, wait
+
+
+def parse_rate(rate):
+    """
+    Returns the (capacity, tokens per second) of a rate such as '100/min'.
+    """
+    count, period = rate.split('/')
+    duration = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+    return int(count), int(count) / duration
+
+
+_parsed_rates = (None, {})
+
+
+def parse_rates(rates):
+    """
+    Returns the parsed `rates` of each scope, skipping the scopes without one.
+
+    The last parsed dict is kept, so that `DEFAULT_THROTTLE_RATES` is parsed
+    once and again only when the setting changes (e.g. `override_settings`).
+    """
+    global _parsed_rates
+    source, parsed = _parsed_rates
+    if source is not rates:
+        parsed = {scope: parse_rate(rate) for scope, rate in rates.items() if rate}
+        _parsed_rates = (rates, parsed)
+    return parsed
+
+
+def get_bucket_store(config):
+    if config['STORE'] == 'cache':
+        return CacheBucketStore(config['CACHE'])
+    return SharedMemoryBucketStore(config['PATH'] or default_store_path(), config['SLOTS'])
+
+
+bucket_store = get_bucket_store(THROTTLING_CONFIG)
+
+
+class PrincipalRateThrottle(BaseThrottle):
+    """
+    Token-bucket throttling per principal and per type of request.
+
+    Requests are sorted by `get_scope` into 'list' (list and retrieve),
+    'search' (list with a search term, facets), 'export' (reads of a larger
+    page than `MAX_LIST_PAGE_SIZE`) and 'write' (any other method); a view
+    may force the scope of its requests with a `throttle_scope` attribute.
+    Each principal has one bucket per scope, with the capacity and period of
+    the scope's `DEFAULT_THROTTLE_RATES` entry ('120/min' allows bursts of 120
+    requests, refilled at 2 per second). Scopes without a rate are not
+    throttled.
+
+    The principal is the Keycloak client and `preferred_username` of the
+    token (so that each integration has its own budget), the user for other
+    authentications and the client address for anonymous requests.
+
+    Buckets live in `bucket_store`, shared by every worker of the node (see
+    SharedMemoryBucketStore), configured with the `THROTTLING` setting:
+        ENABLED (bool): Whether requests are throttled.
+        STORE (str): 'shared_memory' or 'cache'.
+        PATH (str): The file of the shared memory store, None for default_store_path().
+        SLOTS (int): The number of buckets of the shared memory store.
+        CACHE (str): The cache alias of the cache store.
+        SEARCH_PARAMS (list): Query parameters making a read a search.
+        SEARCH_ACTIONS (list): Actions throttled as searches.
+        MAX_LIST_PAGE_SIZE (int): Reads with a larger `page_size` are exports.
+
+    Methods:
+        get_scope(request, view): Returns the scope of `request`.
+        get_principal(request): Returns the principal `request` is counted against.
+        allow_request(request, view): Takes a token from the bucket of the request.
+        wait(): Returns the seconds until the rejected request would be allowed.
+    """
+
+    config = THROTTLING_CONFIG
+    enabled = THROTTLING_CONFIG['ENABLED']
+    store = bucket_store
+    stats = {}
+
+    def __init__(self):
+        self._wait = None
+        self._rates = None
+
+    @property
+    def rates(self):
+        """
+        The (capacity, tokens per second) of each scope, from the current
+        `DEFAULT_THROTTLE_RATES` unless set on the instance.
+        """
+        if self._rates is not None:
+            return self._rates
+        return parse_rates(api_settings.DEFAULT_THROTTLE_RATES)
+
+    @rates.setter
+    def rates(self, rates):
+        self._rates = rates
+
+    def get_scope(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope:
+            return scope
+        if request.method not in SAFE_METHODS:
+            return 'write'
+        if getattr(view, 'action', None) in self.config['SEARCH_ACTIONS']:
+            return 'search'
+        params = request.query_params
+        if any(params.get(param) for param in self.config['SEARCH_PARAMS']):
+            return 'search'
+        try:
+            if int(params.get('page_size', 0)) > self.config['MAX_LIST_PAGE_SIZE']:
+                return 'export'
+        except ValueError:
+            pass
+        return 'list'
+
+    def get_principal(self, request):
+        user = request.user
+        token_info = getattr(user, 'token_info', None)
+        if token_info is not None:
+            client = token_info.get('client_id') or token_info.get('azp') or ''
+            return f'keycloak:{client}:{user.username}'
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+        return f'address:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        if not self.enabled:
+            return True
+        scope = self.get_scope(request, view)
+        rate = self.rates.get(scope)
+        if rate is None:
+            return True
+
+        capacity, per_second = rate
+        allowed, self._wait = self.store.consume(
+            f'{scope}:{self.get_principal(request)}', capacity, per_second)
+
+        counts = self.stats.setdefault(scope, [0, 0])
+        counts[0 if allowed else 1] += 1
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+    @classmethod
+    def collect(cls):
+        """
+        Yields the throttling metrics (see library_rest.metrics).
+        """
+        yield ('throttle_allowed_total', 'counter', 'Requests allowed per throttle scope.',
+               [({'scope': scope}, counts[0]) for scope, counts in cls.stats.items()])
+        yield ('throttle_rejected_total', 'counter', 'Requests throttled per scope.',
+               [({'scope': scope}, counts[1]) for scope, counts in cls.stats.items()])
+
+
+register_collector(PrincipalRateThrottle.collect)
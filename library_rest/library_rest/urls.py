@@ -1,10 +1,8 @@
 from django.contrib import admin
 from django.urls import include, path
-from rest_framework import permissions
-from rest_framework.schemas import get_schema_view
 
-from .permissions import AccessListPermission
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from .lazy import LazyView
+from .metrics import metrics_view
 
 schema_url_patterns = [
     path('library/', include('library.urls')),
@@ -13,7 +11,9 @@ schema_url_patterns = [
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api-auth/', include('rest_framework.urls')),
-    path('openapi', SpectacularAPIView().as_view(), name='schema'),
+    path('metrics', metrics_view, name='metrics'),
+    path('openapi', LazyView('library_rest.schema.CachedSpectacularAPIView'), name='schema'),
     path('',
-         SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+         LazyView('drf_spectacular.views.SpectacularRedocView', url_name='schema'),
+         name='redoc'),
 ] + schema_url_patterns
@@ -0,0 +1,111 @@
+import logging
+import os
+import time
+
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from .lazy import LazyView
+
+
+logger = logging.getLogger(__name__)
+
+_report = None
+
+
+def _load_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            _load_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and isinstance(pattern.callback, LazyView):
+            pattern.callback.load()
+
+
+def build_urls():
+    """
+    Builds the URL resolver (and its reverse lookup tables) and imports the lazy views.
+    """
+    resolver = get_resolver()
+    _load_patterns(resolver.url_patterns)
+    resolver.reverse_dict  # Populates the reverse lookup tables.
+
+
+def build_serializers():
+    """
+    Builds the fields of the serializers of the routed viewsets.
+    """
+    from library.urls import router
+
+    for _, viewset, _ in router.registry:
+        viewset.serializer_class(context={'request': None}).fields  # Built on access.
+
+
+def build_schema():
+    """
+    Renders (or loads from SCHEMA_CACHE_DIR) the OpenAPI schema in every format.
+    """
+    from .schema import schema_cache
+
+    schema_cache.build()
+
+
+def build_auth_clients():
+    """
+    Imports python-keycloak and builds the Keycloak client of the booting thread.
+    """
+    from .authentications import get_keycloak_openid
+
+    get_keycloak_openid()
+
+
+WARM_UP_STEPS = [
+    ('urls', build_urls),
+    ('serializers', build_serializers),
+    ('schema', build_schema),
+    ('auth_clients', build_auth_clients),
+]
+
+
+def warm_up(started_at=None):
+    """
+    Pays the first-request costs of the worker before it accepts traffic.
+
+    Builds the URL resolver, the serializer fields, the OpenAPI schema and
+    the Keycloak client, timing each step. A failing step is logged and
+    skipped: the worker then pays that cost on the first request instead.
+    Runs once per process; later calls return the first report.
+
+    Args:
+        started_at (float): The `time.perf_counter()` value at which the worker started
+            booting, to also report the boot time.
+
+    Returns:
+        dict: The duration in milliseconds of each step ('steps'), of the whole warm-up
+            ('warm_up_ms') and, with `started_at`, of the boot ('boot_ms') and the cold
+            start ('cold_start_ms').
+    """
+    global _report
+    if _report is not None:
+        return _report
+
+    start = time.perf_counter()
+    steps = {}
+    for name, step in WARM_UP_STEPS:
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception('Warm-up step %s failed', name)
+        steps[name] = (time.perf_counter() - step_start) * 1000
+    end = time.perf_counter()
+
+    report = {'steps': steps, 'warm_up_ms': (end - start) * 1000}
+    if started_at is not None:
+        report['boot_ms'] = (start - started_at) * 1000
+        report['cold_start_ms'] = (end - started_at) * 1000
+    _report = report
+
+    logger.info(
+        'Worker %s warmed up in %.0f ms (%s)%s', os.getpid(), report['warm_up_ms'],
+        ', '.join(f'{name} {ms:.0f} ms' for name, ms in steps.items()),
+        f', cold start {report["cold_start_ms"]:.0f} ms' if started_at is not None else '')
+    return report